@@ -1,184 +0,0 @@
-#!/usr/bin/env python
-"""
-Скрипт для добавления личных качеств (PersonalQuality) в базу данных
-"""
-import os
-import django
-
-# Настройка Django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'unicrewback.settings_production')
-django.setup()
-
-from backapp.models import PersonalQuality
-
-# Список личных качеств для добавления
-personal_qualities_list = [
-    "Коммуникабельность",
-    "Активное слушание",
-    "Эмпатия",
-    "Эмоциональный интеллект",
-    "Умение работать в команде",
-    "Сотрудничество",
-    "Лидерство",
-    "Ответственность",
-    "Надежность",
-    "Дисциплинированность",
-    "Адаптивность",
-    "Гибкость",
-    "Стрессоустойчивость",
-    "Решение проблем",
-    "Критическое мышление",
-    "Креативное мышление",
-    "Принятие решений",
-    "Стратегическое мышление",
-    "Аналитическое мышление",
-    "Тайм-менеджмент",
-    "Самоорганизация",
-    "Самодисциплина",
-    "Умение работать в многозадачности",
-    "Внимательность",
-    "Умение концентрироваться",
-    "Терпение",
-    "Урегулирование конфликтов",
-    "Переговорные навыки",
-    "Убедительность",
-    "Ораторское мастерство",
-    "Навыки презентации",
-    "Сторителлинг",
-    "Инициативность",
-    "Проактивность",
-    "Мотивация",
-    "Самомотивация",
-    "Порядочность",
-    "Честность",
-    "Открытость",
-    "Непредвзятость",
-    "Стремление к росту",
-    "Любознательность",
-    "Готовность учиться",
-    "Вовлечённость",
-    "Инновационность",
-    "Творческий подход",
-    "Воображение",
-    "Нетворкинг",
-    "Умение строить отношения",
-    "Наставничество",
-    "Коучинг",
-    "Делегирование",
-    "Планирование",
-    "Организованность",
-    "Постановка целей",
-    "Ориентация на результат",
-    "Клиентоориентированность",
-    "Этикет",
-    "Профессионализм",
-    "Трудолюбие",
-    "Пунктуальность",
-    "Умение адаптироваться к изменениям",
-    "Жизнестойкость",
-    "Логическое мышление",
-    "Системное мышление",
-    "Управление конфликтами",
-    "Дипломатичность",
-    "Тактичность",
-    "Позитивное мышление",
-    "Уверенность",
-    "Самоуверенность (здоровая)",
-    "Находчивость",
-    "Независимость",
-    "Способность брать ответственность",
-    "Настойчивость",
-    "Целеустремленность",
-    "Амбициозность",
-    "Усидчивость",
-    "Гибкость мышления",
-    "Быстрое обучение",
-    "Активность",
-    "Умение давать обратную связь",
-    "Умение принимать обратную связь",
-    "Точность",
-    "Стабильность под давлением",
-    "Выявление проблем",
-    "Визуальное мышление",
-    "Абстрактное мышление",
-    "Практичность",
-    "Управление рисками",
-    "Управление изменениями",
-    "Импровизация",
-    "Целостное восприятие",
-    "Этическое мышление",
-    "Профессиональная коммуникация",
-    "Невербальная коммуникация",
-    "Командный дух",
-    "Взаимовыручка",
-    "Доброжелательность",
-    "Уважительность",
-    "Вежливость",
-    "Доверие",
-    "Объективность",
-    "Конструктивность",
-    "Самоанализ",
-    "Самоосознанность",
-    "Последовательность",
-    "Исполнительность",
-    "Стабильность",
-    "Умение ставить приоритеты",
-    "Организация рабочего времени",
-    "Толерантность",
-    "Терпимость",
-    "Самоконтроль",
-    "Способность работать под давлением",
-    "Готовность помогать",
-    "Лояльность",
-    "Высокая обучаемость",
-    "Рациональность",
-    "Внимание к деталям",
-    "Способность к компромиссам",
-    "Чувство ответственности",
-    "Инициативное лидерство",
-    "Предприимчивость",
-    "Планирование наперёд",
-    "Мысленная гибкость",
-    "Умение работать самостоятельно",
-    "Быстрая адаптация",
-    "Сдержанность",
-    "Добросовестность",
-    "Чувство такта",
-    "Эрудиция",
-    "Саморазвитие",
-    "Ответственность за результат",
-    "Самообладание",
-    "Готовность к переменам",
-    "Настрой на улучшение",
-    "Прагматичность",
-    "Организация команды",
-    "Понимание эмоций других",
-    "Поддержка коллег",
-    "Умение слушать критику",
-    "Умение анализировать свои ошибки",
-    "Умение учиться на ошибках",
-]
-
-def add_personal_qualities():
-    """Добавляет личные качества в базу данных"""
-    created_count = 0
-    existing_count = 0
-    
-    for quality_name in personal_qualities_list:
-        quality, created = PersonalQuality.objects.get_or_create(name=quality_name)
-        if created:
-            created_count += 1
-            print(f"✅ Создано качество: {quality_name}")
-        else:
-            existing_count += 1
-            print(f"📝 Качество уже существует: {quality_name}")
-    
-    print("\n" + "="*50)
-    print(f"✅ Создано новых качеств: {created_count}")
-    print(f"📝 Существующих качеств: {existing_count}")
-    print(f"📊 Всего качеств: {PersonalQuality.objects.count()}")
-    print("="*50)
-
-if __name__ == "__main__":
-    add_personal_qualities()
-
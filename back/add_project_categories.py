@@ -1,71 +0,0 @@
-#!/usr/bin/env python
-"""
-Скрипт для добавления категорий проектов (ProjectCategory) в базу данных
-"""
-import os
-import django
-
-# Настройка Django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'unicrewback.settings_production')
-django.setup()
-
-from backapp.models import ProjectCategory
-
-# Список категорий проектов для добавления
-project_categories_list = [
-    "Дипломная работа",
-    "Курсовая работа",
-    "Учебный проект",
-    "Исследовательский проект",
-    "Хакатон",
-    "Стартап",
-    "Бизнес-проект",
-    "Социальный проект",
-    "Научный проект",
-    "IT-проект",
-    "Веб-приложение",
-    "Мобильное приложение",
-    "Прототип продукта (MVP)",
-    "Инженерный проект",
-    "Проект по программированию",
-    "Проект по анализу данных",
-    "UX/UI проект",
-    "Дизайн-проект",
-    "Маркетинговый проект",
-    "Медиа-проект",
-    "PR-проект",
-    "Финансовый проект",
-    "Экономический проект",
-    "Проект по менеджменту",
-    "Образовательный проект",
-    "Мероприятие (ивент-проект)",
-    "Конкурсный проект",
-    "Инновационный проект",
-    "Консалтинговый проект",
-    "GameDev проект",
-    "Другое",
-]
-
-def add_project_categories():
-    """Добавляет категории проектов в базу данных"""
-    created_count = 0
-    existing_count = 0
-    
-    for category_name in project_categories_list:
-        category, created = ProjectCategory.objects.get_or_create(name=category_name)
-        if created:
-            created_count += 1
-            print(f"✅ Создана категория: {category_name}")
-        else:
-            existing_count += 1
-            print(f"📝 Категория уже существует: {category_name}")
-    
-    print("\n" + "="*50)
-    print(f"✅ Создано новых категорий: {created_count}")
-    print(f"📝 Существующих категорий: {existing_count}")
-    print(f"📊 Всего категорий: {ProjectCategory.objects.count()}")
-    print("="*50)
-
-if __name__ == "__main__":
-    add_project_categories()
-
@@ -0,0 +1,244 @@
+"""
+Аналитика платформы для админ-панели: спрос и предложение навыков, распределение команд
+по категориям и пользователей по факультетам.
+
+Отчёты считаются пакетно (refresh_analytics, одноимённая команда по cron), а не при
+запросе: каждый — несколько GROUP BY по таблицам связей many-to-many целиком, без
+загрузки пользователей и команд в Python. Результат сравнивается со сводной таблицей
+(SkillDemand, AnalyticsCount), и записываются только изменившиеся строки — по одному
+bulk_create, bulk_update и DELETE на отчёт в одной транзакции, поэтому читатели не видят
+пустую или наполовину пересчитанную таблицу. Эндпоинты admin-panel/analytics/<отчёт>/
+читают сводные таблицы; ответ кэшируется в ANALYTICS_CACHE_ALIAS до следующего пересчёта
+(время пересчёта входит в ключ), но не дольше ANALYTICS_CACHE_TIMEOUT секунд.
+
+Учитываются не удалённые активные пользователи и не удалённые команды. Кастомные навыки
+сопоставляются со справочником по названию без учёта регистра; несовпавшие попадают в
+отчёт, если они есть хотя бы у ANALYTICS_CUSTOM_SKILL_MIN_USERS пользователей.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Min, Q
+from django.db.models.functions import Cast, Greatest, Lower, Trim
+from django.utils import timezone
+
+from .models import (
+    User, Skill, CustomSkill, Faculty, ProjectCategory, Team, SkillDemand, AnalyticsCount, AnalyticsRefresh,
+)
+
+ACTIVE_USERS = {"user__deleted_at__isnull": True, "user__is_active": True}
+
+SKILL_FIELDS = ("name", "skill_id", "supply", "custom_supply", "demand", "open_demand")
+COUNT_FIELDS = ("label", "value")
+
+SKILL_ORDERINGS = ("shortage", "demand", "supply")
+
+
+def _skills():
+    """
+    {ключ: значения строки SkillDemand} по текущим данным. Ключ навыка справочника —
+    "skill:<id>": названия в справочнике могут различаться только регистром. Ключ
+    кастомного навыка без пары в справочнике — "custom:<название в нижнем регистре>".
+    """
+    rows, by_name = {}, {}
+    for skill_id, name in Skill.objects.order_by("id").values_list("id", "name"):
+        rows[f"skill:{skill_id}"] = dict(name=name, skill_id=skill_id, supply=0, custom_supply=0, demand=0, open_demand=0)
+        # Кастомный навык, совпавший без учёта регистра с несколькими названиями, относится к первому по id
+        by_name.setdefault(name.strip().lower(), skill_id)
+
+    supply = User.skills.through.objects.filter(**ACTIVE_USERS).values("skill_id").annotate(n=Count("user_id"))
+    for row in supply.order_by():
+        rows[f"skill:{row['skill_id']}"]["supply"] = row["n"]
+
+    demand = (
+        Team.required_skills.through.objects.filter(team__deleted_at__isnull=True)
+        .values("skill_id")
+        .annotate(n=Count("team_id"), open=Count("team_id", filter=Q(team__status="OPEN")))
+    )
+    for row in demand.order_by():
+        rows[f"skill:{row['skill_id']}"].update(demand=row["n"], open_demand=row["open"])
+
+    min_users = getattr(settings, "ANALYTICS_CUSTOM_SKILL_MIN_USERS", 3)
+    custom = (
+        CustomSkill.objects.filter(**ACTIVE_USERS)
+        .annotate(key=Lower(Trim("name")))
+        .values("key")
+        .annotate(n=Count("user_id", distinct=True), label=Min(Trim("name")))
+        # Редкие названия, которых нет в справочнике, отсекаются ещё в запросе (HAVING)
+        .filter(Q(n__gte=min_users) | Q(key__in=list(by_name)))
+    )
+    for row in custom.order_by():
+        skill_id = by_name.get(row["key"])
+        if skill_id is not None:
+            rows[f"skill:{skill_id}"]["custom_supply"] = row["n"]
+        else:
+            rows[f"custom:{row['key']}"] = dict(
+                name=row["label"], skill_id=None, supply=0, custom_supply=row["n"], demand=0, open_demand=0
+            )
+    return rows
+
+
+def _categories():
+    rows = {}
+    for category_id, name in ProjectCategory.objects.values_list("id", "name"):
+        rows[("category_teams", str(category_id))] = dict(label=name, value=0)
+        rows[("category_open_teams", str(category_id))] = dict(label=name, value=0)
+    teams = Team.objects.values("category_id").annotate(n=Count("id"), open=Count("id", filter=Q(status="OPEN")))
+    for row in teams.order_by():
+        rows[("category_teams", str(row["category_id"]))]["value"] = row["n"]
+        rows[("category_open_teams", str(row["category_id"]))]["value"] = row["open"]
+    return rows
+
+
+def _faculties():
+    rows = {("faculty_users", ""): dict(label="Не указан", value=0)}
+    for faculty_id, name, school in Faculty.objects.values_list("id", "name", "school__name"):
+        rows[("faculty_users", str(faculty_id))] = dict(label=f"{name} ({school})" if school else name, value=0)
+    users = User.objects.filter(is_active=True).values("faculty_id").annotate(n=Count("id"))
+    for row in users.order_by():
+        faculty_id = row["faculty_id"]
+        rows[("faculty_users", "" if faculty_id is None else str(faculty_id))]["value"] = row["n"]
+    return rows
+
+
+def _sync(queryset, current, key_of, build, fields):
+    """
+    Приводит строки queryset к current ({ключ: значения полей}): создаёт недостающие,
+    обновляет изменившиеся, удаляет лишние. Возвращает число затронутых строк.
+    """
+    now = timezone.now()
+    existing = {key_of(obj): obj for obj in queryset}
+    created, changed = [], []
+    for key, values in current.items():
+        obj = existing.pop(key, None)
+        if obj is None:
+            created.append(build(key, values))
+        elif any(getattr(obj, field) != values[field] for field in fields):
+            for field in fields:
+                setattr(obj, field, values[field])
+            obj.updated_at = now
+            changed.append(obj)
+    model = queryset.model
+    model.objects.bulk_create(created, batch_size=1000)
+    model.objects.bulk_update(changed, [*fields, "updated_at"], batch_size=1000)
+    if existing:
+        model.objects.filter(id__in=[obj.id for obj in existing.values()]).delete()
+    return len(created) + len(changed) + len(existing)
+
+
+def _refresh_skills():
+    return _sync(
+        SkillDemand.objects.all(), _skills(), lambda obj: obj.key,
+        lambda key, values: SkillDemand(key=key, **values), SKILL_FIELDS,
+    )
+
+
+def _count_refresher(compute, dimensions):
+    def refresh():
+        return _sync(
+            AnalyticsCount.objects.filter(dimension__in=dimensions), compute(),
+            lambda obj: (obj.dimension, obj.key),
+            lambda key, values: AnalyticsCount(dimension=key[0], key=key[1], **values), COUNT_FIELDS,
+        )
+    return refresh
+
+
+REFRESHERS = {
+    "skills": _refresh_skills,
+    "categories": _count_refresher(_categories, ("category_teams", "category_open_teams")),
+    "faculties": _count_refresher(_faculties, ("faculty_users",)),
+}
+
+REPORTS = tuple(REFRESHERS)
+
+
+def refresh_analytics(reports=REPORTS):
+    """Пересчитывает отчёты reports. Возвращает {отчёт: число изменённых строк сводной таблицы}."""
+    result = {}
+    for report in reports:
+        with transaction.atomic():
+            changed = REFRESHERS[report]()
+            AnalyticsRefresh.objects.update_or_create(
+                report=report, defaults={"refreshed_at": timezone.now(), "changed": changed}
+            )
+        result[report] = changed
+    return result
+
+
+def skills_report(ordering="shortage", limit=50, custom=True):
+    """
+    Навыки по нехватке (команд с открытым набором на одного владельца навыка), спросу
+    или предложению.
+    """
+    queryset = SkillDemand.objects.annotate(
+        total_supply=F("supply") + F("custom_supply"),
+        shortage=Cast("open_demand", FloatField()) / Greatest(F("supply") + F("custom_supply"), 1),
+    )
+    if not custom:
+        queryset = queryset.filter(skill__isnull=False)
+    order_by = {
+        "shortage": ("-shortage", "-open_demand", "name", "key"),
+        "demand": ("-demand", "name", "key"),
+        "supply": ("-total_supply", "name", "key"),
+    }[ordering]
+    return [
+        {
+            "skill_id": row.skill_id,
+            "name": row.name,
+            "supply": row.supply,
+            "custom_supply": row.custom_supply,
+            "demand": row.demand,
+            "open_demand": row.open_demand,
+            "shortage": round(row.shortage, 3),
+        }
+        for row in queryset.order_by(*order_by)[:limit]
+    ]
+
+
+def _counts(*dimensions):
+    counts = {}
+    for dimension, key, label, value in AnalyticsCount.objects.filter(dimension__in=dimensions).values_list(
+        "dimension", "key", "label", "value"
+    ):
+        counts.setdefault(key, {"label": label})[dimension] = value
+    return counts
+
+
+def categories_report():
+    counts = _counts("category_teams", "category_open_teams")
+    results = [
+        {
+            "category_id": int(key),
+            "name": row["label"],
+            "teams": row.get("category_teams", 0),
+            "open_teams": row.get("category_open_teams", 0),
+        }
+        for key, row in counts.items()
+    ]
+    return sorted(results, key=lambda row: (-row["teams"], row["name"]))
+
+
+def faculties_report():
+    counts = _counts("faculty_users")
+    results = [
+        {"faculty_id": int(key) if key else None, "name": row["label"], "users": row.get("faculty_users", 0)}
+        for key, row in counts.items()
+    ]
+    return sorted(results, key=lambda row: (-row["users"], row["name"]))
+
+
+def report(name, params):
+    """Ответ admin-panel/analytics/<name>/ из кэша или сводных таблиц. params — разобранные параметры запроса."""
+    refreshed_at = AnalyticsRefresh.objects.filter(report=name).values_list("refreshed_at", flat=True).first()
+    cache = caches[getattr(settings, "ANALYTICS_CACHE_ALIAS", "default")]
+    query = "&".join(f"{param}={value}" for param, value in sorted(params.items()))
+    key = f"analytics:{name}:{refreshed_at.timestamp() if refreshed_at else ''}:{query}"
+    data = cache.get(key)
+    if data is None:
+        if name == "skills":
+            results = skills_report(**params)
+        else:
+            results = {"categories": categories_report, "faculties": faculties_report}[name]()
+        data = {"refreshed_at": refreshed_at, "results": results}
+        cache.set(key, data, getattr(settings, "ANALYTICS_CACHE_TIMEOUT", 300))
+    return data
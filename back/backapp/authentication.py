@@ -0,0 +1,71 @@
+"""
+JWT-аутентификация с кэшем пользователей.
+
+Стандартный JWTAuthentication загружает строку User из БД на каждый запрос, в том числе
+на опрос уведомлений каждые 10 секунд. Здесь id, username, is_staff, is_active и
+updated_at хранятся в кэше AUTH_USER_CACHE_ALIAS (ограниченный размер, TTL
+AUTH_USER_CACHE_TIMEOUT), а view получает CachedUser с отложенными остальными полями —
+они догружаются из БД, только если действительно понадобились.
+
+Кэш сбрасывается при сохранении пользователя (профиль, пароль, is_staff, is_active), при
+пометке на удаление и при изменении его навыков/качеств. Кэш общий для всех воркеров
+(Redis, settings.REDIS_URL), поэтому сброс сразу действует во всех процессах; TTL лишь
+ограничивает размер кэша.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User, CachedUser
+
+
+def _cache():
+    return caches[getattr(settings, "AUTH_USER_CACHE_ALIAS", "auth_users")]
+
+
+def _cache_key(user_id):
+    return f"auth-user:{user_id}"
+
+
+def forget_cached_users(user_ids):
+    """Сбрасывает закэшированных пользователей (после изменения их данных)."""
+    _cache().delete_many([_cache_key(user_id) for user_id in user_ids])
+
+
+def get_cached_user(user_id):
+    """CachedUser по id из токена (из кэша или одним запросом к БД) или None, если его нет."""
+    cache = _cache()
+    key = _cache_key(user_id)
+    values = cache.get(key)
+    if values is None:
+        values = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).values_list(
+            *CachedUser.CACHED_FIELDS
+        ).first()
+        if values is None:
+            return None
+        cache.set(key, values, getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 60))
+    return CachedUser.from_db(router.db_for_read(User), CachedUser.CACHED_FIELDS, values)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+
+    def get_user(self, validated_token):
+        # Проверка отзыва по хэшу пароля требует полной строки пользователя
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = get_cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
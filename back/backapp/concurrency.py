@@ -0,0 +1,83 @@
+"""
+Оптимистичная блокировка правок Team и Task.
+
+У строки есть номер правки version. Правка — один условный
+UPDATE ... SET <поля>, version = version + 1 WHERE id = %s AND version = <ожидаемая>:
+если строку успели изменить, UPDATE не найдёт её и вернётся конфликт. Блокировок нет,
+перечитывать строку перед записью не нужно, а остальные поля не перезаписываются.
+
+Ожидаемая версия берётся из заголовка If-Match — ETag из ответа на GET (у версионных
+ресурсов он начинается с номера правки: "<version>.<хэш>", см. ConditionalGetMixin) или
+просто значение поля version; при конфликте ответ 412. Без If-Match ожидается версия,
+прочитанная в начале запроса, а конфликт (правка между чтением и записью) — 409.
+
+После записи рассылается post_save, как после save(): на него подписаны, например,
+счётчики статистики команды (team_stats.py). UPDATE и post_save выполняются в одной
+транзакции, как save() у models.StatsCountedMixin.
+"""
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_save
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class VersionConflict(Exception):
+    """Строку изменили после того, как была прочитана ожидаемая версия."""
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "Объект уже изменён: версия не совпадает с If-Match. Загрузите его заново."
+    default_code = "precondition_failed"
+
+
+class EditConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Объект изменён другим запросом. Загрузите его заново."
+    default_code = "edit_conflict"
+
+
+def save_versioned(instance, fields, expected_version):
+    """Сохраняет поля fields условным UPDATE по версии; VersionConflict, если версия уже другая."""
+    model = type(instance)
+    values = {name: getattr(instance, name) for name in fields}
+    if any(field.name == "updated_at" for field in model._meta.concrete_fields):
+        instance.updated_at = values["updated_at"] = timezone.now()
+    with transaction.atomic(using=instance._state.db, savepoint=False):
+        updated = model._base_manager.filter(pk=instance.pk, version=expected_version).update(
+            version=F("version") + 1, **values
+        )
+        if not updated:
+            raise VersionConflict()
+        instance.version = expected_version + 1
+        post_save.send(
+            sender=model, instance=instance, created=False, update_fields=frozenset(values),
+            raw=False, using=instance._state.db,
+        )
+
+
+def if_match_version(request):
+    """
+    Версия из If-Match или None, если заголовка нет (или он равен *). ETag без номера
+    правки не может совпасть с текущим представлением объекта — PreconditionFailed.
+    """
+    header = request.headers.get("If-Match", "").strip()
+    if not header or header == "*":
+        return None
+    value = header.removeprefix("W/").strip('"').partition(".")[0]
+    if not value.isdigit():
+        raise PreconditionFailed()
+    return int(value)
+
+
+def save_with_version(serializer, request, **kwargs):
+    """serializer.save() с проверкой версии (сериализатор — с VersionedUpdateMixin)."""
+    expected = if_match_version(request)
+    try:
+        return serializer.save(
+            expected_version=serializer.instance.version if expected is None else expected, **kwargs
+        )
+    except VersionConflict:
+        raise EditConflict() if expected is None else PreconditionFailed()
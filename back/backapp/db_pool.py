@@ -0,0 +1,77 @@
+"""
+Метрики пула соединений с PostgreSQL (admin-panel/db-pool/ и команда db_pool_stats).
+
+В production backend подключается не к PostgreSQL, а к PgBouncer в режиме transaction
+pooling (settings_production.py, DB_POOLER): воркер держит постоянное клиентское
+соединение, а серверное получает только на время транзакции, поэтому число соединений
+PostgreSQL ограничено размером пула, а не числом воркеров.
+
+pool_stats() собирает:
+  server     соединения PostgreSQL с этой базой по состояниям (pg_stat_activity) и max_connections;
+  pgbouncer  SHOW POOLS / SHOW STATS консоли администратора PgBouncer по этой базе
+             (если задан PGBOUNCER_ADMIN): клиенты в работе и в очереди, серверные
+             соединения, время ожидания свободного соединения.
+"""
+import psycopg2
+import psycopg2.extras
+from django.conf import settings
+from django.db import connection
+
+POOL_COLUMNS = ("cl_active", "cl_waiting", "sv_active", "sv_idle", "sv_used", "sv_tested", "sv_login", "maxwait",
+                "maxwait_us", "pool_mode")
+STATS_COLUMNS = ("total_xact_count", "total_query_count", "total_wait_time", "avg_xact_count", "avg_xact_time",
+                 "avg_query_time", "avg_wait_time")
+
+
+def server_connections():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT current_setting('max_connections')::int")
+        max_connections = cursor.fetchone()[0]
+        cursor.execute(
+            "SELECT COALESCE(state, ''), count(*) FROM pg_stat_activity "
+            "WHERE datname = current_database() GROUP BY 1"
+        )
+        by_state = dict(cursor.fetchall())
+    return {"max_connections": max_connections, "total": sum(by_state.values()), "by_state": by_state}
+
+
+def pgbouncer_stats():
+    """SHOW POOLS / SHOW STATS по базе default или None, если консоль PgBouncer не настроена."""
+    admin = getattr(settings, "PGBOUNCER_ADMIN", None)
+    if not admin:
+        return None
+    database = settings.DATABASES["default"]["NAME"]
+    admin_connection = psycopg2.connect(
+        host=admin["HOST"], port=admin["PORT"], user=admin["USER"], password=admin["PASSWORD"],
+        dbname="pgbouncer", connect_timeout=5,
+    )
+    # Консоль администратора не поддерживает транзакции
+    admin_connection.autocommit = True
+    try:
+        with admin_connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            cursor.execute("SHOW POOLS")
+            pools = [
+                {"user": row["user"], **{column: row[column] for column in POOL_COLUMNS if column in row}}
+                for row in cursor.fetchall() if row["database"] == database
+            ]
+            cursor.execute("SHOW STATS")
+            stats = next(
+                ({column: row[column] for column in STATS_COLUMNS if column in row}
+                 for row in cursor.fetchall() if row["database"] == database),
+                None,
+            )
+    finally:
+        admin_connection.close()
+    return {"pools": pools, "stats": stats}
+
+
+def pool_stats():
+    try:
+        pgbouncer = pgbouncer_stats()
+    except psycopg2.Error as exc:
+        pgbouncer = {"error": str(exc).strip()}
+    return {
+        "pooler": getattr(settings, "DB_POOLER", "none"),
+        "server": server_connections(),
+        "pgbouncer": pgbouncer,
+    }
@@ -0,0 +1,90 @@
+"""
+Чтение с реплик PostgreSQL (DB_REPLICA_HOSTS в settings.py / settings_production.py).
+
+ReplicaRouter по умолчанию отправляет все запросы в default. С реплики читают только
+безопасные (GET/HEAD/OPTIONS) запросы к представлениям с ReplicaReadsMixin — UserViewSet
+(в том числе уведомления), TeamViewSet и справочники: mixin после аутентификации выбирает
+для запроса одну случайную реплику.
+
+Чтение своих записей:
+  * первая запись в запросе (db_for_write) возвращает чтение до конца запроса в default,
+    как и открытая транзакция в default (select_for_update на реплике невозможен);
+  * ReplicaPinningMiddleware после небезопасного запроса или запроса с записью отдаёт
+    заголовок REPLICA_PIN_HEADER со значением REPLICA_PIN_SECONDS. apiClient.js
+    (front) запоминает срок и, пока он не истёк, сам отправляет этот заголовок —
+    такие запросы читают из default, и отставание реплики не видно. Заголовок, а не
+    кэш: кэши процессов gunicorn локальные, а заголовок видит любой воркер и сервер.
+    Не cookie: SPA ходит в API с другого origin без credentials, cookie не отправляются.
+
+Миграции применяются только к default, реплики получают их через репликацию.
+"""
+import random
+import threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_PIN_HEADER = "X-DB-Pin"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_local = threading.local()
+
+
+def replicas():
+    return list(getattr(settings, "DB_REPLICAS", {}))
+
+
+def reset():
+    """Начало и конец запроса: чтение из default, записей не было."""
+    _local.replica = None
+    _local.wrote = False
+
+
+def read_from_replica(request):
+    """Направляет чтение до конца безопасного запроса на случайную реплику, если клиент не закреплён за default."""
+    aliases = replicas()
+    if (
+        aliases and request.method in SAFE_METHODS
+        and REPLICA_PIN_HEADER not in request.headers and not getattr(_local, "wrote", False)
+    ):
+        _local.replica = random.choice(aliases)
+
+
+def wrote():
+    return getattr(_local, "wrote", False)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replica = getattr(_local, "replica", None)
+        if replica is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return replica
+
+    def db_for_write(self, model, **hints):
+        _local.replica = None
+        _local.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и default
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaPinningMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, "REPLICA_PIN_SECONDS", 5)
+
+    def __call__(self, request):
+        reset()
+        try:
+            response = self.get_response(request)
+            if replicas() and (request.method not in SAFE_METHODS or wrote()):
+                response[REPLICA_PIN_HEADER] = str(self.pin_seconds)
+        finally:
+            reset()
+        return response
@@ -0,0 +1,141 @@
+"""
+Отложенное удаление пользователей и команд.
+
+mark_*_deleted() только проставляет deleted_at (один UPDATE): менеджеры по умолчанию
+сразу скрывают такие записи, участия в удалённых командах и удалённых пользователей,
+задачи и уведомления удалённых команд (NotDeletedRelatedManager), а пользователь теряет доступ. Зависимые строки
+(уведомления, задачи, участники, связи many-to-many) затем удаляются purge_deleted()
+пачками по DELETION_BATCH_SIZE строк — каждым запросом DELETE ... WHERE id IN (...),
+без загрузки объектов в Python и без долгих блокировок. Такое удаление не вызывает
+сигналы, поэтому счётчики статистики оставшихся команд, где были задачи и участия
+удалённых пользователей, пересчитываются после него (team_stats.rebuild_team_stats).
+
+purge_deleted() запускается в фоновом потоке после коммита пометки, а также
+командой purge_deleted (по cron) — она добирает то, что не успел удалить воркер.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .authentication import forget_cached_users
+from .models import User, CustomSkill, CustomPersonalQuality, Team, TeamMember, TeamStat, Task, Notification
+from .team_stats import rebuild_team_stats
+
+logger = logging.getLogger(__name__)
+
+_purge_lock = threading.Lock()
+
+
+def mark_teams_deleted(team_ids):
+    now = timezone.now()
+    marked = Team.all_objects.filter(id__in=team_ids, deleted_at__isnull=True).update(deleted_at=now, updated_at=now)
+    transaction.on_commit(start_purge)
+    return marked
+
+
+def mark_users_deleted(user_ids):
+    now = timezone.now()
+    user_ids = list(user_ids)
+    marked = User.all_objects.filter(id__in=user_ids, deleted_at__isnull=True).update(
+        deleted_at=now, is_active=False, updated_at=now
+    )
+    # Команды пользователя удаляются вместе с ним (on_delete=CASCADE у Team.creator)
+    mark_teams_deleted(Team.objects.filter(creator_id__in=user_ids).values_list("id", flat=True))
+    forget_cached_users(user_ids)
+    return marked
+
+
+def start_purge():
+    if not getattr(settings, "DELETION_PURGE_IN_BACKGROUND", True):
+        return
+    threading.Thread(target=_purge_in_background, name="purge-deleted", daemon=True).start()
+
+
+def _purge_in_background():
+    # Одного потока на процесс достаточно: он работает, пока есть помеченные записи
+    if not _purge_lock.acquire(blocking=False):
+        return
+    try:
+        purge_deleted()
+    except Exception:
+        logger.exception("Фоновое удаление не завершено, остаток удалит команда purge_deleted")
+    finally:
+        _purge_lock.release()
+        connection.close()
+
+
+def delete_in_batches(queryset, batch_size, pause=0):
+    """
+    Удаляет строки queryset пачками по batch_size одним DELETE на пачку.
+    Зависимые записи к этому моменту должны быть уже удалены: сигналы и каскад не выполняются.
+    """
+    model = queryset.model
+    total = 0
+    while True:
+        ids = list(queryset.values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return total
+        model._base_manager.filter(id__in=ids)._raw_delete(queryset.db)
+        total += len(ids)
+        if pause:
+            time.sleep(pause)
+
+
+def purge_deleted(batch_size=None, pause=None):
+    """Удаляет помеченные команды и пользователей вместе с зависимыми записями. Возвращает {таблица: строк}."""
+    batch_size = batch_size or getattr(settings, "DELETION_BATCH_SIZE", 1000)
+    pause = getattr(settings, "DELETION_BATCH_PAUSE", 0.05) if pause is None else pause
+    deleted = {}
+
+    def purge(queryset):
+        count = delete_in_batches(queryset, batch_size, pause)
+        if count:
+            table = queryset.model._meta.db_table
+            deleted[table] = deleted.get(table, 0) + count
+
+    # Подзапросы вместо списков id: помеченных записей может быть много
+    teams = Team.all_objects.filter(deleted_at__isnull=False).values("id")
+    users = User.all_objects.filter(deleted_at__isnull=False).values("id")
+
+    # Сначала команды: среди них и команды удаляемых пользователей
+    purge(Notification.all_objects.filter(
+        Q(team__in=teams) | Q(task__team__in=teams) | Q(team_member__team__in=teams)
+    ))
+    purge(Task.all_objects.filter(team__in=teams))
+    purge(TeamMember.all_objects.filter(team__in=teams))
+    purge(TeamStat.objects.filter(team__in=teams))
+    purge(Team.required_skills.through.objects.filter(team__in=teams))
+    purge(Team.required_qualities.through.objects.filter(team__in=teams))
+
+    affected_teams = set(
+        Task.all_objects.filter(Q(creator__in=users) | Q(assigned_to__in=users)).values_list("team_id", flat=True).distinct()
+    ) | set(TeamMember.all_objects.filter(user__in=users).values_list("team_id", flat=True).distinct())
+    purge(Notification.all_objects.filter(
+        Q(user__in=users) | Q(team_member__user__in=users) | Q(task__creator__in=users) | Q(task__assigned_to__in=users)
+    ))
+    purge(Task.all_objects.filter(Q(creator__in=users) | Q(assigned_to__in=users)))
+    purge(TeamMember.all_objects.filter(user__in=users))
+    purge(CustomSkill.objects.filter(user__in=users))
+    purge(CustomPersonalQuality.objects.filter(user__in=users))
+    purge(User.skills.through.objects.filter(user__in=users))
+    purge(User.personal_qualities.through.objects.filter(user__in=users))
+    rebuild_team_stats(affected_teams)
+
+    # Сами строки удаляются обычным delete(): зависимых записей уже нет, а сигналы
+    # (сброс кэша пользователя) и прочие связи (например, журнал админки) отработают как обычно
+    for model in (Team, User):
+        while True:
+            ids = list(model.all_objects.filter(deleted_at__isnull=False).values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                model.all_objects.filter(id__in=ids).delete()
+            deleted[model._meta.db_table] = deleted.get(model._meta.db_table, 0) + len(ids)
+            if pause:
+                time.sleep(pause)
+    return deleted
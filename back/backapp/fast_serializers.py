@@ -0,0 +1,258 @@
+"""
+Быстрые сериализаторы для «горячих» списков только на чтение.
+
+Вместо создания экземпляров моделей и вызова to_representation у каждого поля DRF
+ответ строится из строк .values(): план полей собирается один раз на запрос,
+а связи (навыки, участники и т.п.) загружаются одним запросом на всю страницу.
+Вывод совпадает с соответствующими DRF-сериализаторами, включая ?fields= / ?expand=.
+Проверить совпадение и скорость: python manage.py bench_fast_serializers
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from rest_framework import serializers
+
+from .models import User, Skill, PersonalQuality, CustomSkill, CustomPersonalQuality, Team, TeamMember, Notification
+from .serializers import UserListSerializer, TeamSerializer, NotificationSerializer
+from .notifications import render_message
+
+# Значение поля, которое DRF пропускает (SkipField), например team_title без команды
+SKIP = object()
+
+_datetime_field = serializers.DateTimeField()
+
+
+def to_datetime(value):
+    return _datetime_field.to_representation(value)
+
+
+def choices_display(model, field_name):
+    """Аналог get_FOO_display() для значения из .values()."""
+    display = dict(model._meta.get_field(field_name).flatchoices)
+    return lambda value: display.get(value, value)
+
+
+def group_pairs(pairs):
+    grouped = defaultdict(list)
+    for key, value in pairs:
+        grouped[key].append(value)
+    return grouped
+
+
+class FastSerializer:
+    """
+    Базовый класс быстрых сериализаторов.
+
+    columns: поле ответа -> колонки .values(), которые ему нужны.
+    getters: поле ответа -> функция (serializer, row, related) -> значение;
+             поля без getter берутся из одноимённой колонки как есть.
+    batched: поле ответа -> имя метода, загружающего значения сразу для всех id страницы.
+    """
+    serializer_class = None
+    columns = {}
+    getters = {}
+    batched = {}
+
+    def __init__(self, request=None):
+        self.request = request
+        requested = self.serializer_class.get_requested_fields(request)
+        self.fields = [name for name in self.serializer_class.Meta.fields if requested is None or name in requested]
+
+        value_columns = ["id"]
+        for name in self.fields:
+            for column in self.columns.get(name, (name,) if name not in self.batched else ()):
+                if column not in value_columns:
+                    value_columns.append(column)
+        self.value_columns = value_columns
+
+        self.plan = []
+        for name in self.fields:
+            getter = self.getters.get(name)
+            if getter is None and name in self.batched:
+                getter = _batched_getter(name)
+            elif getter is None:
+                getter = _column_getter(name)
+            self.plan.append((name, getter))
+
+    def get_queryset(self, queryset):
+        """Превращает queryset представления в .values() с нужными колонками."""
+        return queryset.select_related(None).prefetch_related(None).values(*self.value_columns)
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        ids = [row["id"] for row in rows]
+        related = {
+            name: getattr(self, method)(ids) if ids else {}
+            for name, method in self.batched.items() if name in self.fields
+        }
+
+        data = []
+        for row in rows:
+            item = {}
+            for name, getter in self.plan:
+                value = getter(self, row, related)
+                if value is not SKIP:
+                    item[name] = value
+            data.append(item)
+        return data
+
+
+def _column_getter(name):
+    return lambda serializer, row, related: row[name]
+
+
+def _batched_getter(name):
+    return lambda serializer, row, related: related[name].get(row["id"], [])
+
+
+def _avatar_url(serializer, name):
+    """Повторяет UserListSerializer.get_avatar для имени файла из .values()."""
+    if not name:
+        return None
+    url = User._meta.get_field("avatar").storage.url(name)
+    if serializer.request:
+        url = serializer.request.build_absolute_uri(url)
+        if url.startswith('http://'):
+            url = url.replace('http://', 'https://', 1)
+        return url
+    domain = getattr(settings, 'DOMAIN', 'unicrew.kz')
+    return f"https://{domain}{url}"
+
+
+def _faculty(row):
+    if row["faculty_id"] is None:
+        return None
+    faculty = {"id": row["faculty_id"], "name": row["faculty__name"]}
+    if row["faculty__school_id"] is not None:
+        faculty["school_name"] = row["faculty__school__name"]
+    return faculty
+
+
+_education_level_display = choices_display(User, "education_level")
+
+
+class FastUserListSerializer(FastSerializer):
+    serializer_class = UserListSerializer
+    columns = {
+        "faculty": ("faculty_id", "faculty__name", "faculty__school_id", "faculty__school__name"),
+        "education_level_display": ("education_level",),
+    }
+    getters = {
+        "faculty": lambda serializer, row, related: _faculty(row),
+        "education_level_display": lambda serializer, row, related: _education_level_display(row["education_level"]),
+        "avatar": lambda serializer, row, related: _avatar_url(serializer, row["avatar"]),
+        "date_joined": lambda serializer, row, related: to_datetime(row["date_joined"]),
+    }
+    batched = {
+        "skills_list": "load_skills",
+        "personal_qualities_list": "load_personal_qualities",
+    }
+
+    def load_skills(self, ids):
+        names = group_pairs(Skill.objects.filter(users__in=ids).values_list("users", "name"))
+        for user_id, name in CustomSkill.objects.filter(user_id__in=ids).values_list("user_id", "name"):
+            names[user_id].append(name)
+        return names
+
+    def load_personal_qualities(self, ids):
+        names = group_pairs(PersonalQuality.objects.filter(users__in=ids).values_list("users", "name"))
+        for user_id, name in CustomPersonalQuality.objects.filter(user_id__in=ids).values_list("user_id", "name"):
+            names[user_id].append(name)
+        return names
+
+
+class FastTeamSerializer(FastSerializer):
+    serializer_class = TeamSerializer
+    columns = {
+        "creator": ("creator__username",),
+        "category": ("category__name",),
+    }
+    getters = {
+        "creator": lambda serializer, row, related: row["creator__username"],
+        "category": lambda serializer, row, related: row["category__name"],
+        "created_at": lambda serializer, row, related: to_datetime(row["created_at"]),
+    }
+    batched = {
+        "required_skills": "load_required_skills",
+        "required_qualities": "load_required_qualities",
+        "members": "load_members",
+    }
+
+    def load_required_skills(self, ids):
+        return group_pairs(Skill.objects.filter(required_in_projects__in=ids).values_list("required_in_projects", "name"))
+
+    def load_required_qualities(self, ids):
+        return group_pairs(
+            PersonalQuality.objects.filter(required_in_projects__in=ids).values_list("required_in_projects", "name")
+        )
+
+    def load_members(self, ids):
+        rows = TeamMember.objects.filter(team_id__in=ids).order_by("id").values_list(
+            "team_id", "id", "user__username", "user_id", "status", "message", "created_at", "updated_at", "team__title"
+        )
+        members = defaultdict(list)
+        for team_id, member_id, username, user_id, status, message, created_at, updated_at, team_title in rows:
+            members[team_id].append({
+                "id": member_id,
+                "user": username,
+                "user_id": user_id,
+                "status": status,
+                "message": message,
+                "created_at": to_datetime(created_at),
+                "updated_at": to_datetime(updated_at),
+                "team_title": team_title,
+            })
+        return members
+
+
+_notification_type_display = choices_display(Notification, "notification_type")
+
+
+def _team_member(row):
+    if row["team_member_id"] is None:
+        return None
+    return {
+        "id": row["team_member_id"],
+        "user": row["team_member__user__username"],
+        "status": row["team_member__status"],
+        "team": row["team_member__team_id"],
+        "team_title": row["team_member__team__title"],
+        "message": row["team_member__message"],
+        "created_at": to_datetime(row["team_member__created_at"]),
+    }
+
+
+def _message(row):
+    return render_message(
+        row["notification_type"],
+        row["message"],
+        row["params"],
+        team_title=row["team__title"] if row["team_id"] is not None else None,
+        task_title=row["task__title"] if row["task_id"] is not None else None,
+        username=row["team_member__user__username"] if row["team_member_id"] is not None else None,
+    )
+
+
+class FastNotificationSerializer(FastSerializer):
+    serializer_class = NotificationSerializer
+    columns = {
+        "notification_type_display": ("notification_type",),
+        "team": ("team_id",),
+        "team_title": ("team_id", "team__title"),
+        "team_member": (
+            "team_member_id", "team_member__user__username", "team_member__status", "team_member__team_id",
+            "team_member__team__title", "team_member__message", "team_member__created_at",
+        ),
+        "message": (
+            "notification_type", "message", "params", "team_id", "team__title", "task_id", "task__title",
+            "team_member_id", "team_member__user__username",
+        ),
+    }
+    getters = {
+        "notification_type_display": lambda serializer, row, related: _notification_type_display(row["notification_type"]),
+        "team": lambda serializer, row, related: row["team_id"],
+        "team_title": lambda serializer, row, related: SKIP if row["team_id"] is None else row["team__title"],
+        "team_member": lambda serializer, row, related: _team_member(row),
+        "message": lambda serializer, row, related: _message(row),
+        "created_at": lambda serializer, row, related: to_datetime(row["created_at"]),
+    }
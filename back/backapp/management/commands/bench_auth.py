@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from backapp.authentication import CachedJWTAuthentication, forget_cached_users
+from backapp.models import User
+
+
+class Command(BaseCommand):
+    help = "Сравнивает JWTAuthentication и CachedJWTAuthentication: запросов к БД и время на один запрос API"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=1000, help="Сколько запросов аутентифицировать")
+        parser.add_argument("--username", help="Пользователь для токена (по умолчанию первый)")
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by("id")
+        user = users.filter(username=options["username"]).first() if options["username"] else users.first()
+        if user is None:
+            raise CommandError("Нет пользователя для выпуска токена")
+
+        token = str(AccessToken.for_user(user))
+        request = RequestFactory().get("/api/users/notifications/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        forget_cached_users([user.pk])
+
+        for name, authentication in (("JWTAuthentication", JWTAuthentication()),
+                                     ("CachedJWTAuthentication", CachedJWTAuthentication())):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                for _ in range(options["requests"]):
+                    authentication.authenticate(request)
+                elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{name}: {len(queries) / options['requests']:.3f} запросов к БД на запрос, "
+                f"{elapsed / options['requests'] * 1000:.3f} мс на запрос"
+            )
@@ -0,0 +1,115 @@
+"""
+Пропускная способность при росте числа воркеров: каждый процесс ведёт себя как sync-воркер
+gunicorn с постоянным соединением (CONN_MAX_AGE) — «запрос» из двух чтений, затем работа
+приложения без обращений к БД (--think-ms). Запускается для каждого значения --workers,
+в том числе больше max_connections PostgreSQL.
+
+Сравнение прямого подключения и PgBouncer — два запуска с разными --host/--port:
+
+    python manage.py bench_db_pool --workers 50,100,200,400 --host db --port 5432
+    python manage.py bench_db_pool --workers 50,100,200,400 --host pgbouncer --port 5432
+
+При прямом подключении воркеры сверх max_connections получают «too many clients» (ошибки
+в отчёте), через PgBouncer они ждут свободное серверное соединение (растёт p95).
+"""
+import multiprocessing
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+
+from backapp.models import Notification, Team
+
+
+def _request(user_id):
+    list(Team.objects.order_by("-created_at").values_list("id", "title")[:15])
+    Notification.objects.filter(user_id=user_id, is_read=False).count()
+
+
+def _worker(settings_dict, user_id, start_at, duration, think, results):
+    connection.settings_dict.update(settings_dict)
+    done, errors, latencies = 0, 0, []
+    time.sleep(max(0, start_at - time.time()))
+    deadline = start_at + duration
+    while time.time() < deadline:
+        started = time.perf_counter()
+        try:
+            # Как request_started/request_finished: битое или устаревшее соединение закрывается
+            connection.close_if_unusable_or_obsolete()
+            _request(user_id)
+            done += 1
+            latencies.append(time.perf_counter() - started)
+        except OperationalError:
+            errors += 1
+            connection.close()
+        time.sleep(think)
+    connection.close()
+    results.put((done, errors, latencies))
+
+
+def _percentile(values, share):
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+class Command(BaseCommand):
+    help = "Пропускная способность при росте числа воркеров с постоянными соединениями (прямо или через PgBouncer)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", default="10,50,100,200", help="Число воркеров через запятую")
+        parser.add_argument("--duration", type=float, default=10, help="Секунд на каждый прогон")
+        parser.add_argument("--think-ms", type=float, default=20, help="Работа приложения между запросами, мс")
+        parser.add_argument("--host", help="Хост PostgreSQL или PgBouncer (по умолчанию из DATABASES)")
+        parser.add_argument("--port", help="Порт PostgreSQL или PgBouncer")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Бенчмарк поддерживается только на PostgreSQL")
+        try:
+            workers = [int(value) for value in options["workers"].split(",")]
+        except ValueError:
+            raise CommandError("--workers: целые числа через запятую")
+        user_id = Notification.objects.values_list("user_id", flat=True).first()
+        if user_id is None:
+            raise CommandError("Нет данных: сначала запустите generate_load_data")
+
+        settings_dict = {"CONN_MAX_AGE": None, "CONN_HEALTH_CHECKS": True}
+        if options["host"]:
+            settings_dict["HOST"] = options["host"]
+        if options["port"]:
+            settings_dict["PORT"] = options["port"]
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT current_setting('max_connections')::int")
+            max_connections = cursor.fetchone()[0]
+        self.stdout.write(f"max_connections = {max_connections}, воркер: два чтения и {options['think_ms']:g} мс работы")
+        self.stdout.write(f"{'воркеров':>9} {'запросов/с':>11} {'ошибок':>8} {'p50, мс':>8} {'p95, мс':>8}")
+
+        context = multiprocessing.get_context("fork")
+        for count in workers:
+            # Соединение родителя не должно достаться дочерним процессам
+            connections.close_all()
+            results = context.Queue()
+            start_at = time.time() + 1 + count / 200
+            processes = [
+                context.Process(
+                    target=_worker,
+                    args=(settings_dict, user_id, start_at, options["duration"], options["think_ms"] / 1000, results),
+                )
+                for _ in range(count)
+            ]
+            for process in processes:
+                process.start()
+            done, errors, latencies = 0, 0, []
+            for _ in processes:
+                worker_done, worker_errors, worker_latencies = results.get()
+                done += worker_done
+                errors += worker_errors
+                latencies += worker_latencies
+            for process in processes:
+                process.join()
+            self.stdout.write(
+                f"{count:>9} {done / options['duration']:>11.0f} {errors:>8} "
+                f"{_percentile(latencies, 0.5) * 1000:>8.1f} {_percentile(latencies, 0.95) * 1000:>8.1f}"
+            )
@@ -0,0 +1,77 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backapp.fast_serializers import FastUserListSerializer, FastTeamSerializer, FastNotificationSerializer
+from backapp.models import User, Team, Notification
+from backapp.serializers import UserListSerializer, TeamSerializer, NotificationSerializer
+
+
+class Command(BaseCommand):
+    help = "Сравнивает быстрые сериализаторы с DRF: проверяет идентичность вывода и меряет строки/сек"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=500, help="Сколько строк каждой модели сериализовать")
+        parser.add_argument("--repeat", type=int, default=3, help="Сколько раз повторить замер (берётся лучший)")
+
+    def handle(self, *args, **options):
+        limit = options["limit"]
+        repeat = options["repeat"]
+
+        cases = [
+            (
+                "users",
+                UserListSerializer,
+                FastUserListSerializer,
+                UserListSerializer.optimize_queryset(User.objects.order_by("id"), None),
+            ),
+            (
+                "teams",
+                TeamSerializer,
+                FastTeamSerializer,
+                TeamSerializer.optimize_queryset(Team.objects.order_by("-created_at"), None),
+            ),
+            (
+                "notifications",
+                NotificationSerializer,
+                FastNotificationSerializer,
+                NotificationSerializer.optimize_queryset(Notification.objects.all(), None),
+            ),
+        ]
+
+        for name, serializer_class, fast_serializer_class, queryset in cases:
+            ids = list(queryset.values_list("id", flat=True)[:limit])
+            if not ids:
+                self.stdout.write(f"{name}: нет данных, пропускаем")
+                continue
+            page = queryset.filter(id__in=ids)
+
+            def run_drf():
+                return serializer_class(page.all(), many=True).data
+
+            def run_fast():
+                fast_serializer = fast_serializer_class()
+                return fast_serializer.to_representation(fast_serializer.get_queryset(page.all()))
+
+            drf_data, drf_time = self.measure(run_drf, repeat)
+            fast_data, fast_time = self.measure(run_fast, repeat)
+
+            if json.dumps(drf_data, default=str) != json.dumps(fast_data, default=str):
+                raise CommandError(f"{name}: вывод быстрого сериализатора отличается от {serializer_class.__name__}")
+
+            rows = len(ids)
+            self.stdout.write(
+                f"{name}: {rows} строк, DRF {rows / drf_time:.0f} строк/с, "
+                f"fast {rows / fast_time:.0f} строк/с (x{drf_time / fast_time:.1f}), вывод совпадает"
+            )
+
+    def measure(self, func, repeat):
+        best = None
+        data = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            data = func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return data, best
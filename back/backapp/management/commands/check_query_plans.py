@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from backapp.query_plans import check_query_plans, sample
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN горячих запросов (PostgreSQL): ошибка, если какой-то из них читает таблицу целиком "
+        "(Seq Scan) или не использует ожидаемый индекс"
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Проверка планов поддерживается только на PostgreSQL")
+
+        values = sample()
+        if values is None:
+            raise CommandError("Нет данных для проверки: нужны уведомления и задачи с исполнителем")
+
+        failed = []
+        for name, (seq_scans, indexes, missing) in check_query_plans(values).items():
+            if seq_scans:
+                failed.append(name)
+                self.stdout.write(self.style.ERROR(f"FAIL {name}: Seq Scan по {', '.join(sorted(set(seq_scans)))}"))
+            elif missing:
+                failed.append(name)
+                self.stdout.write(self.style.ERROR(
+                    f"FAIL {name}: не использован {missing} (в плане: {', '.join(indexes) or '-'})"
+                ))
+            else:
+                self.stdout.write(f"OK   {name}: {', '.join(indexes)}")
+        if failed:
+            raise CommandError(f"Планы без ожидаемых индексов: {len(failed)}")
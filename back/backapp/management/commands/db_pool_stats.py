@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from backapp.db_pool import pool_stats
+
+
+class Command(BaseCommand):
+    help = "Соединения PostgreSQL по состояниям и пулы PgBouncer (если backend работает через него)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=0, help="Повторять каждые N секунд")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Доступно только на PostgreSQL")
+        while True:
+            self._print(pool_stats())
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
+
+    def _print(self, stats):
+        server = stats["server"]
+        states = ", ".join(f"{state or 'без состояния'}: {count}" for state, count in sorted(server["by_state"].items()))
+        self.stdout.write(
+            f"[{stats['pooler']}] PostgreSQL: {server['total']} из {server['max_connections']} соединений ({states})"
+        )
+        pgbouncer = stats["pgbouncer"]
+        if pgbouncer is None:
+            return
+        if "error" in pgbouncer:
+            self.stdout.write(self.style.ERROR(f"PgBouncer недоступен: {pgbouncer['error']}"))
+            return
+        for pool in pgbouncer["pools"]:
+            self.stdout.write(
+                f"PgBouncer {pool['user']}: клиентов {pool.get('cl_active')} в работе, {pool.get('cl_waiting')} ждут "
+                f"(до {pool.get('maxwait')} с); серверных {pool.get('sv_active')} активных, "
+                f"{pool.get('sv_idle')} свободных, {pool.get('sv_used')} ждут проверки"
+            )
+        if pgbouncer["stats"]:
+            stats = pgbouncer["stats"]
+            self.stdout.write(
+                f"PgBouncer: {stats.get('avg_xact_count')} транзакций/с, "
+                f"транзакция {stats.get('avg_xact_time')} мкс, ожидание соединения {stats.get('avg_wait_time')} мкс"
+            )
@@ -0,0 +1,55 @@
+"""
+Выгрузка набора данных в файл или stdout тем же потоком, что и admin-panel/export/.
+В stderr выводится скорость (строк/с) и пиковое потребление памяти процесса.
+
+    python manage.py export_data users --output-format csv --gzip -o users.csv.gz
+"""
+import resource
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from backapp.exports import DATASETS, FORMATS, CHUNK_SIZE, stream_export
+
+
+class Command(BaseCommand):
+    help = "Потоковая выгрузка пользователей, команд, участников или задач в CSV / JSONL"
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=list(DATASETS))
+        parser.add_argument("--output-format", choices=list(FORMATS), default="csv")
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument("-o", "--output", help="Файл для записи (по умолчанию stdout)")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        rows = 0
+
+        def on_row():
+            nonlocal rows
+            rows += 1
+
+        chunks = stream_export(
+            options["dataset"], options["output_format"], options["gzip"], options["chunk_size"], on_row=on_row
+        )
+        started = time.perf_counter()
+        written = 0
+        if options["output"]:
+            with open(options["output"], "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    written += len(chunk)
+        else:
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+                written += len(chunk)
+            sys.stdout.buffer.flush()
+        elapsed = time.perf_counter() - started
+
+        # ru_maxrss в Linux — в килобайтах
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        self.stderr.write(
+            f"{options['dataset']}: {rows} строк, {written / 1024 / 1024:.1f} МБ за {elapsed:.2f} с "
+            f"({rows / elapsed if elapsed else 0:.0f} строк/с), пик памяти {peak:.0f} МБ"
+        )
@@ -0,0 +1,327 @@
+"""
+Генератор больших наборов данных для нагрузочного тестирования.
+
+Пользователи, команды, участники, задачи и уведомления создаются пачками через
+bulk_create или, на PostgreSQL с --copy, через COPY FROM STDIN. Пароль хэшируется
+один раз, случайность задаётся --seed, поэтому повторный запуск с тем же seed
+даёт те же данные (кроме первичных ключей).
+
+    python manage.py generate_load_data --users 1000000 --teams 100000 --copy
+"""
+import datetime
+import io
+import json
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from backapp.models import (
+    User, Faculty, Skill, PersonalQuality, ProjectCategory, Team, TeamMember, Task, Notification
+)
+from backapp.team_stats import rebuild_team_stats
+
+first_names = [
+    "Айдар", "Алишер", "Амир", "Арман", "Асхат", "Данияр", "Даурен", "Ерлан",
+    "Жанар", "Жанна", "Камила", "Карина", "Марат", "Нурлан", "Нурсултан",
+    "Рауан", "Сабина", "Сания", "Талгат", "Айжан", "Алма", "Аружан", "Асель",
+    "Дания", "Диана", "Елена", "Мадина", "Мария", "Александр", "Андрей", "Дмитрий",
+    "Иван", "Максим", "Михаил", "Николай", "Сергей", "Анна", "Екатерина", "Ольга",
+    "Татьяна", "Юлия",
+]
+
+last_names = [
+    "Абдуллаев", "Алиев", "Беков", "Жаныбеков", "Ибраев", "Касымов", "Мухамедов",
+    "Нурланов", "Омаров", "Рахимов", "Садыков", "Тажиев", "Усенов", "Хасанов",
+    "Абдуллин", "Ахметов", "Баймуратов", "Газизов", "Даулетов", "Ермеков", "Жумабеков",
+    "Иванов", "Петров", "Сидоров", "Смирнов", "Кузнецов", "Попов", "Соколов",
+    "Лебедев", "Новиков", "Морозов", "Петрова", "Смирнова", "Кузнецова", "Попова",
+]
+
+positions = [
+    "Frontend Developer", "Backend Developer", "Full-stack Developer",
+    "Mobile Developer", "UI/UX Designer", "Product Designer",
+    "ML Engineer", "Data Scientist", "DevOps Engineer",
+    "Product Manager", "Project Manager", "QA Engineer",
+    "Marketing Specialist", "PR Specialist", "Content Creator",
+    "Illustrator", "2D Artist", "Level Designer", "Embedded Engineer",
+]
+
+team_titles = [
+    "StudyLink", "AI Health Advisor", "University Analytics", "Weather Dashboard",
+    "Online Barber Booking", "EcoRoad", "Speech Emotion AI", "EduVolunteer",
+    "Smart Home Dashboard", "Unity MiniGame",
+]
+
+task_titles = [
+    "Подготовить макеты", "Настроить CI", "Написать API", "Собрать требования",
+    "Провести интервью", "Исправить баги", "Обновить документацию", "Подготовить презентацию",
+]
+
+# Фиксированная точка отсчёта для дат, чтобы данные не зависели от момента запуска
+BASE_TIME = datetime.datetime(2025, 9, 1, tzinfo=datetime.timezone.utc)
+
+
+class Loader:
+    """Вставляет строки пачками через bulk_create или COPY и возвращает их id по порядку."""
+
+    def __init__(self, use_copy, batch_size):
+        self.use_copy = use_copy
+        self.batch_size = batch_size
+        self.stats = {}
+
+    def insert(self, model, rows):
+        if not rows:
+            return []
+        started = time.perf_counter()
+        if self.use_copy:
+            ids = self._copy(model, rows)
+        else:
+            objs = model.objects.bulk_create([model(**row) for row in rows], batch_size=self.batch_size)
+            ids = [obj.pk for obj in objs]
+        elapsed = time.perf_counter() - started
+        count, spent = self.stats.get(model._meta.db_table, (0, 0.0))
+        self.stats[model._meta.db_table] = (count + len(rows), spent + elapsed)
+        return ids
+
+    def _copy(self, model, rows):
+        table = model._meta.db_table
+        columns = [model._meta.get_field(name).column for name in rows[0]]
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write(",".join(self._copy_value(value) for value in row.values()))
+            buffer.write("\n")
+        sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+            before = cursor.fetchone()[0]
+            raw = cursor.cursor
+            if hasattr(raw, "copy_expert"):  # psycopg2
+                buffer.seek(0)
+                raw.copy_expert(sql, buffer)
+            else:  # psycopg 3
+                with raw.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+            # COPY вставляет строки по порядку, поэтому id идут подряд за прежним максимумом
+            cursor.execute(f"SELECT id FROM {table} WHERE id > %s ORDER BY id LIMIT %s", [before, len(rows)])
+            return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def _copy_value(value):
+        # В CSV-режиме COPY пустое значение без кавычек — NULL, а "" — пустая строка
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return "t" if value else "f"
+        if isinstance(value, int):
+            return str(value)
+        if isinstance(value, datetime.datetime):
+            value = value.isoformat()
+        elif isinstance(value, dict):
+            value = json.dumps(value)
+        return '"' + str(value).replace('"', '""') + '"'
+
+
+class Command(BaseCommand):
+    help = "Генерирует пользователей, команды, участников, задачи и уведомления для нагрузочных тестов"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10000)
+        parser.add_argument("--teams", type=int, default=1000)
+        parser.add_argument("--members-per-team", type=int, default=5)
+        parser.add_argument("--tasks-per-team", type=int, default=10)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--prefix", default="load", help="Префикс логинов, должен быть новым для каждого набора")
+        parser.add_argument("--password", default="password123")
+        parser.add_argument("--copy", action="store_true", help="Загружать через COPY (только PostgreSQL)")
+
+    def handle(self, *args, **options):
+        if options["copy"] and connection.vendor != "postgresql":
+            raise CommandError("--copy поддерживается только на PostgreSQL")
+
+        prefix = options["prefix"]
+        if User.objects.filter(username__startswith=f"{prefix}_").exists():
+            raise CommandError(f"Пользователи с префиксом '{prefix}_' уже есть, укажите другой --prefix")
+
+        self.faculty_ids = list(Faculty.objects.values_list("id", flat=True))
+        self.skill_ids = list(Skill.objects.values_list("id", flat=True))
+        self.quality_ids = list(PersonalQuality.objects.values_list("id", flat=True))
+        self.category_ids = list(ProjectCategory.objects.values_list("id", flat=True))
+        if not (self.faculty_ids and self.skill_ids and self.quality_ids and self.category_ids):
+            raise CommandError("Сначала загрузите справочники: факультеты, навыки, качества и категории")
+
+        self.rng = random.Random(options["seed"])
+        self.loader = Loader(options["copy"], options["batch_size"])
+        # Хэш считается один раз: make_password на каждую строку занимает почти всё время генерации
+        self.password = make_password(options["password"])
+
+        started = time.perf_counter()
+        user_ids = self.create_users(options["users"], prefix, options["batch_size"])
+        self.stdout.write(f"Пользователи: {len(user_ids)}")
+        self.create_teams(user_ids, options)
+
+        elapsed = time.perf_counter() - started
+        total = 0
+        for table, (count, spent) in self.loader.stats.items():
+            total += count
+            self.stdout.write(f"  {table}: {count} строк, {count / spent if spent else 0:.0f} строк/с")
+        self.stdout.write(self.style.SUCCESS(
+            f"Готово: {total} строк за {elapsed:.1f} с ({total / elapsed if elapsed else 0:.0f} строк/с)"
+        ))
+
+    def create_users(self, count, prefix, batch_size):
+        rng = self.rng
+        user_ids = []
+        for offset in range(0, count, batch_size):
+            rows = []
+            for index in range(offset, min(offset + batch_size, count)):
+                username = f"{prefix}_{index}"
+                joined = BASE_TIME + datetime.timedelta(minutes=index)
+                rows.append({
+                    "password": self.password,
+                    "last_login": None,
+                    "is_superuser": False,
+                    "username": username,
+                    "first_name": rng.choice(first_names),
+                    "last_name": rng.choice(last_names),
+                    "is_staff": False,
+                    "is_active": True,
+                    "date_joined": joined,
+                    "email": f"{username}@example.com",
+                    "faculty_id": rng.choice(self.faculty_ids),
+                    "course": rng.randint(1, 4),
+                    "education_level": rng.choice(["BACHELOR", "MASTER", "PHD", "OTHER"]),
+                    "avatar": "",
+                    "email_verified": True,
+                    "about_myself": "Интересуюсь разработкой и инновациями.",
+                    "position": rng.choice(positions),
+                    "updated_at": joined,
+                })
+            with transaction.atomic():
+                ids = self.loader.insert(User, rows)
+                skills, qualities = [], []
+                for user_id in ids:
+                    for skill_id in rng.sample(self.skill_ids, min(rng.randint(3, 7), len(self.skill_ids))):
+                        skills.append({"user_id": user_id, "skill_id": skill_id})
+                    for quality_id in rng.sample(self.quality_ids, min(rng.randint(2, 5), len(self.quality_ids))):
+                        qualities.append({"user_id": user_id, "personalquality_id": quality_id})
+                self.loader.insert(User.skills.through, skills)
+                self.loader.insert(User.personal_qualities.through, qualities)
+            user_ids.extend(ids)
+        return user_ids
+
+    def create_teams(self, user_ids, options):
+        rng = self.rng
+        count = options["teams"]
+        # Каждая команда порождает участников, задачи и уведомления, поэтому пачка команд меньше
+        per_team = 1 + options["members_per_team"] + options["tasks_per_team"]
+        batch_size = max(1, options["batch_size"] // per_team)
+        for offset in range(0, count, batch_size):
+            rows = []
+            for index in range(offset, min(offset + batch_size, count)):
+                created = BASE_TIME + datetime.timedelta(minutes=index)
+                rows.append({
+                    "title": f"{rng.choice(team_titles)} #{index}",
+                    "description": "Команда для нагрузочного тестирования.",
+                    "creator_id": rng.choice(user_ids),
+                    "category_id": rng.choice(self.category_ids),
+                    "status": rng.choice(["OPEN", "OPEN", "OPEN", "IN_PROGRESS", "CLOSED", "DONE"]),
+                    "created_at": created,
+                    "whatsapp_link": None,
+                    "telegram_link": None,
+                    "updated_at": created,
+                    "version": 1,
+                })
+            with transaction.atomic():
+                team_ids = self.loader.insert(Team, rows)
+                self.create_team_contents(list(zip(team_ids, rows)), user_ids, options)
+
+    def create_team_contents(self, teams, user_ids, options):
+        rng = self.rng
+        skills, qualities, members = [], [], []
+        for team_id, team in teams:
+            for skill_id in rng.sample(self.skill_ids, min(rng.randint(2, 5), len(self.skill_ids))):
+                skills.append({"team_id": team_id, "skill_id": skill_id})
+            for quality_id in rng.sample(self.quality_ids, min(rng.randint(1, 3), len(self.quality_ids))):
+                qualities.append({"team_id": team_id, "personalquality_id": quality_id})
+
+            creator_id = team["creator_id"]
+            member_ids = {creator_id}
+            while len(member_ids) < min(options["members_per_team"] + 1, len(user_ids)):
+                member_ids.add(rng.choice(user_ids))
+            for user_id in sorted(member_ids):
+                status = "APPROVED" if user_id == creator_id else rng.choice(["APPROVED", "APPROVED", "PENDING", "INVITED"])
+                members.append({
+                    "team_id": team_id,
+                    "user_id": user_id,
+                    "status": status,
+                    "message": "",
+                    "created_at": team["created_at"],
+                    "updated_at": team["created_at"],
+                })
+        self.loader.insert(Team.required_skills.through, skills)
+        self.loader.insert(Team.required_qualities.through, qualities)
+        member_ids = self.loader.insert(TeamMember, members)
+
+        creators = {team_id: team["creator_id"] for team_id, team in teams}
+        approved = {}
+        notifications = []
+        for member_id, member in zip(member_ids, members):
+            team_id = member["team_id"]
+            if member["status"] == "APPROVED":
+                approved.setdefault(team_id, []).append(member["user_id"])
+            elif member["status"] == "PENDING":
+                notifications.append(self.notification(
+                    creators[team_id], "TEAM_REQUEST", team_id, member["created_at"], team_member_id=member_id,
+                ))
+            elif member["status"] == "INVITED":
+                notifications.append(self.notification(
+                    member["user_id"], "TEAM_INVITATION", team_id, member["created_at"], team_member_id=member_id,
+                ))
+
+        tasks = []
+        for team_id, team in teams:
+            for index in range(options["tasks_per_team"]):
+                created = team["created_at"] + datetime.timedelta(hours=index)
+                assigned_to = rng.choice(approved[team_id] + [None])
+                tasks.append({
+                    "title": rng.choice(task_titles),
+                    "description": None,
+                    "team_id": team_id,
+                    "creator_id": team["creator_id"],
+                    "assigned_to_id": assigned_to,
+                    "status": rng.choice(["TODO", "TODO", "IN_PROGRESS", "DONE", "CANCELLED"]),
+                    "priority": rng.choice(["LOW", "MEDIUM", "MEDIUM", "HIGH", "URGENT"]),
+                    "due_date": created + datetime.timedelta(days=rng.randint(-10, 30)) if rng.random() < 0.7 else None,
+                    "created_at": created,
+                    "updated_at": created,
+                    "version": 1,
+                })
+        task_ids = self.loader.insert(Task, tasks)
+
+        for task_id, task in zip(task_ids, tasks):
+            if task["assigned_to_id"]:
+                notifications.append(self.notification(
+                    task["assigned_to_id"], "TASK_ASSIGNED", task["team_id"], task["created_at"], task_id=task_id,
+                    params={"new": True},
+                ))
+        self.loader.insert(Notification, notifications)
+        # Строки вставлены в обход сигналов: счётчики статистики команд считаются по ним целиком
+        rebuild_team_stats([team_id for team_id, _ in teams])
+
+    def notification(self, user_id, notification_type, team_id, created_at, team_member_id=None, task_id=None, params=None):
+        return {
+            "user_id": user_id,
+            "notification_type": notification_type,
+            "team_id": team_id,
+            "team_member_id": team_member_id,
+            "task_id": task_id,
+            "message": None,
+            "params": params,
+            "is_read": self.rng.random() < 0.5,
+            "created_at": created_at,
+        }
@@ -0,0 +1,118 @@
+"""
+Загрузка справочников из backapp/reference_data: навыки, личные качества,
+категории проектов, школы и факультеты.
+
+Каждая таблица сверяется с файлом одним SELECT и дополняется одним bulk_create
+с ignore_conflicts, поэтому число запросов не зависит от длины списков, а повторный
+запуск ничего не меняет. Записи, которых нет в файлах, не удаляются — только выводятся.
+
+    python manage.py load_reference_data [--only skills schools] [--dry-run]
+"""
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from backapp.models import Skill, PersonalQuality, ProjectCategory, School, Faculty
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "reference_data"
+
+# Простые справочники: имя файла -> модель с уникальным полем name
+NAME_TABLES = {
+    "skills": Skill,
+    "personal_qualities": PersonalQuality,
+    "project_categories": ProjectCategory,
+}
+
+SECTIONS = [*NAME_TABLES, "schools"]
+
+TITLES = {
+    Skill: "Навыки",
+    PersonalQuality: "Личные качества",
+    ProjectCategory: "Категории проектов",
+    School: "Школы",
+    Faculty: "Факультеты",
+}
+
+
+class Command(BaseCommand):
+    help = "Загружает справочники из backapp/reference_data (идемпотентно, пачками)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--only", nargs="+", choices=SECTIONS, help="Загрузить только указанные справочники")
+        parser.add_argument("--data-dir", default=str(DATA_DIR))
+        parser.add_argument("--dry-run", action="store_true", help="Только показать различия")
+
+    def handle(self, *args, **options):
+        self.data_dir = Path(options["data_dir"])
+        self.dry_run = options["dry_run"]
+        self.verbosity = options["verbosity"]
+
+        with transaction.atomic():
+            for section in options["only"] or SECTIONS:
+                if section == "schools":
+                    self.load_schools()
+                else:
+                    self.load_names(section, NAME_TABLES[section])
+
+        if self.dry_run:
+            self.stdout.write(self.style.WARNING("Режим --dry-run: изменения не записаны"))
+
+    def read(self, section):
+        path = self.data_dir / f"{section}.json"
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Не удалось прочитать {path}: {e}")
+
+    def load_names(self, section, model):
+        names = list(dict.fromkeys(self.read(section)))
+        existing = set(model.objects.values_list("name", flat=True))
+        missing = [name for name in names if name not in existing]
+        extra = existing.difference(names)
+
+        if missing and not self.dry_run:
+            model.objects.bulk_create([model(name=name) for name in missing], ignore_conflicts=True)
+        self.report(TITLES[model], missing, extra, len(names))
+
+    def load_schools(self):
+        schools_data = self.read("schools")
+
+        existing = set(School.objects.values_list("name", flat=True))
+        missing = [name for name in schools_data if name not in existing]
+        if missing and not self.dry_run:
+            School.objects.bulk_create([School(name=name) for name in missing], ignore_conflicts=True)
+        self.report(TITLES[School], missing, existing.difference(schools_data), len(schools_data))
+
+        # id школ нужны для факультетов; bulk_create с ignore_conflicts их не возвращает
+        school_ids = dict(School.objects.filter(name__in=schools_data).values_list("name", "id"))
+        declared = [
+            (faculty_name, school_name)
+            for school_name, faculties in schools_data.items()
+            for faculty_name in dict.fromkeys(faculties)
+        ]
+        existing = set(Faculty.objects.values_list("name", "school__name"))
+        missing = [pair for pair in declared if pair not in existing]
+        extra = existing.difference(declared)
+
+        if missing and not self.dry_run:
+            Faculty.objects.bulk_create(
+                [Faculty(name=name, school_id=school_ids[school_name]) for name, school_name in missing],
+                ignore_conflicts=True,
+            )
+        self.report(
+            TITLES[Faculty],
+            [f"{name} ({school})" for name, school in missing],
+            [f"{name} ({school})" if school else name for name, school in extra],
+            len(declared),
+        )
+
+    def report(self, title, missing, extra, total):
+        self.stdout.write(f"{title}: в файле {total}, добавлено {len(missing)}, только в БД {len(extra)}")
+        if self.verbosity > 1:
+            for name in missing:
+                self.stdout.write(self.style.SUCCESS(f"  + {name}"))
+            for name in sorted(extra):
+                self.stdout.write(f"  ? {name}")
@@ -0,0 +1,43 @@
+"""
+Размер таблицы уведомлений и её индексов (PostgreSQL) и доля строк с сохранённым текстом.
+Для сравнения «до/после» сжатия запускайте после VACUUM FULL / pg_repack таблицы.
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Avg, Count, Q
+from django.db.models.functions import Length
+
+from backapp.models import Notification
+
+TABLE = Notification._meta.db_table
+
+
+class Command(BaseCommand):
+    help = "Показывает размер таблицы уведомлений и индексов"
+
+    def handle(self, *args, **options):
+        stats = Notification.objects.aggregate(
+            total=Count("id"),
+            with_message=Count("id", filter=Q(message__isnull=False)),
+            message_length=Avg(Length("message")),
+        )
+        self.stdout.write(
+            f"Строк: {stats['total']}, с сохранённым текстом: {stats['with_message']}, "
+            f"средняя длина текста: {stats['message_length'] or 0:.0f} символов"
+        )
+        if connection.vendor != "postgresql":
+            return
+
+        with connection.cursor() as cursor:
+            # pg_partition_tree учитывает и секции, если таблица секционирована
+            cursor.execute(
+                "SELECT COALESCE(SUM(pg_table_size(relid)), 0), COALESCE(SUM(pg_indexes_size(relid)), 0) "
+                "FROM pg_partition_tree(%s::regclass)",
+                [TABLE],
+            )
+            table_size, indexes_size = cursor.fetchone()
+        per_row = (table_size / stats["total"]) if stats["total"] else 0
+        self.stdout.write(
+            f"Таблица: {table_size / 1024 / 1024:.1f} МБ ({per_row:.0f} байт на строку), "
+            f"индексы: {indexes_size / 1024 / 1024:.1f} МБ"
+        )
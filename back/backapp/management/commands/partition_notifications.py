@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from backapp.retention import convert_to_partitioned, ensure_partitions, is_partitioned
+
+
+class Command(BaseCommand):
+    help = "Помесячное секционирование таблицы уведомлений (PostgreSQL): перенос и создание будущих секций"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--convert", action="store_true", help="Перенести существующую таблицу в секционированную")
+        parser.add_argument("--months-ahead", type=int, default=3)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Секционирование поддерживается только на PostgreSQL")
+
+        if options["convert"] and convert_to_partitioned(options["months_ahead"]):
+            self.stdout.write(self.style.SUCCESS("Таблица уведомлений секционирована"))
+        elif not is_partitioned():
+            raise CommandError("Таблица не секционирована, запустите с --convert")
+
+        ensure_partitions(options["months_ahead"])
+        self.stdout.write(f"Секции созданы на {options['months_ahead']} мес. вперёд")
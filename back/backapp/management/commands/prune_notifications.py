@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from backapp.retention import prune_notifications, ensure_partitions
+
+
+class Command(BaseCommand):
+    help = "Удаляет уведомления по политике хранения (NOTIFICATION_RETENTION_*) пачками"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--sleep", type=float, default=0, help="Пауза между пачками, сек")
+
+    def handle(self, *args, **options):
+        result = prune_notifications(options["batch_size"], options["sleep"])
+        # Если таблица секционирована, заодно создаём секции на будущие месяцы
+        ensure_partitions()
+        self.stdout.write(
+            f"Удалено секций: {result['partitions']}, устаревших: {result['expired']}, "
+            f"прочитанных: {result['read']}, сверх лимита: {result['over_limit']}"
+        )
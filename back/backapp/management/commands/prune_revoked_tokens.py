@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from backapp.models import RevokedToken
+
+
+class Command(BaseCommand):
+    help = "Удаляет истёкшие отозванные refresh-токены пачками"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--sleep", type=float, default=0, help="Пауза между пачками, сек")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        total = 0
+        while True:
+            ids = list(
+                RevokedToken.objects.filter(expires_at__lte=now).values_list("id", flat=True)[:options["batch_size"]]
+            )
+            if not ids:
+                break
+            total += RevokedToken.objects.filter(id__in=ids).delete()[0]
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+        self.stdout.write(f"Удалено истёкших отозванных токенов: {total}")
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from backapp.deletion import purge_deleted
+
+
+class Command(BaseCommand):
+    help = "Удаляет помеченных на удаление пользователей и команды вместе с зависимыми записями пачками"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--sleep", type=float, default=None, help="Пауза между пачками, сек")
+
+    def handle(self, *args, **options):
+        deleted = purge_deleted(options["batch_size"], options["sleep"])
+        for table, count in deleted.items():
+            self.stdout.write(f"  {table}: {count}")
+        self.stdout.write(f"Удалено строк: {sum(deleted.values())}")
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from backapp.models import Team
+from backapp.team_stats import rebuild_team_stats
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает счётчики статистики команд (teams/{id}/stats/) по задачам и участникам"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--team", type=int, action="append", help="id команды; по умолчанию все команды")
+        parser.add_argument("--batch-size", type=int, default=500, help="Команд на пачку")
+        parser.add_argument("--sleep", type=float, default=0, help="Пауза между пачками, сек")
+
+    def handle(self, *args, **options):
+        team_ids = options["team"] or list(Team.objects.values_list("id", flat=True))
+        rebuild_team_stats(team_ids, options["batch_size"], options["sleep"])
+        self.stdout.write(f"Пересчитано команд: {len(team_ids)}")
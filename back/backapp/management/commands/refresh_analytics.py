@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from backapp.analytics import REPORTS, refresh_analytics
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает сводные таблицы аналитики админ-панели (спрос на навыки, категории, факультеты)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("reports", nargs="*", help=f"{', '.join(REPORTS)}; по умолчанию все")
+
+    def handle(self, *args, **options):
+        unknown = set(options["reports"]) - set(REPORTS)
+        if unknown:
+            raise CommandError(f"Неизвестные отчёты: {', '.join(sorted(unknown))}")
+        for report, changed in refresh_analytics(options["reports"] or REPORTS).items():
+            self.stdout.write(f"  {report}: изменено строк {changed}")
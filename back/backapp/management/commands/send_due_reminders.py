@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from backapp.reminders import send_due_reminders
+
+
+class Command(BaseCommand):
+    help = "Создаёт напоминания о скором и просроченном сроке задач (TASK_REMINDER_*) пачками"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--sleep", type=float, default=0, help="Пауза между пачками, сек")
+
+    def handle(self, *args, **options):
+        result = send_due_reminders(options["batch_size"], options["sleep"])
+        self.stdout.write(
+            f"Напоминаний о скором сроке: {result['TASK_DUE_SOON']}, о просроченном: {result['TASK_OVERDUE']}"
+        )
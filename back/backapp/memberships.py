@@ -0,0 +1,158 @@
+"""
+Переходы статусов участия в команде (TeamMember).
+
+  заявка:        нет записи / REJECTED -> PENDING    request_membership
+  приглашение:   нет записи / REJECTED -> INVITED    invite_users
+  рассмотрение:  PENDING -> APPROVED / REJECTED      resolve_requests
+  ответ:         INVITED -> APPROVED / REJECTED      answer_invitation
+  отзыв заявки:  PENDING -> (запись удаляется)       cancel_request
+
+Каждый переход — условный UPDATE ... WHERE status = <исходный> (или INSERT) в одной
+транзакции с уборкой и созданием уведомлений, поэтому из двух одновременных запросов
+переход выполнит только один. Начальные переходы сериализуются блокировкой строки
+команды: без неё два одновременных get_or_create создавали бы одну и ту же запись.
+Массовые переходы выполняют постоянное число запросов на пачку. UPDATE и bulk_create
+не вызывают сигналы, поэтому updated_at команды сдвигается здесь же (signals.touch), а
+счётчики статистики команды — через team_stats.record_bulk.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Team, TeamMember, Notification
+from .notifications import notify, notify_many, withdraw_team_requests
+from .signals import touch
+from .team_stats import record_bulk
+
+# Из каких статусов можно заново подать заявку или пригласить
+RESTARTABLE = ("REJECTED",)
+
+RESOLUTION_NOTIFICATIONS = {"APPROVED": "TEAM_REQUEST_APPROVED", "REJECTED": "TEAM_REQUEST_REJECTED"}
+ANSWER_NOTIFICATIONS = {"APPROVED": "TEAM_INVITATION_ACCEPTED", "REJECTED": "TEAM_INVITATION_REJECTED"}
+
+
+def _transition(queryset, source, target, **fields):
+    """Условный переход source -> target; возвращает число изменённых строк."""
+    return queryset.filter(status__in=source).update(status=target, updated_at=timezone.now(), **fields)
+
+
+def _lock_team(team):
+    Team.all_objects.select_for_update().filter(pk=team.pk).values_list("pk").first()
+
+
+def _start(team, user_ids, status, message):
+    """
+    Переводит участие пользователей user_ids в status: создаёт недостающие записи и
+    перезапускает отклонённые. Возвращает (участия, {user_id: текущий статус}) — во
+    втором словаре те, для кого переход недопустим.
+    """
+    _lock_team(team)
+    existing = {
+        membership.user_id: membership
+        for membership in team.memberships.filter(user_id__in=user_ids).only("id", "user_id", "team_id", "status")
+    }
+    conflicts = {user_id: m.status for user_id, m in existing.items() if m.status not in RESTARTABLE}
+    restarted = [m for m in existing.values() if m.status in RESTARTABLE]
+    if restarted:
+        _transition(TeamMember.objects.filter(id__in=[m.id for m in restarted]), RESTARTABLE, status, message=message)
+        for membership in restarted:
+            membership.status = status
+        record_bulk(restarted)
+        touch(Team, [team.pk])
+    created = [
+        TeamMember(team=team, user_id=user_id, status=status, message=message)
+        for user_id in user_ids if user_id not in existing
+    ]
+    if created:
+        TeamMember.objects.bulk_create(created)
+        record_bulk(created, created=True)
+        if not restarted:
+            touch(Team, [team.pk])
+    return restarted + created, conflicts
+
+
+def request_membership(team, user, message=""):
+    """Заявка user в team. Возвращает (участие, None) или (None, текущий статус), если подать нельзя."""
+    with transaction.atomic():
+        memberships, conflicts = _start(team, [user.id], "PENDING", message)
+        if conflicts:
+            return None, conflicts[user.id]
+        membership = memberships[0]
+        notify(team.creator, "TEAM_REQUEST", team=team, team_member=membership)
+    return membership, None
+
+
+def invite_users(team, user_ids, message=""):
+    """
+    Приглашает пользователей user_ids в team. Возвращает (участия приглашённых,
+    {user_id: текущий статус} для тех, кого пригласить нельзя).
+    """
+    with transaction.atomic():
+        memberships, conflicts = _start(team, list(dict.fromkeys(user_ids)), "INVITED", message)
+        notify_many(
+            "TEAM_INVITATION",
+            [{"user_id": m.user_id, "team": team, "team_member": m} for m in memberships],
+        )
+    return memberships, conflicts
+
+
+def resolve_requests(team, member_ids, status):
+    """Рассматривает заявки member_ids команды team (PENDING -> status). Возвращает рассмотренные участия."""
+    with transaction.atomic():
+        members = list(
+            team.memberships.select_for_update()
+            .filter(id__in=member_ids, status="PENDING")
+            .only("id", "user_id", "team_id", "status")
+        )
+        if not members:
+            return []
+        _transition(TeamMember.objects.filter(id__in=[m.id for m in members]), ("PENDING",), status)
+        for member in members:
+            member.status = status
+        record_bulk(members)
+        withdraw_team_requests(team.creator_id, team, [m.id for m in members])
+        notify_many(
+            RESOLUTION_NOTIFICATIONS[status],
+            [{"user_id": m.user_id, "team": team, "team_member": m} for m in members],
+        )
+        touch(Team, [team.pk])
+    return members
+
+
+def answer_invitation(user, member_id, status):
+    """Ответ user на приглашение member_id (INVITED -> status). Возвращает участие или None."""
+    with transaction.atomic():
+        membership = (
+            user.memberships.select_for_update(of=("self",))
+            .select_related("team")
+            .filter(id=member_id, status="INVITED")
+            .first()
+        )
+        if membership is None:
+            return None
+        _transition(TeamMember.objects.filter(pk=membership.pk), ("INVITED",), status)
+        membership.status = status
+        record_bulk([membership])
+        Notification.objects.filter(user=user, notification_type="TEAM_INVITATION", team=membership.team).delete()
+        notify_many(
+            ANSWER_NOTIFICATIONS[status],
+            [{"user_id": membership.team.creator_id, "team": membership.team, "team_member": membership}],
+        )
+        touch(Team, [membership.team_id])
+    return membership
+
+
+def cancel_request(user, member_id):
+    """Отзыв собственной заявки. Возвращает True, если заявка была."""
+    with transaction.atomic():
+        membership = (
+            user.memberships.select_for_update(of=("self",))
+            .select_related("team")
+            .filter(id=member_id, status="PENDING")
+            .first()
+        )
+        if membership is None:
+            return False
+        # До удаления: иначе каскад удалит склеенное уведомление, если оно ссылается на эту заявку
+        withdraw_team_requests(membership.team.creator_id, membership.team, [membership.id])
+        membership.delete()
+    return True
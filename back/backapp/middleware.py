@@ -0,0 +1,125 @@
+"""
+Сжатие ответов на стороне Django.
+
+Кодировка выбирается по Accept-Encoding (zstd > br > gzip). Для кэшируемых ответов
+(GET/HEAD, 200) сжатое тело сохраняется в кэше COMPRESSION_CACHE_ALIAS по хэшу исходного
+тела, поэтому одинаковые ответы сжимаются один раз и дальше отдаются из кэша.
+"""
+import gzip
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # brotli необязателен, без него остаётся gzip
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard необязателен, без него остаётся gzip
+    zstandard = None
+
+
+COMPRESSIBLE_TYPES = ("application/json", "application/msgpack", "text/")
+
+
+def _compress_zstd(content):
+    return zstandard.ZstdCompressor(level=3).compress(content)
+
+
+def _compress_br(content):
+    return brotli.compress(content, quality=5)
+
+
+def _compress_gzip(content):
+    return gzip.compress(content, compresslevel=6, mtime=0)
+
+
+ENCODERS = [
+    (name, func) for name, func, available in (
+        ("zstd", _compress_zstd, zstandard is not None),
+        ("br", _compress_br, brotli is not None),
+        ("gzip", _compress_gzip, True),
+    ) if available
+]
+
+
+def parse_accept_encoding(header):
+    """Множество кодировок, которые клиент принимает (q > 0)."""
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if quality > 0:
+            accepted.add(name)
+    return accepted
+
+
+def choose_encoding(header):
+    accepted = parse_accept_encoding(header)
+    for name, func in ENCODERS:
+        if name in accepted or "*" in accepted:
+            return name, func
+    return None, None
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, "COMPRESSION_MIN_SIZE", 1024)
+        self.cache_alias = getattr(settings, "COMPRESSION_CACHE_ALIAS", "compressed")
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+        if not response.get("Content-Type", "").startswith(COMPRESSIBLE_TYPES):
+            return response
+
+        # Ответ зависит от Accept-Encoding, даже если сжимать не будем
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        if len(response.content) < self.min_size:
+            return response
+
+        encoding, compress = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        if request.method in ("GET", "HEAD") and response.status_code == 200:
+            compressed = self.compress_cached(encoding, compress, response.content)
+        else:
+            compressed = compress(response.content)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+        # Как и GZipMiddleware: сжатое тело уже не побайтово совпадает с исходным
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
+
+    def compress_cached(self, encoding, compress, content):
+        cache = caches[self.cache_alias]
+        key = f"{encoding}:{hashlib.sha256(content).hexdigest()}"
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = compress(content)
+            cache.set(key, compressed)
+        return compressed
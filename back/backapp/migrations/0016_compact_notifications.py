@@ -0,0 +1,66 @@
+# Generated by Django 4.2.24 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+BATCH_SIZE = 50000
+
+# Начало текста по типу и связи, без которых текст нельзя собрать заново (см. backapp/notifications.py)
+PREFIXES = [
+    ("TEAM_INVITATION", "Вас пригласили в команду '", ("team",), None),
+    ("TEAM_REQUEST", "Пользователь ", ("team", "team_member"), None),
+    ("TEAM_REQUEST_APPROVED", "Ваша заявка на вступление в команду '", ("team",), None),
+    ("TEAM_REQUEST_REJECTED", "Ваша заявка на вступление в команду '", ("team",), None),
+    ("TEAM_INVITATION_ACCEPTED", "Пользователь ", ("team", "team_member"), None),
+    ("TEAM_INVITATION_REJECTED", "Пользователь ", ("team", "team_member"), None),
+    ("TASK_ASSIGNED", "Вам назначена новая задача: ", ("task",), {"new": True}),
+    ("TASK_ASSIGNED", "Вам назначена задача: ", ("task",), None),
+]
+
+TASK_STATUSES = [
+    ("TODO", "К выполнению"),
+    ("IN_PROGRESS", "В работе"),
+    ("DONE", "Выполнено"),
+    ("CANCELLED", "Отменено"),
+]
+
+
+def compact(apps, schema_editor):
+    """Убирает сохранённый текст у строк, текст которых собирается по шаблону. Пачками по диапазонам id."""
+    Notification = apps.get_model("backapp", "Notification")
+    bounds = Notification.objects.aggregate(low=models.Min("id"), high=models.Max("id"))
+    if bounds["low"] is None:
+        return
+
+    for low in range(bounds["low"], bounds["high"] + 1, BATCH_SIZE):
+        batch = Notification.objects.filter(id__gte=low, id__lt=low + BATCH_SIZE, message__isnull=False)
+        for notification_type, prefix, relations, params in PREFIXES:
+            batch.filter(
+                notification_type=notification_type,
+                message__startswith=prefix,
+                **{f"{relation}__isnull": False for relation in relations},
+            ).update(message=None, params=params)
+        for status, display in TASK_STATUSES:
+            batch.filter(
+                notification_type="TASK_UPDATED",
+                task__isnull=False,
+                message__startswith="Статус задачи '",
+                message__endswith=f"' изменен на '{display}'",
+            ).update(message=None, params={"status": status})
+
+
+class Migration(migrations.Migration):
+    # Каждая пачка фиксируется отдельно, чтобы не держать блокировки на всей таблице
+    atomic = False
+
+    dependencies = [
+        ('backapp', '0015_notification_retention_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='params',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.RunPython(compact, migrations.RunPython.noop),
+    ]
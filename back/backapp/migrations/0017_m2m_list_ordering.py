@@ -0,0 +1,29 @@
+# Generated by Django 4.2.24 on 2026-10-19 12:04
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backapp', '0016_compact_notifications'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='custompersonalquality',
+            options={'ordering': ['id']},
+        ),
+        migrations.AlterModelOptions(
+            name='customskill',
+            options={'ordering': ['id']},
+        ),
+        migrations.AlterModelOptions(
+            name='personalquality',
+            options={'ordering': ['name']},
+        ),
+        migrations.AlterModelOptions(
+            name='skill',
+            options={'ordering': ['name']},
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.24 on 2026-10-19 12:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backapp', '0017_m2m_list_ordering'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='team',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='backapp.team'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['team', 'status', '-created_at'], name='task_team_status_created_idx'),
+        ),
+    ]
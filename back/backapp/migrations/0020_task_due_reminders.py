@@ -0,0 +1,32 @@
+# Generated by Django 4.2.24 on 2026-10-19 12:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backapp', '0019_task_assignee_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='due_soon_reminded_for',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='overdue_reminded_for',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('TEAM_INVITATION', 'Приглашение в команду'), ('TEAM_REQUEST', 'Запрос на вступление'), ('TEAM_REQUEST_APPROVED', 'Заявка одобрена'), ('TEAM_REQUEST_REJECTED', 'Заявка отклонена'), ('TEAM_INVITATION_ACCEPTED', 'Приглашение принято'), ('TEAM_INVITATION_REJECTED', 'Приглашение отклонено'), ('TASK_ASSIGNED', 'Задача назначена'), ('TASK_UPDATED', 'Задача обновлена'), ('TASK_DUE_SOON', 'Скоро срок задачи'), ('TASK_OVERDUE', 'Задача просрочена')], max_length=30),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status__in', ['DONE', 'CANCELLED']), _negated=True), fields=['due_date'], name='task_open_due_idx'),
+        ),
+    ]
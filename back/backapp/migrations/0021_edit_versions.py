@@ -0,0 +1,23 @@
+# Generated by Django 4.2.24 on 2026-10-19 12:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backapp', '0020_task_due_reminders'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
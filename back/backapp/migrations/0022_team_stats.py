@@ -0,0 +1,69 @@
+# Generated by Django 4.2.24 on 2026-10-19 12:25
+
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+import django.db.models.deletion
+
+BATCH_SIZE = 500
+
+OPEN_STATUSES = ("TODO", "IN_PROGRESS")
+
+
+def fill(apps, schema_editor):
+    """Начальные счётчики по существующим участникам и задачам (см. backapp/team_stats.py), пачками команд."""
+    Team = apps.get_model("backapp", "Team")
+    TeamMember = apps.get_model("backapp", "TeamMember")
+    Task = apps.get_model("backapp", "Task")
+    TeamStat = apps.get_model("backapp", "TeamStat")
+
+    team_ids = list(Team.objects.order_by("id").values_list("id", flat=True))
+    for start in range(0, len(team_ids), BATCH_SIZE):
+        batch = team_ids[start:start + BATCH_SIZE]
+        rows = []
+        members = TeamMember.objects.filter(team_id__in=batch)
+        for row in members.values("team_id", "status").annotate(n=models.Count("id")).order_by():
+            rows.append((row["team_id"], "member_status", row["status"], row["n"]))
+        tasks = Task.objects.filter(team_id__in=batch)
+        for field, metric in (("status", "task_status"), ("priority", "task_priority")):
+            for row in tasks.values("team_id", field).annotate(n=models.Count("id")).order_by():
+                rows.append((row["team_id"], metric, row[field], row["n"]))
+        open_tasks = tasks.filter(status__in=OPEN_STATUSES)
+        for row in open_tasks.values("team_id", "assigned_to_id").annotate(n=models.Count("id")).order_by():
+            assignee = row["assigned_to_id"]
+            rows.append((row["team_id"], "open_assignee", "" if assignee is None else str(assignee), row["n"]))
+        due_days = (
+            open_tasks.filter(due_date__isnull=False)
+            .annotate(day=TruncDate("due_date", tzinfo=timezone.get_current_timezone()))
+            .values("team_id", "day")
+        )
+        for row in due_days.annotate(n=models.Count("id")).order_by():
+            rows.append((row["team_id"], "open_due_day", row["day"].isoformat(), row["n"]))
+        TeamStat.objects.bulk_create(
+            [TeamStat(team_id=team_id, metric=metric, bucket=bucket, value=n) for team_id, metric, bucket, n in rows],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backapp', '0021_edit_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=20)),
+                ('bucket', models.CharField(max_length=40)),
+                ('value', models.IntegerField(default=0)),
+                ('team', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='backapp.team')),
+            ],
+            options={
+                'unique_together': {('team', 'metric', 'bucket')},
+            },
+        ),
+        migrations.RunPython(fill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.24 on 2026-10-19 12:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backapp', '0022_team_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsRefresh',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('report', models.CharField(max_length=30, unique=True)),
+                ('refreshed_at', models.DateTimeField()),
+                ('changed', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SkillDemand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100, unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('supply', models.PositiveIntegerField(default=0)),
+                ('custom_supply', models.PositiveIntegerField(default=0)),
+                ('demand', models.PositiveIntegerField(default=0)),
+                ('open_demand', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('skill', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='demand', to='backapp.skill')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AnalyticsCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(max_length=30)),
+                ('key', models.CharField(max_length=40)),
+                ('label', models.CharField(max_length=150)),
+                ('value', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('dimension', 'key')},
+            },
+        ),
+    ]
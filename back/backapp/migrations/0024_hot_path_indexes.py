@@ -0,0 +1,88 @@
+# Generated by Django 4.2.24 on 2026-10-19 12:33
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+    """
+    AddIndex без блокировки записи в таблицу: на PostgreSQL — CREATE INDEX CONCURRENTLY.
+    Для секционированной таблицы (уведомления, см. backapp/retention.py) CONCURRENTLY не
+    поддерживается: индекс создаётся на родителе через ON ONLY, на каждой секции —
+    CONCURRENTLY, и индексы секций присоединяются к нему. На других СУБД — обычный AddIndex.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        table = model._meta.db_table
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT inhrelid::regclass::text FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = inhparent "
+                "WHERE parent.relname = %s AND parent.relkind = 'p'",
+                [table],
+            )
+            partitions = [row[0] for row in cursor.fetchall()]
+        if not partitions:
+            schema_editor.add_index(model, self.index, concurrently=True)
+            return
+
+        quote = schema_editor.quote_name
+        parent = self.index.create_sql(model, schema_editor)
+        parent.parts["table"] = f"ONLY {quote(table)}"
+        schema_editor.execute(parent)
+        for partition in partitions:
+            name = f"{partition}_{self.index.name}"[:63]
+            statement = self.index.create_sql(model, schema_editor, concurrently=True)
+            statement.parts["table"] = quote(partition)
+            statement.parts["name"] = quote(name)
+            schema_editor.execute(statement)
+            schema_editor.execute(f"ALTER INDEX {quote(self.index.name)} ATTACH PARTITION {quote(name)}")
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+    atomic = False
+
+    dependencies = [
+        ('backapp', '0023_analytics_summaries'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['user', '-created_at'], name='notification_user_unread_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['team', 'assigned_to', '-created_at'], name='task_team_assignee_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='team',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['-created_at'], name='team_active_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='teammember',
+            index=models.Index(fields=['user', 'status'], name='member_user_status_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='teammember',
+            index=models.Index(fields=['team', 'status'], name='member_team_status_idx'),
+        ),
+        # Индексы внешних ключей удаляются, когда их уже заменяют составные индексы
+        migrations.AlterField(
+            model_name='teammember',
+            name='team',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='backapp.team'),
+        ),
+        migrations.AlterField(
+            model_name='teammember',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
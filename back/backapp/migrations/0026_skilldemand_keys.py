@@ -0,0 +1,28 @@
+# Generated by Django 4.2.24 on 2026-10-19 13:03
+
+from django.db import migrations, models
+
+
+def rekey(apps, schema_editor):
+    """Ключи вида "skill:<id>" / "custom:<название>" вместо названия в нижнем регистре (analytics._skills)."""
+    SkillDemand = apps.get_model("backapp", "SkillDemand")
+    rows = list(SkillDemand.objects.all())
+    for row in rows:
+        row.key = f"skill:{row.skill_id}" if row.skill_id is not None else f"custom:{row.key}"
+    SkillDemand.objects.bulk_update(rows, ["key"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backapp', '0025_revokedtoken_revoked_at_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='skilldemand',
+            name='key',
+            field=models.CharField(max_length=120, unique=True),
+        ),
+        migrations.RunPython(rekey, migrations.RunPython.noop),
+    ]
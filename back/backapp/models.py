@@ -3,13 +3,82 @@ from django.utils import timezone
 import datetime
 
 
-from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.contrib.auth.models import AbstractUser, UserManager
+from django.db import models, transaction
+
+
+class NotDeletedQuerySetMixin:
+    """Менеджер по умолчанию скрывает записи, помеченные на удаление (см. deletion.py)."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class NotDeletedUserManager(NotDeletedQuerySetMixin, UserManager):
+    pass
+
+
+class NotDeletedManager(NotDeletedQuerySetMixin, models.Manager):
+    pass
+
+
+class NotDeletedRelatedManager(models.Manager):
+    """
+    Менеджер по умолчанию зависимых записей: скрывает строки, у которых внешний ключ из
+    parents указывает на пользователя или команду, помеченные на удаление. Только прямые
+    связи: строки, связанные с удалёнными через другие записи (уведомление о задаче
+    удалённого исполнителя), видны до purge_deleted(), который запускается сразу после
+    пометки. Пустые связи (null) строку не скрывают.
+
+    Условие — NOT IN (подзапрос id помеченных строк по индексу deleted_at), а не JOIN:
+    помеченных строк мало, PostgreSQL проверяет их по хэшу и не меняет план основного
+    запроса. parents — атрибут класса: менеджеры обратных связей (team.memberships)
+    Django создаёт без аргументов.
+    """
+    parents = ()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        for parent in self.parents:
+            related = self.model._meta.get_field(parent).related_model
+            queryset = queryset.exclude(**{f"{parent}__in": related.all_objects.filter(deleted_at__isnull=False).values("id")})
+        return queryset
+
+
+class StatsCountedMixin:
+    """
+    save() вместе с обработчиками post_save, которые сдвигают счётчики TeamStat
+    (team_stats.py), — в одной транзакции: Django рассылает post_save уже после записи
+    строки, и в режиме autocommit строка и счётчики коммитились бы по отдельности.
+    delete() в этом не нуждается: pre_delete рассылается внутри транзакции удаления.
+    """
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            super().save(*args, **kwargs)
+
+
+class TeamMemberManager(NotDeletedRelatedManager):
+    parents = ("team", "user")
+
+
+class TaskManager(NotDeletedRelatedManager):
+    # Задачи читаются через команду; задачи удалённых авторов и исполнителей purge_deleted() удаляет вслед за пометкой
+    parents = ("team",)
+
+
+class NotificationManager(NotDeletedRelatedManager):
+    # Уведомления читает их получатель — живой пользователь; у уведомлений о задачах и заявках team тоже задан
+    parents = ("team",)
 
 
 class Skill(models.Model):
     name = models.CharField(max_length=100, unique=True)
 
+    class Meta:
+        # Списки навыков/качеств отдаются в одном и том же порядке в DRF и быстрых сериализаторах
+        ordering = ["name"]
+
     def __str__(self):
         return self.name
 
@@ -17,6 +86,9 @@ class Skill(models.Model):
 class PersonalQuality(models.Model):
     name = models.CharField(max_length=100, unique=True)
 
+    class Meta:
+        ordering = ["name"]
+
     def __str__(self):
         return self.name
 
@@ -59,17 +131,45 @@ class User(AbstractUser):
     email_verified = models.BooleanField(default=False)
     about_myself = models.TextField(blank=True, null=True)
     position = models.CharField(max_length=100, blank=True, null=True)
+    # Обновляется и при изменении навыков/качеств (см. signals.py), используется для ETag/Last-Modified
+    updated_at = models.DateTimeField(auto_now=True)
+    # Время пометки на удаление; строка и зависимые записи удаляются позже пачками
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    objects = NotDeletedUserManager()
+    all_objects = UserManager()
 
     def __str__(self):
         return self.username
 
 
+class CachedUser(User):
+    """
+    Пользователь, восстановленный из кэша аутентификации (см. authentication.py).
+
+    Загружены только поля из CACHED_FIELDS, остальные отложены. При обращении
+    к любому отложенному полю все недостающие поля догружаются одним запросом.
+    """
+    # В порядке объявления полей модели: так их ожидает Model.from_db()
+    CACHED_FIELDS = ("id", "username", "is_staff", "is_active", "updated_at")
+
+    class Meta:
+        proxy = True
+
+    def refresh_from_db(self, using=None, fields=None):
+        deferred_fields = self.get_deferred_fields()
+        if fields is not None and deferred_fields and set(fields) <= deferred_fields:
+            fields = list(deferred_fields)
+        super().refresh_from_db(using=using, fields=fields)
+
+
 class CustomSkill(models.Model):
     name = models.CharField(max_length=100)
     user = models.ForeignKey(User, related_name="custom_skills", on_delete=models.CASCADE)
 
     class Meta:
         unique_together = ("name", "user")
+        ordering = ["id"]
 
     def __str__(self):
         return self.name
@@ -81,6 +181,7 @@ class CustomPersonalQuality(models.Model):
 
     class Meta:
         unique_together = ("name", "user")
+        ordering = ["id"]
 
     def __str__(self):
         return self.name
@@ -130,11 +231,30 @@ class Team(models.Model):
     whatsapp_link = models.URLField(blank=True, null=True, help_text="Ссылка на группу WhatsApp")
     telegram_link = models.URLField(blank=True, null=True, help_text="Ссылка на группу Telegram")
 
+    # Обновляется и при изменении навыков/качеств/участников (см. signals.py), используется для ETag/Last-Modified
+    updated_at = models.DateTimeField(auto_now=True)
+    # Номер правки полей команды для оптимистичной блокировки (concurrency.py)
+    version = models.PositiveIntegerField(default=1)
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    objects = NotDeletedManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            # Список команд (TeamViewSet.list): только не удалённые, новые сверху. Фильтр по
+            # статусу отдельного индекса не требует: статусов четыре, и первые строки страницы
+            # находятся при просмотре этого же индекса
+            models.Index(
+                fields=["-created_at"], name="team_active_created_idx", condition=models.Q(deleted_at__isnull=True),
+            ),
+        ]
+
     def __str__(self):
         return f"{self.title}"
 
 
-class TeamMember(models.Model):
+class TeamMember(StatsCountedMixin, models.Model):
     STATUS_CHOICES = [
         ("PENDING", "Ожидание"),
         ("INVITED", "Приглашен"),
@@ -142,21 +262,31 @@ class TeamMember(models.Model):
         ("REJECTED", "Отклонён"),
     ]
 
-    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="memberships")
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="memberships")
+    # Отдельные индексы по team и user не нужны: их заменяют составные индексы ниже
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="memberships", db_index=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="memberships", db_index=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="PENDING")
     message = models.TextField(blank=True, null=True, help_text="Сообщение от пользователя при подаче заявки")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TeamMemberManager()
+    all_objects = models.Manager()
+
     class Meta:
         unique_together = ("team", "user")
+        indexes = [
+            # Заявки и приглашения пользователя (users/my_requests/, my_invitations/)
+            models.Index(fields=["user", "status"], name="member_user_status_idx"),
+            # Заявки в команду (teams/{id}/requests/, bulk_approve / bulk_reject)
+            models.Index(fields=["team", "status"], name="member_team_status_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} -> {self.team.title}"
 
 
-class Task(models.Model):
+class Task(StatsCountedMixin, models.Model):
     STATUS_CHOICES = [
         ("TODO", "К выполнению"),
         ("IN_PROGRESS", "В работе"),
@@ -173,22 +303,111 @@ class Task(models.Model):
 
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True, null=True)
-    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="tasks")
+    # Отдельный индекс по team не нужен: его заменяет составной индекс (team, status, -created_at) ниже
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="tasks", db_index=False)
     creator = models.ForeignKey(User, on_delete=models.CASCADE, related_name="created_tasks")
-    assigned_to = models.ForeignKey(User, on_delete=models.CASCADE, related_name="assigned_tasks", null=True, blank=True)
+    # Индекс по исполнителю — составной (assigned_to, status, due_date) ниже
+    assigned_to = models.ForeignKey(User, on_delete=models.CASCADE, related_name="assigned_tasks", null=True, blank=True, db_index=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="TODO")
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default="MEDIUM")
     due_date = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Номер правки задачи для оптимистичной блокировки (concurrency.py)
+    version = models.PositiveIntegerField(default=1)
+    # Срок, о котором уже напомнили (reminders.py); после переноса срока напоминание придёт снова
+    due_soon_reminded_for = models.DateTimeField(null=True, blank=True)
+    overdue_reminded_for = models.DateTimeField(null=True, blank=True)
+
+    objects = TaskManager()
+    all_objects = models.Manager()
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Напоминания о сроках: только незавершённые задачи
+            models.Index(
+                fields=["due_date"], name="task_open_due_idx",
+                condition=~models.Q(status__in=["DONE", "CANCELLED"]),
+            ),
+            # Колонки доски задач (TaskViewSet.board): фильтр по команде и статусу, курсор по -created_at
+            models.Index(fields=["team", "status", "-created_at"], name="task_team_status_created_idx"),
+            # Задачи пользователя во всех командах (users/my_tasks/): фильтры по статусу и сроку
+            models.Index(fields=["assigned_to", "status", "due_date"], name="task_assignee_status_due_idx"),
+            # Задачи команды, которые видит участник (только назначенные ему), новые сверху
+            models.Index(fields=["team", "assigned_to", "-created_at"], name="task_team_assignee_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.team.title}"
 
 
+class TeamStat(models.Model):
+    """Счётчик статистики команды (team_stats.py): значение метрики metric в корзине bucket."""
+
+    # Отдельный индекс по team не нужен: его заменяет уникальный индекс (team, metric, bucket)
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="stats", db_index=False)
+    metric = models.CharField(max_length=20)
+    bucket = models.CharField(max_length=40)
+    value = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("team", "metric", "bucket")
+
+    def __str__(self):
+        return f"{self.team_id} {self.metric}/{self.bucket}: {self.value}"
+
+
+class SkillDemand(models.Model):
+    """
+    Спрос и предложение навыка для аналитики админ-панели (analytics.py). Строка на навык
+    справочника и на часто встречающийся кастомный навык (skill пустой); key — "skill:<id>"
+    или "custom:<название в нижнем регистре>".
+    """
+
+    key = models.CharField(max_length=120, unique=True)
+    name = models.CharField(max_length=100)
+    skill = models.OneToOneField(Skill, on_delete=models.CASCADE, null=True, blank=True, related_name="demand")
+    # Пользователей с навыком из справочника / с кастомным навыком того же названия
+    supply = models.PositiveIntegerField(default=0)
+    custom_supply = models.PositiveIntegerField(default=0)
+    # Команд, которым нужен навык, из них с открытым набором
+    demand = models.PositiveIntegerField(default=0)
+    open_demand = models.PositiveIntegerField(default=0)
+    # Когда значения строки последний раз изменились
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.supply + self.custom_supply} / {self.demand}"
+
+
+class AnalyticsCount(models.Model):
+    """Счётчик распределения для аналитики (analytics.py): команды по категориям, пользователи по факультетам."""
+
+    dimension = models.CharField(max_length=30)
+    key = models.CharField(max_length=40)
+    label = models.CharField(max_length=150)
+    value = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("dimension", "key")
+
+    def __str__(self):
+        return f"{self.dimension}/{self.label}: {self.value}"
+
+
+class AnalyticsRefresh(models.Model):
+    """Последний пересчёт отчёта аналитики: когда и сколько строк сводной таблицы изменилось."""
+
+    report = models.CharField(max_length=30, unique=True)
+    refreshed_at = models.DateTimeField()
+    changed = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.report}: {self.refreshed_at}"
+
+
 class Notification(models.Model):
     NOTIFICATION_TYPES = [
         ("TEAM_INVITATION", "Приглашение в команду"),
@@ -199,20 +418,49 @@ class Notification(models.Model):
         ("TEAM_INVITATION_REJECTED", "Приглашение отклонено"),
         ("TASK_ASSIGNED", "Задача назначена"),
         ("TASK_UPDATED", "Задача обновлена"),
+        ("TASK_DUE_SOON", "Скоро срок задачи"),
+        ("TASK_OVERDUE", "Задача просрочена"),
     ]
 
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="notifications")
+    # Отдельный индекс по user не нужен: его заменяет составной индекс (user, -created_at) ниже
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="notifications", db_index=False)
     notification_type = models.CharField(max_length=30, choices=NOTIFICATION_TYPES)
     team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="notifications", null=True, blank=True)
     team_member = models.ForeignKey(TeamMember, on_delete=models.CASCADE, related_name="notifications", null=True, blank=True)
     task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="notifications", null=True, blank=True)
+    # Текст собирается при чтении по шаблону типа (notifications.py); message — только у старых строк
     message = models.TextField(blank=True, null=True)
+    params = models.JSONField(blank=True, null=True)
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = NotificationManager()
+    all_objects = models.Manager()
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Список уведомлений пользователя (опрашивается фронтендом каждые 10 секунд)
+            models.Index(fields=["user", "-created_at"], name="notification_user_created_idx"),
+            # Непрочитанные уведомления пользователя (mark_all_notifications_read): только непрочитанные строки
+            models.Index(
+                fields=["user", "-created_at"], name="notification_user_unread_idx",
+                condition=models.Q(is_read=False),
+            ),
+            # Удаление по сроку хранения (retention.py)
+            models.Index(fields=["created_at"], name="notification_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.get_notification_type_display()}"
 
+
+class RevokedToken(models.Model):
+    """Отозванный refresh-токен (после ротации). Истёкшие записи удаляет prune_revoked_tokens."""
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    # Воркеры догружают новые отзывы по revoked_at (tokens.RevocationList.sync)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.jti
@@ -0,0 +1,223 @@
+"""
+Создание и отображение уведомлений.
+
+В строке Notification хранятся только тип, внешние ключи (team, team_member, task)
+и небольшой params; текст собирается при чтении по шаблону типа из актуальных
+названий команды/задачи и имени пользователя, поэтому не устаревает после
+переименований и не дублируется в каждой строке. message заполнен только у старых
+строк, которые не удалось сжать (см. миграцию 0016), — тогда он выводится как есть.
+
+Однотипные уведомления одному пользователю по одной команде/задаче, пришедшие в
+течение NOTIFICATION_COALESCE_WINDOW секунд, склеиваются в одну непрочитанную строку
+со счётчиком params["count"] («Новые заявки на вступление в команду 'X': 5»).
+У склеенных заявок в params["members"] хранятся id всех заявок, чтобы при их
+рассмотрении убирать из уведомления только рассмотренные (withdraw_team_requests).
+"""
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Notification, Task
+
+# Шаблоны по типу; варианты выбираются по params
+TEMPLATES = {
+    "TEAM_INVITATION": "Вас пригласили в команду '{team}'",
+    "TEAM_REQUEST": "Пользователь {username} подал заявку на вступление в команду '{team}'",
+    "TEAM_REQUEST_MANY": "Новые заявки на вступление в команду '{team}': {count}",
+    "TEAM_REQUEST_APPROVED": "Ваша заявка на вступление в команду '{team}' была одобрена",
+    "TEAM_REQUEST_REJECTED": "Ваша заявка на вступление в команду '{team}' была отклонена",
+    "TEAM_INVITATION_ACCEPTED": "Пользователь {username} принял приглашение в команду '{team}'",
+    "TEAM_INVITATION_REJECTED": "Пользователь {username} отклонил приглашение в команду '{team}'",
+    "TASK_ASSIGNED": "Вам назначена задача: {task}",
+    "TASK_ASSIGNED_NEW": "Вам назначена новая задача: {task}",
+    "TASK_UPDATED": "Статус задачи '{task}' изменен на '{status}'",
+    "TASK_UPDATED_MANY": "Статус задачи '{task}' изменен на '{status}' (изменений: {count})",
+    "TASK_DUE_SOON": "Скоро истекает срок задачи '{task}'",
+    "TASK_OVERDUE": "Просрочен срок задачи '{task}'",
+}
+
+# Какие связи нужны шаблону: при их отсутствии строку нельзя хранить без message
+REQUIRED_RELATIONS = {
+    "TEAM_INVITATION": ("team",),
+    "TEAM_REQUEST": ("team", "team_member"),
+    "TEAM_REQUEST_APPROVED": ("team",),
+    "TEAM_REQUEST_REJECTED": ("team",),
+    "TEAM_INVITATION_ACCEPTED": ("team", "team_member"),
+    "TEAM_INVITATION_REJECTED": ("team", "team_member"),
+    "TASK_ASSIGNED": ("task",),
+    "TASK_UPDATED": ("task",),
+    "TASK_DUE_SOON": ("task",),
+    "TASK_OVERDUE": ("task",),
+}
+
+# Склеиваемые типы и связи, которые должны совпасть у склеиваемых уведомлений (кроме пользователя)
+COALESCE_KEYS = {
+    "TEAM_REQUEST": ("team",),
+    "TASK_UPDATED": ("task",),
+    "TASK_DUE_SOON": ("task",),
+    "TASK_OVERDUE": ("task",),
+}
+
+STATUS_DISPLAY = dict(Task.STATUS_CHOICES)
+
+
+def render_message(notification_type, message, params, team_title=None, task_title=None, username=None):
+    """Текст уведомления; одинаково используется моделью и быстрым сериализатором."""
+    if message is not None:
+        return message
+    params = params or {}
+    count = params.get("count", 1)
+    template_key = notification_type
+    if notification_type == "TASK_ASSIGNED" and params.get("new"):
+        template_key = "TASK_ASSIGNED_NEW"
+    elif count > 1 and f"{notification_type}_MANY" in TEMPLATES:
+        template_key = f"{notification_type}_MANY"
+    template = TEMPLATES.get(template_key)
+    if template is None:
+        return None
+    status = params.get("status")
+    return template.format(
+        team=team_title or "",
+        task=task_title or "",
+        username=username or "",
+        status=STATUS_DISPLAY.get(status, status or ""),
+        count=count,
+    )
+
+
+def notify(user, notification_type, team=None, team_member=None, task=None, **params):
+    """
+    Создаёт уведомление без сохранения текста. Если у пользователя уже есть свежее
+    непрочитанное уведомление того же склеиваемого типа, обновляет его вместо новой строки.
+    """
+    window = getattr(settings, "NOTIFICATION_COALESCE_WINDOW", 600)
+    keys = COALESCE_KEYS.get(notification_type)
+    if keys and window:
+        relations = {"team": team, "team_member": team_member, "task": task}
+        with transaction.atomic():
+            recent = (
+                Notification.objects.select_for_update()
+                .filter(
+                    user=user,
+                    notification_type=notification_type,
+                    is_read=False,
+                    created_at__gte=timezone.now() - datetime.timedelta(seconds=window),
+                    **{key: relations[key] for key in keys},
+                )
+                .order_by("-created_at")
+                .first()
+            )
+            if recent is not None:
+                return _coalesce(recent, team_member, params)
+
+    return Notification.objects.create(
+        user=user,
+        notification_type=notification_type,
+        team=team,
+        team_member=team_member,
+        task=task,
+        params=params or None,
+    )
+
+
+def _coalesce(notification, team_member, params):
+    """Добавляет событие к уже существующему уведомлению и поднимает его наверх ленты."""
+    _merge(notification, team_member.id if team_member is not None else None, params)
+    notification.save(update_fields=["params", "team_member", "created_at"])
+    return notification
+
+
+def _merge(notification, team_member_id, params):
+    previous = notification.params or {}
+    merged = {**previous, **params, "count": previous.get("count", 1) + 1}
+    if team_member_id is not None:
+        # Повторная заявка того же участника (после отклонения) не увеличивает счётчик
+        members = [member_id for member_id in _members(notification) if member_id != team_member_id]
+        merged["members"] = members + [team_member_id]
+        merged["count"] = len(merged["members"])
+        notification.team_member_id = team_member_id
+    notification.params = merged
+    notification.created_at = timezone.now()
+
+
+def _members(notification):
+    return list((notification.params or {}).get("members") or [notification.team_member_id])
+
+
+def notify_many(notification_type, recipients, **params):
+    """
+    Уведомления одного типа для многих получателей. recipients — словари с user/user_id и
+    связями (team/team_id, team_member/team_member_id, task/task_id). Новые строки
+    создаются одним INSERT; для типов из COALESCE_KEYS свежие непрочитанные уведомления
+    с тем же ключом склейки ищутся одним SELECT и обновляются одним UPDATE.
+    """
+    notifications = [
+        Notification(notification_type=notification_type, params=params or None, **recipient)
+        for recipient in recipients
+    ]
+    window = getattr(settings, "NOTIFICATION_COALESCE_WINDOW", 600)
+    keys = COALESCE_KEYS.get(notification_type)
+    if not (keys and window and notifications):
+        return Notification.objects.bulk_create(notifications)
+
+    attnames = ["user_id"] + [f"{key}_id" for key in keys]
+
+    def coalesce_key(notification):
+        return tuple(getattr(notification, attname) for attname in attnames)
+
+    with transaction.atomic():
+        recent = Notification.objects.select_for_update().filter(
+            notification_type=notification_type,
+            is_read=False,
+            created_at__gte=timezone.now() - datetime.timedelta(seconds=window),
+            **{f"{attname}__in": {getattr(n, attname) for n in notifications} for attname in attnames},
+        ).order_by("created_at")
+        # По ключу остаётся самое свежее уведомление; в него же склеиваются повторы внутри пачки
+        targets = {coalesce_key(notification): notification for notification in recent}
+        updated = {coalesce_key(notification) for notification in targets.values()}
+        created = []
+        for notification in notifications:
+            target = targets.get(coalesce_key(notification))
+            if target is None:
+                targets[coalesce_key(notification)] = notification
+                created.append(notification)
+            else:
+                _merge(target, notification.team_member_id, params)
+        Notification.objects.bulk_update(
+            [targets[key] for key in updated], ["params", "team_member", "created_at"]
+        )
+        Notification.objects.bulk_create(created)
+    return list(targets.values())
+
+
+def withdraw_team_requests(user, team, member_ids):
+    """
+    Убирает рассмотренные заявки member_ids из уведомлений TEAM_REQUEST пользователя user:
+    из склеенного уведомления они вычитаются, уведомление без заявок удаляется.
+    Постоянное число запросов независимо от числа заявок. Возвращает число изменённых
+    или удалённых уведомлений.
+    """
+    member_ids = set(member_ids)
+    deleted, changed = [], []
+    with transaction.atomic():
+        notifications = Notification.objects.select_for_update().filter(
+            user=user, notification_type="TEAM_REQUEST", team=team
+        )
+        for notification in notifications:
+            members = _members(notification)
+            remaining = [member_id for member_id in members if member_id not in member_ids]
+            if len(remaining) == len(members):
+                continue
+            if remaining:
+                notification.params = {**notification.params, "members": remaining, "count": len(remaining)}
+                notification.team_member_id = remaining[-1]
+                changed.append(notification)
+            else:
+                deleted.append(notification.id)
+        if deleted:
+            Notification.objects.filter(id__in=deleted).delete()
+        if changed:
+            Notification.objects.bulk_update(changed, ["params", "team_member"])
+    return len(deleted) + len(changed)
@@ -0,0 +1,141 @@
+"""
+Проверка планов горячих запросов (только PostgreSQL): тест QueryPlansTest на наборе из
+generate_load_data в тестовой базе и команда check_query_plans на текущих данных (только EXPLAIN).
+
+HOT_QUERIES повторяют запросы представлений и фоновых задач, которые выполняются чаще
+всего или по большим таблицам. Каждый запрос проходит через EXPLAIN с enable_seqscan = off:
+так планировщик выбирает последовательное чтение только тогда, когда подходящего индекса
+нет, и хватает набора в несколько тысяч задач из generate_load_data. Запрос не проходит проверку, если в его плане есть Seq Scan или не
+используется ожидаемый для него индекс (индексы секций уведомлений сводятся к индексу
+родительской таблицы).
+"""
+import datetime
+import json
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Notification, Team, TeamMember, TeamStat, Task
+from .reminders import OPEN_TASKS
+from .retention import recent_notifications
+
+
+# название: (ожидаемый индекс или None, построение запроса по значениям из sample())
+HOT_QUERIES = {
+    # users/notifications/, mark_all_notifications_read
+    "notifications: лента пользователя": (
+        "notification_user_created_idx",
+        lambda s: recent_notifications(Notification.objects.filter(user_id=s["user_id"])).order_by("-created_at")[:50],
+    ),
+    "notifications: непрочитанные": (
+        "notification_user_unread_idx",
+        lambda s: Notification.objects.filter(user_id=s["user_id"], is_read=False),
+    ),
+    # users/my_requests/, my_invitations/
+    "memberships: заявки пользователя": (
+        "member_user_status_idx",
+        lambda s: TeamMember.objects.filter(user_id=s["user_id"], status="PENDING"),
+    ),
+    # teams/{id}/requests/, bulk_approve / bulk_reject
+    "memberships: заявки в команду": (
+        "member_team_status_idx",
+        lambda s: TeamMember.objects.filter(team_id=s["team_id"], status="PENDING"),
+    ),
+    # teams/ (TeamViewSet.list)
+    "teams: список": (
+        "team_active_created_idx",
+        lambda s: Team.objects.order_by("-created_at")[:20],
+    ),
+    "teams: список по статусу": (
+        "team_active_created_idx",
+        lambda s: Team.objects.filter(status="OPEN").order_by("-created_at")[:20],
+    ),
+    # teams/{id}/tasks/ для участника и колонка доски
+    "tasks: задачи участника в команде": (
+        "task_team_assignee_created_idx",
+        lambda s: Task.objects.filter(
+            team_id=s["team_id"], assigned_to_id=s["assignee_id"]
+        ).order_by("-created_at")[:20],
+    ),
+    "tasks: колонка доски": (
+        "task_team_status_created_idx",
+        lambda s: Task.objects.filter(team_id=s["team_id"], status="TODO").order_by("-created_at", "-id")[:20],
+    ),
+    # users/my_tasks/
+    "tasks: мои задачи": (
+        "task_assignee_status_due_idx",
+        lambda s: Task.objects.filter(assigned_to_id=s["assignee_id"], status__in=["TODO", "IN_PROGRESS"]),
+    ),
+    # send_due_reminders
+    "tasks: напоминания о сроках": (
+        "task_open_due_idx",
+        lambda s: Task.objects.filter(
+            OPEN_TASKS, due_date__gte=timezone.now(), due_date__lt=timezone.now() + datetime.timedelta(days=1)
+        ).order_by("due_date", "id")[:1000],
+    ),
+    # teams/{id}/stats/ (индекс unique_together, имя генерирует Django)
+    "teams: статистика": (
+        None,
+        lambda s: TeamStat.objects.filter(team_id=s["team_id"]),
+    ),
+}
+
+
+def sample():
+    """
+    Значения для фильтров по текущим данным (пользователь с уведомлениями, команда и
+    исполнитель назначенной задачи) или None, если данных нет.
+    """
+    user_id = Notification.objects.values_list("user_id", flat=True).first()
+    task = Task.objects.filter(assigned_to__isnull=False).values("team_id", "assigned_to_id").first()
+    if user_id is None or task is None:
+        return None
+    return {"user_id": user_id, "team_id": task["team_id"], "assignee_id": task["assigned_to_id"]}
+
+
+def _nodes(plan):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _nodes(child)
+
+
+def explain(queryset):
+    """(последовательно читаемые таблицы, использованные индексы) по плану queryset."""
+    plan = json.loads(queryset.explain(format="json"))[0]["Plan"]
+    seq_scans, indexes = [], []
+    for node in _nodes(plan):
+        if node["Node Type"] == "Seq Scan":
+            seq_scans.append(node["Relation Name"])
+        elif "Index Name" in node:
+            indexes.append(node["Index Name"])
+    return seq_scans, indexes
+
+
+def _parent_indexes(indexes):
+    """Имена индексов, где индексы секций заменены индексами родительской таблицы."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname, parent.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = inhrelid "
+            "JOIN pg_class parent ON parent.oid = inhparent "
+            "WHERE child.relname = ANY(%s)",
+            [list(indexes)],
+        )
+        parents = dict(cursor.fetchall())
+    return sorted({parents.get(index, index) for index in indexes})
+
+
+def check_query_plans(values):
+    """
+    {название: (Seq Scan по таблицам, использованные индексы, ожидаемый индекс или None,
+    если он использован)} для всех HOT_QUERIES.
+    """
+    results = {}
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        for name, (expected, build) in HOT_QUERIES.items():
+            seq_scans, indexes = explain(build(values))
+            indexes = _parent_indexes(indexes)
+            results[name] = (seq_scans, indexes, None if expected in indexes else expected)
+    return results
@@ -0,0 +1,78 @@
+"""
+Напоминания о сроках задач (команда send_due_reminders, по cron раз в несколько минут).
+
+  TASK_DUE_SOON — срок наступит в ближайшие TASK_REMINDER_DUE_SOON_HOURS часов;
+  TASK_OVERDUE  — срок прошёл, но не раньше TASK_REMINDER_OVERDUE_DAYS дней назад.
+Напоминание получает исполнитель, а у задачи без исполнителя — создатель.
+
+Задачи выбираются по частичному индексу task_open_due_idx (due_date незавершённых задач)
+пачками с курсором по (due_date, id): память и время прохода зависят от числа задач в
+окне, а не в таблице. Пачка обрабатывается в одной транзакции — уведомления создаются
+одним INSERT, а в задаче запоминается срок, о котором напомнили (due_soon_reminded_for /
+overdue_reminded_for). Повторный запуск ничего не дублирует, перенос срока снова включает
+напоминание. Строки пачки блокируются с SKIP LOCKED, поэтому одновременные запуски
+не отправляют одно напоминание дважды.
+"""
+import datetime
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Task
+from .notifications import notify_many
+
+# Тип уведомления и поле задачи, в котором запоминается срок отправленного напоминания
+REMINDERS = (
+    ("TASK_DUE_SOON", "due_soon_reminded_for"),
+    ("TASK_OVERDUE", "overdue_reminded_for"),
+)
+
+# То же условие, что у индекса task_open_due_idx
+OPEN_TASKS = ~Q(status__in=["DONE", "CANCELLED"])
+
+
+def reminder_windows(now):
+    soon = datetime.timedelta(hours=getattr(settings, "TASK_REMINDER_DUE_SOON_HOURS", 24))
+    overdue = datetime.timedelta(days=getattr(settings, "TASK_REMINDER_OVERDUE_DAYS", 7))
+    return {"TASK_DUE_SOON": (now, now + soon), "TASK_OVERDUE": (now - overdue, now)}
+
+
+def send_due_reminders(batch_size=1000, pause=0, now=None):
+    """Отправляет все причитающиеся напоминания. Возвращает число отправленных по типам."""
+    windows = reminder_windows(now or timezone.now())
+    return {
+        notification_type: _send(notification_type, marker, *windows[notification_type], batch_size, pause)
+        for notification_type, marker in REMINDERS
+    }
+
+
+def _send(notification_type, marker, start, end, batch_size, pause):
+    pending = Task.objects.filter(OPEN_TASKS, due_date__gte=start, due_date__lt=end).filter(
+        Q(**{f"{marker}__isnull": True}) | ~Q(**{marker: F("due_date")})
+    )
+    sent = 0
+    last = None
+    while True:
+        queryset = pending
+        if last is not None:
+            queryset = pending.filter(Q(due_date__gt=last[0]) | Q(due_date=last[0], id__gt=last[1]))
+        with transaction.atomic():
+            batch = list(
+                queryset.select_for_update(skip_locked=True)
+                .order_by("due_date", "id")
+                .values_list("id", "due_date", "team_id", "creator_id", "assigned_to_id")[:batch_size]
+            )
+            if not batch:
+                return sent
+            notify_many(notification_type, [
+                {"user_id": assigned_to_id or creator_id, "team_id": team_id, "task_id": task_id}
+                for task_id, _, team_id, creator_id, assigned_to_id in batch
+            ])
+            Task.objects.filter(id__in=[row[0] for row in batch]).update(**{marker: F("due_date")})
+        sent += len(batch)
+        last = batch[-1][1], batch[-1][0]
+        if pause:
+            time.sleep(pause)
@@ -0,0 +1,35 @@
+"""
+Рендереры ответов API: orjson вместо stdlib json и MessagePack для внутренних клиентов.
+"""
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Типы, которые не умеют orjson/msgpack (Decimal, ленивые строки перевода и т.п.),
+# приводим так же, как стандартный JSONRenderer DRF
+_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return orjson.dumps(data, default=_encoder.default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Отдаётся только при Accept: application/msgpack."""
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_encoder.default, use_bin_type=True)
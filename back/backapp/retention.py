@@ -0,0 +1,181 @@
+"""
+Хранение уведомлений: политика удаления и помесячное секционирование таблицы.
+
+Политика (prune_notifications, команда prune_notifications по cron):
+  - прочитанные уведомления старше NOTIFICATION_RETENTION_READ_DAYS дней удаляются;
+  - любые уведомления старше NOTIFICATION_RETENTION_UNREAD_DAYS дней удаляются;
+  - у каждого пользователя остаются только NOTIFICATION_MAX_PER_USER последних.
+Удаление идёт пачками (deletion.delete_in_batches), без долгих блокировок.
+
+Секционирование (только PostgreSQL, включается командой partition_notifications --convert):
+таблица уведомлений превращается в секционированную по created_at с секцией на
+каждый месяц и секцией DEFAULT. Лента уведомлений (recent_notifications) ограничена
+сроком хранения по created_at и поэтому затрагивает только свежие секции, а целиком устаревшие секции удаляются DROP TABLE
+вместо построчного DELETE. Первичный ключ становится (id, created_at) — на уведомления
+никто не ссылается, поэтому для Django это незаметно.
+"""
+import datetime
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .deletion import delete_in_batches
+from .models import Notification
+
+TABLE = Notification._meta.db_table
+PARTITION_RE = re.compile(rf"^{TABLE}_p(\d{{4}})(\d{{2}})$")
+
+
+def _expire_before(now):
+    return now - datetime.timedelta(days=getattr(settings, "NOTIFICATION_RETENTION_UNREAD_DAYS", 180))
+
+
+def recent_notifications(queryset, now=None):
+    """Уведомления не старше срока хранения: более старые всё равно удалит prune_notifications."""
+    return queryset.filter(created_at__gte=_expire_before(now or timezone.now()))
+
+
+def prune_notifications(batch_size=5000, pause=0, now=None):
+    """Применяет политику хранения. Возвращает число удалённых строк по правилам."""
+    now = now or timezone.now()
+    read_before = now - datetime.timedelta(days=getattr(settings, "NOTIFICATION_RETENTION_READ_DAYS", 30))
+    expire_before = _expire_before(now)
+    max_per_user = getattr(settings, "NOTIFICATION_MAX_PER_USER", 200)
+
+    result = {"partitions": drop_partitions_before(expire_before)}
+    result["expired"] = delete_in_batches(Notification.objects.filter(created_at__lt=expire_before), batch_size, pause)
+    result["read"] = delete_in_batches(
+        Notification.objects.filter(is_read=True, created_at__lt=read_before), batch_size, pause
+    )
+
+    over_limit = (
+        Notification.objects.order_by().values("user_id")
+        .annotate(total=Count("id")).filter(total__gt=max_per_user)
+        .values_list("user_id", flat=True)
+    )
+    result["over_limit"] = 0
+    for user_id in over_limit.iterator():
+        oldest = Notification.objects.filter(user_id=user_id).order_by("-created_at", "-id")[max_per_user:]
+        result["over_limit"] += delete_in_batches(oldest, batch_size, pause)
+    return result
+
+
+# --- Секционирование (PostgreSQL) ---
+
+def _month_start(value):
+    return datetime.datetime(value.year, value.month, 1, tzinfo=datetime.timezone.utc)
+
+
+def _next_month(month):
+    return _month_start(month + datetime.timedelta(days=32))
+
+
+def is_partitioned():
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass", [TABLE])
+        return cursor.fetchone() is not None
+
+
+def _create_partition(cursor, month):
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {TABLE}_p{month:%Y%m} PARTITION OF {TABLE} "
+        f"FOR VALUES FROM (%s) TO (%s)",
+        [month, _next_month(month)],
+    )
+
+
+def ensure_partitions(months_ahead=3):
+    """Создаёт секции с текущего месяца на months_ahead вперёд (по cron, раз в сутки-месяц)."""
+    if not is_partitioned():
+        return 0
+    month = _month_start(timezone.now())
+    with connection.cursor() as cursor:
+        for _ in range(months_ahead + 1):
+            _create_partition(cursor, month)
+            month = _next_month(month)
+    return months_ahead + 1
+
+
+def drop_partitions_before(before):
+    """Удаляет секции, все строки которых старше before. Возвращает число удалённых секций."""
+    if not is_partitioned():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = %s::regclass",
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+        dropped = 0
+        for name in names:
+            match = PARTITION_RE.match(name)
+            if not match:
+                continue
+            month = datetime.datetime(int(match[1]), int(match[2]), 1, tzinfo=datetime.timezone.utc)
+            if _next_month(month) <= before:
+                cursor.execute(f"DROP TABLE {name}")
+                dropped += 1
+    return dropped
+
+
+def convert_to_partitioned(months_ahead=3):
+    """
+    Однократно переносит таблицу уведомлений в секционированную. Выполняется в одной
+    транзакции под ACCESS EXCLUSIVE-блокировкой: на время переноса запись и чтение
+    уведомлений ждут, поэтому запускать лучше после prune_notifications и в тихое время.
+    """
+    if connection.vendor != "postgresql":
+        raise RuntimeError("Секционирование поддерживается только на PostgreSQL")
+    if is_partitioned():
+        return False
+
+    old = f"{TABLE}_unpartitioned"
+    sequence = f"{TABLE}_partitioned_id_seq"
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+        # Определения индексов (кроме первичного ключа) и внешних ключей — чтобы воссоздать их с теми же именами
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname <> %s",
+            [TABLE, f"{TABLE}_pkey"],
+        )
+        indexes = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+            [TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f"SELECT MIN(created_at), MAX(id) FROM {TABLE}")
+        oldest, max_id = cursor.fetchone()
+
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {old}")
+        cursor.execute(f"CREATE TABLE {TABLE} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)")
+        cursor.execute(f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id, created_at)")
+        # Столбец identity нельзя перенести в секционированную таблицу до PostgreSQL 17 — используем sequence
+        cursor.execute(f"CREATE SEQUENCE {sequence} OWNED BY {TABLE}.id")
+        cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{sequence}')")
+        cursor.execute("SELECT setval(%s, %s)", [sequence, max_id or 1])
+
+        month = _month_start(oldest or timezone.now())
+        last = _month_start(timezone.now())
+        for _ in range(months_ahead):
+            last = _next_month(last)
+        while month <= last:
+            _create_partition(cursor, month)
+            month = _next_month(month)
+        cursor.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+
+        cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {old}")
+        cursor.execute(f"DROP TABLE {old}")
+
+        # Определения сняты до переименования и ссылаются на прежнее имя, которое теперь у новой таблицы
+        for indexdef in indexes:
+            cursor.execute(indexdef)
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}")
+    return True
@@ -7,14 +7,127 @@ from django.conf import settings
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Prefetch
 from django.core.mail import send_mail
 from rest_framework import serializers
+from rest_framework.utils import model_meta
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from .tokens import RevocableRefreshToken
+from .notifications import render_message
+from .concurrency import save_versioned
 from .models import User, Skill, PersonalQuality, CustomSkill, CustomPersonalQuality, PendingUser, Faculty, School, \
     Team, ProjectCategory, TeamMember, Notification, Task
 
 User = get_user_model()
 
 
+def parse_fieldset_param(request, name):
+    """Разбирает параметр вида ?fields=a,b,c. Возвращает None, если параметр не передан."""
+    if request is None:
+        return None
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+    return {item.strip() for item in value.split(",") if item.strip()}
+
+
+class SparseFieldsetMixin:
+    """
+    Облегчённые ответы через ?fields= и ?expand=.
+
+    ?fields=id,username — оставляет только перечисленные поля, «тяжёлые» поля из
+    Meta.expandable_fields выводятся лишь если они перечислены в fields или expand.
+    ?expand=members (без fields) — оставляет все обычные поля, а из тяжёлых только
+    перечисленные; пустой ?expand= убирает все тяжёлые поля.
+    Без параметров сериализатор отдаёт полный набор полей, как раньше.
+    Лишние поля удаляются в __init__, поэтому их SerializerMethodField не вызываются.
+
+    Meta.fieldset_plan описывает, что нужно queryset'у для вывода поля:
+    {"поле": {"select": (...), "prefetch": (...), "only": (...)}}. Поля без записи
+    в плане считаются обычными колонками модели.
+    """
+
+    @classmethod
+    def get_requested_fields(cls, request):
+        """Множество полей для вывода или None, если нужен полный набор."""
+        if request is None or request.method not in ("GET", "HEAD", "OPTIONS"):
+            return None
+        fields = parse_fieldset_param(request, "fields")
+        expand = parse_fieldset_param(request, "expand")
+        if fields is None and expand is None:
+            return None
+
+        all_fields = set(cls.Meta.fields)
+        expandable = set(getattr(cls.Meta, "expandable_fields", ()))
+        expand = expand or set()
+        if fields is None:
+            return (all_fields - expandable) | (expandable & expand)
+        return all_fields & (fields | (expandable & expand))
+
+    @classmethod
+    def optimize_queryset(cls, queryset, request):
+        """Добавляет select_related/prefetch_related/only() только для запрошенных полей."""
+        requested = cls.get_requested_fields(request)
+        names = cls.Meta.fields if requested is None else requested
+        plan = getattr(cls.Meta, "fieldset_plan", {})
+        model_fields = {field.name for field in queryset.model._meta.concrete_fields}
+
+        select_related, prefetch_related, only = set(), [], {queryset.model._meta.pk.name}
+        for name in names:
+            field_plan = plan.get(name)
+            if field_plan is None:
+                if name in model_fields:
+                    only.add(name)
+                continue
+            select_related.update(field_plan.get("select", ()))
+            for lookup in field_plan.get("prefetch", ()):
+                if lookup not in prefetch_related:
+                    prefetch_related.append(lookup)
+            only.update(field_plan.get("only", ()))
+
+        if select_related:
+            queryset = queryset.select_related(*sorted(select_related))
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        if requested is not None:
+            queryset = queryset.only(*sorted(only))
+        return queryset
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.get_requested_fields(self.context.get("request"))
+        if requested is not None:
+            for name in list(self.fields):
+                if name not in requested:
+                    self.fields.pop(name)
+
+
+class VersionedUpdateMixin:
+    """
+    update() одним условным UPDATE по версии (concurrency.save_versioned): меняются только
+    переданные поля. Ожидаемая версия передаётся в save(expected_version=...).
+    """
+
+    def update(self, instance, validated_data):
+        expected_version = validated_data.pop("expected_version", instance.version)
+        relations = model_meta.get_field_info(instance).relations
+        many = {}
+        for attr, value in validated_data.items():
+            if attr in relations and relations[attr].to_many:
+                many[attr] = value
+            else:
+                setattr(instance, attr, value)
+        # Поля, связи many-to-many и счётчики из post_save — одной транзакцией
+        with transaction.atomic(savepoint=False):
+            save_versioned(instance, [attr for attr in validated_data if attr not in many], expected_version)
+            for attr, value in many.items():
+                getattr(instance, attr).set(value)
+        return instance
+
+
 class RegisterStep1Serializer(serializers.Serializer):
     username = serializers.CharField()
     email = serializers.EmailField()
@@ -172,6 +285,46 @@ class ChangePasswordSerializer(serializers.Serializer):
         return user
 
 
+USER_FIELDSET_PLAN = {
+    "faculty": {"select": ("faculty", "faculty__school"), "only": ("faculty__name", "faculty__school__name")},
+    "education_level_display": {"only": ("education_level",)},
+    "skills_list": {"prefetch": ("skills", "custom_skills")},
+    "personal_qualities_list": {"prefetch": ("personal_qualities", "custom_personal_qualities")},
+}
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Обновление пары токенов. Отзыв старого refresh-токена проверяется через
+    tokens.revocation_list, а пользователь читается из БД: деактивированный пользователь
+    не должен получить новую пару, даже если его запись ещё лежит в кэше аутентификации.
+    """
+    token_class = RevocableRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+
+        user_id = refresh.payload.get(jwt_settings.USER_ID_CLAIM)
+        if user_id:
+            user = User.objects.filter(**{jwt_settings.USER_ID_FIELD: user_id}).first()
+            if user is None or not jwt_settings.USER_AUTHENTICATION_RULE(user):
+                raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+
+        data = {"access": str(refresh.access_token)}
+
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            if jwt_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+
+            data["refresh"] = str(refresh)
+
+        return data
+
+
 class SkillSerializer(serializers.ModelSerializer):
     class Meta:
         model = Skill
@@ -196,23 +349,26 @@ class CustomPersonalQualitySerializer(serializers.ModelSerializer):
         fields = ("id", "name")
 
 
-class FacultySerializer(serializers.ModelSerializer):
+class FacultySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     school_name = serializers.CharField(source="school.name", read_only=True)
 
     class Meta:
         model = Faculty
         fields = ("id", "name", "school_name")
+        fieldset_plan = {"school_name": {"select": ("school",), "only": ("school__name",)}}
 
 
-class SchoolSerializer(serializers.ModelSerializer):
+class SchoolSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     faculties = FacultySerializer(many=True, read_only=True)
 
     class Meta:
         model = School
         fields = ("id", "name", "faculties")
+        expandable_fields = ("faculties",)
+        fieldset_plan = {"faculties": {"prefetch": ("faculties",)}}
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     skills = serializers.ListField(
         child=serializers.CharField(),
         write_only=True,
@@ -264,6 +420,8 @@ class UserProfileSerializer(serializers.ModelSerializer):
             "is_staff",
         ]
         read_only_fields = ["username", "email"]
+        expandable_fields = ["faculty", "about_myself", "skills_list", "personal_qualities_list"]
+        fieldset_plan = USER_FIELDSET_PLAN
 
     def get_avatar(self, obj):
         # Перезагружаем объект из БД для получения актуального значения
@@ -374,7 +532,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
 
         return instance
 
-class UserListSerializer(serializers.ModelSerializer):
+class UserListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     skills_list = serializers.SerializerMethodField()
     personal_qualities_list = serializers.SerializerMethodField()
     education_level_display = serializers.SerializerMethodField(read_only=True)
@@ -401,6 +559,8 @@ class UserListSerializer(serializers.ModelSerializer):
             "personal_qualities_list",
             "date_joined",
         ]
+        expandable_fields = ["faculty", "about_myself", "skills_list", "personal_qualities_list"]
+        fieldset_plan = USER_FIELDSET_PLAN
 
     def get_avatar(self, obj):
         # Перезагружаем объект из БД для получения актуального значения
@@ -444,7 +604,7 @@ class ProjectCategorySerializer(serializers.ModelSerializer):
         fields = ["id", "name"]
 
 
-class TeamMemberSerializer(serializers.ModelSerializer):
+class TeamMemberSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user = serializers.StringRelatedField()
     user_id = serializers.IntegerField(source='user.id', read_only=True)
     team_title = serializers.SerializerMethodField()
@@ -457,7 +617,7 @@ class TeamMemberSerializer(serializers.ModelSerializer):
         fields = ["id", "user", "user_id", "status", "message", "created_at", "updated_at", "team_title"]
 
 
-class TeamSerializer(serializers.ModelSerializer):
+class TeamSerializer(SparseFieldsetMixin, VersionedUpdateMixin, serializers.ModelSerializer):
     creator = serializers.StringRelatedField()
     required_skills = serializers.SlugRelatedField(
         many=True, slug_field="name", queryset=Skill.objects.all()
@@ -485,10 +645,25 @@ class TeamSerializer(serializers.ModelSerializer):
             "members",
             "whatsapp_link",
             "telegram_link",
+            "version",
         ]
+        read_only_fields = ["version"]
+        expandable_fields = ["members"]
+        fieldset_plan = {
+            "creator": {"select": ("creator",), "only": ("creator__username",)},
+            "category": {"select": ("category",), "only": ("category__name",)},
+            "required_skills": {"prefetch": ("required_skills",)},
+            "required_qualities": {"prefetch": ("required_qualities",)},
+            # team_title участника берётся из уже загруженной команды; порядок участников — как в
+            # FastTeamSerializer.load_members
+            "members": {
+                "prefetch": (Prefetch("memberships", queryset=TeamMember.objects.order_by("id")), "memberships__user"),
+                "only": ("title",),
+            },
+        }
 
 
-class TeamUpdateSerializer(serializers.ModelSerializer):
+class TeamUpdateSerializer(VersionedUpdateMixin, serializers.ModelSerializer):
     """Сериализатор для обновления команды владельцем"""
     required_skills = serializers.SlugRelatedField(
         many=True, slug_field="name", queryset=Skill.objects.all(), required=False
@@ -511,7 +686,9 @@ class TeamUpdateSerializer(serializers.ModelSerializer):
             "required_qualities",
             "whatsapp_link",
             "telegram_link",
+            "version",
         ]
+        read_only_fields = ["version"]
 
 
 class TeamMemberUpdateSerializer(serializers.ModelSerializer):
@@ -535,17 +712,47 @@ class TeamJoinRequestSerializer(serializers.ModelSerializer):
         read_only_fields = ["status", "team", "team_title", "created_at"]
 
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     team_title = serializers.CharField(source='team.title', read_only=True)
     notification_type_display = serializers.CharField(source='get_notification_type_display', read_only=True)
     team_member = TeamJoinRequestSerializer(read_only=True)
+    message = serializers.SerializerMethodField()
 
     class Meta:
         model = Notification
         fields = ["id", "notification_type", "notification_type_display", "team", "team_title", "team_member", "message", "is_read", "created_at"]
+        expandable_fields = ["team_member"]
+        fieldset_plan = {
+            "notification_type_display": {"only": ("notification_type",)},
+            "team_title": {"select": ("team",), "only": ("team__title",)},
+            "team_member": {
+                "select": ("team_member", "team_member__user", "team_member__team"),
+                "only": (
+                    "team_member__status", "team_member__message", "team_member__created_at",
+                    "team_member__user__username", "team_member__team__title",
+                ),
+            },
+            "message": {
+                "select": ("team", "task", "team_member__user"),
+                "only": (
+                    "notification_type", "message", "params", "team__title", "task__title",
+                    "team_member__user__username",
+                ),
+            },
+        }
+
+    def get_message(self, obj):
+        return render_message(
+            obj.notification_type,
+            obj.message,
+            obj.params,
+            team_title=obj.team.title if obj.team_id else None,
+            task_title=obj.task.title if obj.task_id else None,
+            username=obj.team_member.user.username if obj.team_member_id else None,
+        )
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     creator = serializers.StringRelatedField(read_only=True)
     assigned_to = serializers.StringRelatedField(read_only=True)
     team_title = serializers.CharField(source='team.title', read_only=True)
@@ -557,9 +764,22 @@ class TaskSerializer(serializers.ModelSerializer):
         fields = [
             "id", "title", "description", "team", "team_title", "creator", 
             "assigned_to", "status", "status_display", "priority", "priority_display", 
-            "due_date", "created_at", "updated_at"
+            "due_date", "created_at", "updated_at", "version"
         ]
-        read_only_fields = ["creator", "created_at", "updated_at"]
+        read_only_fields = ["creator", "created_at", "updated_at", "version"]
+        fieldset_plan = {
+            "team_title": {"select": ("team",), "only": ("team__title",)},
+            "creator": {"select": ("creator",), "only": ("creator__username",)},
+            "assigned_to": {"select": ("assigned_to",), "only": ("assigned_to__username",)},
+            "status_display": {"only": ("status",)},
+            "priority_display": {"only": ("priority",)},
+        }
+
+
+def check_assignee(team_id, user):
+    """Исполнителем задачи может быть только участник команды."""
+    if user is not None and not TeamMember.objects.filter(team_id=team_id, user=user, status="APPROVED").exists():
+        raise serializers.ValidationError({'assigned_to': 'Исполнитель должен быть участником команды'})
 
 
 class TaskCreateSerializer(serializers.ModelSerializer):
@@ -584,17 +804,19 @@ class TaskCreateSerializer(serializers.ModelSerializer):
                 validated_data['assigned_to'] = user
             except User.DoesNotExist:
                 raise serializers.ValidationError({'assigned_to_username': 'Пользователь не найден'})
+        check_assignee(validated_data['team'].id, validated_data.get('assigned_to'))
         return super().create(validated_data)
 
 
-class TaskUpdateSerializer(serializers.ModelSerializer):
+class TaskUpdateSerializer(VersionedUpdateMixin, serializers.ModelSerializer):
     assigned_to_username = serializers.CharField(write_only=True, required=False, allow_blank=True)
     
     class Meta:
         model = Task
         fields = [
-            "title", "description", "assigned_to", "assigned_to_username", "priority", "due_date", "status"
+            "title", "description", "assigned_to", "assigned_to_username", "priority", "due_date", "status", "version"
         ]
+        read_only_fields = ["version"]
         extra_kwargs = {
             'assigned_to': {'required': False}
         }
@@ -611,6 +833,47 @@ class TaskUpdateSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError({'assigned_to_username': 'Пользователь не найден'})
         elif assigned_to_username == '':
             validated_data['assigned_to'] = None
+        assignee = validated_data.get('assigned_to')
+        if assignee is not None and assignee.pk != instance.assigned_to_id:
+            check_assignee(instance.team_id, assignee)
         return super().update(instance, validated_data)
 
 
+class TaskBulkChangesSerializer(serializers.Serializer):
+    """
+    Изменения для массовой правки задач (TaskViewSet.bulk_update); нужно хотя бы одно поле.
+    В context передаётся team_id — исполнитель проверяется так же, как для одной задачи.
+    """
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=Task.PRIORITY_CHOICES, required=False)
+    assigned_to = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), allow_null=True, required=False)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError("Укажите хотя бы одно изменение: status, priority или assigned_to.")
+        check_assignee(self.context["team_id"], attrs.get("assigned_to"))
+        return attrs
+
+
+class AdminTeamSerializer(serializers.ModelSerializer):
+    """Строка таблицы команд в админ-панели: только колонки таблицы, без связей many-to-many."""
+    creator = serializers.CharField(source='creator.username', read_only=True)
+    category = serializers.CharField(source='category.name', read_only=True)
+
+    class Meta:
+        model = Team
+        fields = ['id', 'title', 'creator', 'category', 'status', 'created_at']
+
+
+class AdminUserSerializer(serializers.ModelSerializer):
+    """Строка таблицы пользователей в админ-панели."""
+    faculty = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'email', 'first_name', 'last_name', 'faculty', 'is_staff', 'date_joined']
+
+    def get_faculty(self, obj):
+        if obj.faculty_id is None:
+            return None
+        return {'id': obj.faculty_id, 'name': obj.faculty.name}
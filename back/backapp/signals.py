@@ -0,0 +1,88 @@
+"""
+Поддержка updated_at у User и Team в актуальном состоянии.
+
+auto_now срабатывает только при save() самой модели, а ответы API включают
+M2M-связи, кастомные навыки и участников команды. Эти обработчики сдвигают
+updated_at владельца, чтобы ETag/Last-Modified менялись вместе с ответом.
+
+Здесь же сбрасывается кэш аутентификации (authentication.py) при изменении пользователя
+и обновляются счётчики статистики команды (team_stats.py) при записи Task/TeamMember.
+"""
+from django.db.models.signals import m2m_changed, post_init, post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import team_stats
+from .authentication import forget_cached_users
+from .models import User, CachedUser, Team, TeamMember, Task, CustomSkill, CustomPersonalQuality
+
+
+def touch(model, pks):
+    pks = [pk for pk in pks if pk is not None]
+    if pks:
+        model.objects.filter(pk__in=pks).update(updated_at=timezone.now())
+        if model is User:
+            forget_cached_users(pks)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=CachedUser)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    # Профиль, пароль, is_staff/is_active — всё меняется через save()
+    forget_cached_users([instance.pk])
+
+
+def _touch_m2m_owner(model, instance, action, reverse, pk_set):
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        # Изменение со стороны навыка/качества: pk_set содержит id владельцев
+        touch(model, pk_set or [])
+    else:
+        touch(model, [instance.pk])
+
+
+@receiver(m2m_changed, sender=User.skills.through)
+@receiver(m2m_changed, sender=User.personal_qualities.through)
+def touch_user_on_m2m_change(sender, instance, action, reverse, pk_set, **kwargs):
+    _touch_m2m_owner(User, instance, action, reverse, pk_set)
+
+
+@receiver(m2m_changed, sender=Team.required_skills.through)
+@receiver(m2m_changed, sender=Team.required_qualities.through)
+def touch_team_on_m2m_change(sender, instance, action, reverse, pk_set, **kwargs):
+    _touch_m2m_owner(Team, instance, action, reverse, pk_set)
+
+
+@receiver(post_save, sender=CustomSkill)
+@receiver(post_delete, sender=CustomSkill)
+@receiver(post_save, sender=CustomPersonalQuality)
+@receiver(post_delete, sender=CustomPersonalQuality)
+def touch_user_on_custom_change(sender, instance, **kwargs):
+    touch(User, [instance.user_id])
+
+
+@receiver(post_save, sender=TeamMember)
+@receiver(post_delete, sender=TeamMember)
+def touch_team_on_membership_change(sender, instance, **kwargs):
+    touch(Team, [instance.team_id])
+
+
+@receiver(post_init, sender=Task)
+@receiver(post_init, sender=TeamMember)
+def remember_stats_state(sender, instance, **kwargs):
+    # Вклад строки в счётчики при загрузке: при сохранении учитывается только разница
+    instance._stats_state = team_stats.state(instance)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=TeamMember)
+def count_team_stats_on_save(sender, instance, created, **kwargs):
+    team_stats.saved(instance, created)
+
+
+@receiver(pre_delete, sender=Task)
+@receiver(pre_delete, sender=TeamMember)
+def count_team_stats_on_delete(sender, instance, **kwargs):
+    team_stats.deleting(instance)
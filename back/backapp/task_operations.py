@@ -0,0 +1,90 @@
+"""
+Массовые операции над задачами команды (TaskViewSet.bulk_update / bulk_delete).
+
+Права проверяются сразу для всей пачки по правилам изменения одной задачи
+(TaskViewSet.perform_update / perform_destroy): создатель задачи меняет любые поля и
+удаляет её, исполнитель — только статус; новый исполнитель должен быть участником
+команды (serializers.check_assignee в TaskBulkChangesSerializer). Если хоть одна
+задача не найдена или недоступна, пачка не применяется. Изменение — один UPDATE ... WHERE id IN (...),
+уведомления TASK_ASSIGNED / TASK_UPDATED создаются пачкой (notify_many), счётчики
+статистики команды (team_stats.py) сдвигаются одним запросом.
+"""
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+from .notifications import notify_many
+from .team_stats import TASK_FIELDS, batched, record_bulk
+
+# Поля, которые может менять только создатель задачи
+CREATOR_ONLY_FIELDS = ("assigned_to", "priority")
+
+
+def _lock_tasks(team_id, task_ids):
+    return list(
+        Task.objects.select_for_update(of=("self",))
+        .filter(team_id=team_id, team__deleted_at__isnull=True, id__in=task_ids)
+        .only("id", "creator_id", *TASK_FIELDS)
+    )
+
+
+def _check(task_ids, tasks, allowed):
+    """Возвращает (не найденные id, недоступные id)."""
+    found = {task.id for task in tasks}
+    missing = [task_id for task_id in task_ids if task_id not in found]
+    forbidden = sorted(task.id for task in tasks if not allowed(task))
+    return missing, forbidden
+
+
+def update_tasks(user, team_id, task_ids, changes):
+    """
+    Применяет changes (status, priority, assigned_to) к задачам task_ids команды team_id.
+    Возвращает (id изменённых задач, не найденные id, недоступные id); при непустых
+    двух последних ничего не меняется.
+    """
+    creator_only = any(field in changes for field in CREATOR_ONLY_FIELDS)
+
+    def allowed(task):
+        return task.creator_id == user.id or (not creator_only and task.assigned_to_id == user.id)
+
+    with transaction.atomic():
+        tasks = _lock_tasks(team_id, task_ids)
+        missing, forbidden = _check(task_ids, tasks, allowed)
+        if missing or forbidden:
+            return [], missing, forbidden
+
+        Task.objects.filter(id__in=[task.id for task in tasks]).update(
+            updated_at=timezone.now(), version=F("version") + 1, **changes
+        )
+
+        # Как в perform_update: новый исполнитель получает TASK_ASSIGNED, а смена статуса
+        # исполнителем — TASK_UPDATED создателю
+        assignee = changes.get("assigned_to")
+        if assignee is not None:
+            notify_many("TASK_ASSIGNED", [
+                {"user": assignee, "team_id": team_id, "task_id": task.id}
+                for task in tasks if task.assigned_to_id != assignee.id
+            ])
+        if "status" in changes:
+            notify_many("TASK_UPDATED", [
+                {"user_id": task.creator_id, "team_id": team_id, "task_id": task.id}
+                for task in tasks if task.creator_id != user.id
+            ], status=changes["status"])
+
+        for task in tasks:
+            for field, value in changes.items():
+                setattr(task, field, value)
+        record_bulk(tasks)
+    return [task.id for task in tasks], [], []
+
+
+def delete_tasks(user, team_id, task_ids):
+    """Удаляет задачи task_ids, созданные user. Возвращает то же, что update_tasks."""
+    with transaction.atomic(), batched():
+        tasks = _lock_tasks(team_id, task_ids)
+        missing, forbidden = _check(task_ids, tasks, lambda task: task.creator_id == user.id)
+        if missing or forbidden:
+            return [], missing, forbidden
+        Task.objects.filter(id__in=[task.id for task in tasks]).delete()
+    return [task.id for task in tasks], [], []
@@ -0,0 +1,255 @@
+"""
+Статистика команды (teams/{id}/stats/) из счётчиков TeamStat.
+
+Счётчик — строка (команда, метрика, корзина, значение):
+
+  member_status / <статус>       участники по статусу
+  task_status   / <статус>       задачи по статусу
+  task_priority / <приоритет>    задачи по приоритету
+  open_assignee / <id или "">    незавершённые задачи по исполнителю ("" — без исполнителя)
+  open_due_day  / <YYYY-MM-DD>   незавершённые задачи по дню срока (в TIME_ZONE)
+
+Каждая запись TeamMember/Task сдвигает счётчики на разницу между прежним и новым
+вкладом строки: save()/delete() одного объекта — через сигналы (signals.py), UPDATE и
+bulk_create в memberships.py и task_operations.py — явно (record_bulk). Дельты
+применяются одним INSERT ... ON CONFLICT DO UPDATE SET value = value + дельта в той же
+транзакции, что и запись: save() у Task/TeamMember выполняется вместе с post_save в
+transaction.atomic() (models.StatsCountedMixin), так же — версионная правка
+(concurrency.save_versioned), pre_delete рассылается внутри транзакции удаления, а record_bulk вызывается внутри transaction.atomic() этих модулей. Чтение
+статистики — выборка строк одной команды, число которых не зависит от числа задач. Просроченными считаются задачи со сроком в прошлые дни.
+
+Пути в обход ORM (COPY в generate_load_data, пакетное удаление в deletion.py) пересчитывают
+счётчики затронутых команд целиком (rebuild_team_stats); той же функцией счётчики можно
+сверить командой rebuild_team_stats.
+"""
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Task, TeamMember, TeamStat, User
+
+OPEN_STATUSES = ("TODO", "IN_PROGRESS")
+
+# Поля, от которых зависит вклад строки в счётчики
+TASK_FIELDS = ("team_id", "status", "priority", "assigned_to_id", "due_date")
+MEMBER_FIELDS = ("team_id", "status")
+
+# Строк в одном INSERT: ограничение SQLite на число параметров запроса
+UPSERT_BATCH_SIZE = 1000
+
+_local = threading.local()
+
+
+def _count_task(deltas, state, sign):
+    team_id, status, priority, assigned_to_id, due_date = state
+    deltas[(team_id, "task_status", status)] += sign
+    deltas[(team_id, "task_priority", priority)] += sign
+    if status in OPEN_STATUSES:
+        deltas[(team_id, "open_assignee", "" if assigned_to_id is None else str(assigned_to_id))] += sign
+        if due_date is not None:
+            deltas[(team_id, "open_due_day", timezone.localdate(due_date).isoformat())] += sign
+
+
+def _count_member(deltas, state, sign):
+    team_id, status = state
+    deltas[(team_id, "member_status", status)] += sign
+
+
+COUNTED = {Task: (TASK_FIELDS, _count_task), TeamMember: (MEMBER_FIELDS, _count_member)}
+
+
+def state(instance):
+    """Значения полей, от которых зависят счётчики, или None, если часть полей не загружена (only/defer)."""
+    fields, _ = COUNTED[type(instance)]
+    values = instance.__dict__
+    if any(field not in values for field in fields):
+        return None
+    return tuple(values[field] for field in fields)
+
+
+def _diff(deltas, instance, created):
+    """
+    Добавляет в deltas разницу между запомненным (при загрузке) и текущим вкладом
+    instance и запоминает текущий. False, если вклад неизвестен.
+    """
+    _, count = COUNTED[type(instance)]
+    old = None if created else getattr(instance, "_stats_state", None)
+    new = state(instance)
+    instance._stats_state = new
+    if new is None or (old is None and not created):
+        return False
+    if old != new:
+        if old is not None:
+            count(deltas, old, -1)
+        count(deltas, new, 1)
+    return True
+
+
+def saved(instance, created):
+    """Обработчик post_save для Task и TeamMember."""
+    deltas = Counter()
+    if _diff(deltas, instance, created):
+        record(deltas)
+    else:
+        rebuild_team_stats([instance.team_id])
+
+
+def deleting(instance):
+    """
+    Обработчик pre_delete для Task и TeamMember. pre_delete, а не post_delete: при каскадном
+    удалении команды строки TeamStat удаляются раньше, чем рассылается post_delete.
+    """
+    _, count = COUNTED[type(instance)]
+    current = getattr(instance, "_stats_state", None) or state(instance)
+    if current is None:
+        rebuild_team_stats([instance.team_id])
+        return
+    deltas = Counter()
+    count(deltas, current, -1)
+    record(deltas)
+
+
+def record_bulk(instances, created=False):
+    """
+    Учитывает изменения instances, записанные в обход сигналов (UPDATE, bulk_create):
+    у объектов уже должны стоять новые значения полей.
+    """
+    deltas = Counter()
+    unknown = {instance.team_id for instance in instances if not _diff(deltas, instance, created)}
+    record(Counter({key: n for key, n in deltas.items() if key[0] not in unknown}))
+    if unknown:
+        rebuild_team_stats(unknown)
+
+
+def record(deltas):
+    """Применяет дельты сразу или, внутри batched(), в конце блока."""
+    pending = getattr(_local, "pending", None)
+    if pending is None:
+        apply_deltas(deltas)
+    else:
+        pending.update(deltas)
+
+
+@contextmanager
+def batched():
+    """Дельты, записанные внутри блока (в том числе сигналами), применяются одним запросом на выходе."""
+    if getattr(_local, "pending", None) is not None:
+        yield
+        return
+    _local.pending = Counter()
+    try:
+        yield
+        pending = _local.pending
+    finally:
+        _local.pending = None
+    apply_deltas(pending)
+
+
+def apply_deltas(deltas, replace=False):
+    """
+    Прибавляет дельты {(team_id, metric, bucket): n} к счётчикам (replace=True — записывает
+    значения вместо прибавления). Строки идут в порядке ключа, чтобы параллельные
+    транзакции блокировали их в одном порядке.
+    """
+    rows = sorted((key, value) for key, value in deltas.items() if value or replace)
+    if not rows:
+        return
+    qn = connection.ops.quote_name
+    table = qn(TeamStat._meta.db_table)
+    key_columns = ", ".join(qn(column) for column in ("team_id", "metric", "bucket"))
+    value = qn("value")
+    new_value = f"EXCLUDED.{value}" if replace else f"{table}.{value} + EXCLUDED.{value}"
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            batch = rows[start:start + UPSERT_BATCH_SIZE]
+            cursor.execute(
+                f"INSERT INTO {table} ({key_columns}, {value}) "
+                f"VALUES {', '.join(['(%s, %s, %s, %s)'] * len(batch))} "
+                f"ON CONFLICT ({key_columns}) DO UPDATE SET {value} = {new_value}",
+                [param for (team_id, metric, bucket), n in batch for param in (team_id, metric, bucket, n)],
+            )
+
+
+def rebuild_team_stats(team_ids, batch_size=500, pause=0):
+    """Пересчитывает счётчики команд team_ids по текущим строкам: несколько GROUP BY на пачку команд."""
+    team_ids = sorted(set(team_ids))
+    for start in range(0, len(team_ids), batch_size):
+        _rebuild(team_ids[start:start + batch_size])
+        if pause:
+            time.sleep(pause)
+
+
+def _rebuild(team_ids):
+    with transaction.atomic():
+        # Блокировка существующих счётчиков: дельты параллельных записей применятся после пересчёта
+        existing = list(
+            TeamStat.objects.select_for_update()
+            .filter(team_id__in=team_ids)
+            .values_list("id", "team_id", "metric", "bucket")
+        )
+        values = Counter()
+        members = TeamMember.objects.filter(team_id__in=team_ids).values("team_id", "status")
+        for row in members.annotate(n=Count("id")).order_by():
+            values[(row["team_id"], "member_status", row["status"])] = row["n"]
+        tasks = Task.objects.filter(team_id__in=team_ids)
+        for field, metric in (("status", "task_status"), ("priority", "task_priority")):
+            for row in tasks.values("team_id", field).annotate(n=Count("id")).order_by():
+                values[(row["team_id"], metric, row[field])] = row["n"]
+        open_tasks = tasks.filter(status__in=OPEN_STATUSES)
+        for row in open_tasks.values("team_id", "assigned_to_id").annotate(n=Count("id")).order_by():
+            assignee = row["assigned_to_id"]
+            values[(row["team_id"], "open_assignee", "" if assignee is None else str(assignee))] = row["n"]
+        due_days = (
+            open_tasks.filter(due_date__isnull=False)
+            .annotate(day=TruncDate("due_date", tzinfo=timezone.get_current_timezone()))
+            .values("team_id", "day")
+        )
+        for row in due_days.annotate(n=Count("id")).order_by():
+            values[(row["team_id"], "open_due_day", row["day"].isoformat())] = row["n"]
+
+        stale = [row[0] for row in existing if row[1:] not in values]
+        if stale:
+            TeamStat.objects.filter(id__in=stale).delete()
+        apply_deltas(values, replace=True)
+
+
+def team_stats(team):
+    """Ответ teams/{id}/stats/: один запрос к счётчикам команды и один — к именам исполнителей."""
+    counters = defaultdict(dict)
+    for metric, bucket, value in team.stats.exclude(value=0).values_list("metric", "bucket", "value"):
+        counters[metric][bucket] = value
+
+    by_status = {status: counters["task_status"].get(status, 0) for status, _ in Task.STATUS_CHOICES}
+    due_days = counters["open_due_day"]
+    today = timezone.localdate().isoformat()
+    workload = sorted(counters["open_assignee"].items(), key=lambda item: (-item[1], item[0]))
+    assignees = [int(bucket) for bucket, _ in workload if bucket]
+    usernames = dict(User.objects.filter(id__in=assignees).values_list("id", "username")) if assignees else {}
+
+    return {
+        "members": {status: counters["member_status"].get(status, 0) for status, _ in TeamMember.STATUS_CHOICES},
+        "tasks": {
+            "total": sum(by_status.values()),
+            "by_status": by_status,
+            "by_priority": {
+                priority: counters["task_priority"].get(priority, 0) for priority, _ in Task.PRIORITY_CHOICES
+            },
+            "open": sum(by_status[status] for status in OPEN_STATUSES),
+            "overdue": sum(count for day, count in due_days.items() if day < today),
+            "due_today": due_days.get(today, 0),
+        },
+        "workload": [
+            {
+                "user_id": int(bucket) if bucket else None,
+                "username": usernames.get(int(bucket)) if bucket else None,
+                "open_tasks": count,
+            }
+            for bucket, count in workload
+        ],
+    }
@@ -1,3 +1,143 @@
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from .fast_serializers import FastNotificationSerializer, FastTeamSerializer, FastUserListSerializer
+from .query_plans import check_query_plans, sample
+from .models import (
+    CustomPersonalQuality, CustomSkill, Faculty, Notification, PersonalQuality, ProjectCategory, School, Skill,
+    Team, TeamMember, User,
+)
+from .serializers import NotificationSerializer, TeamSerializer, UserListSerializer
+
+
+class FastSerializersGoldenTest(TestCase):
+    """
+    Быстрые сериализаторы (fast_serializers.py) должны отдавать байт в байт то же, что и
+    DRF-сериализаторы: при любом наборе ?fields=/?expand=, с запросом и без него.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        school = School.objects.create(name="Школа")
+        faculty = Faculty.objects.create(name="Факультет", school=school)
+        lone_faculty = Faculty.objects.create(name="Без школы")
+        python, django_skill = Skill.objects.create(name="Python"), Skill.objects.create(name="Django")
+        quality = PersonalQuality.objects.create(name="Ответственность")
+        category = ProjectCategory.objects.create(name="Наука")
+
+        cls.users = [
+            User.objects.create_user(
+                username=f"user{number}", email=f"user{number}@example.com", password="password",
+                first_name=f"Имя{number}", faculty=faculty_, course=number, about_myself=about, avatar=avatar,
+            )
+            for number, faculty_, about, avatar in (
+                (1, faculty, "О себе", "avatars/one.png"),
+                (2, lone_faculty, None, None),
+                (3, None, "", "avatars/three.png"),
+            )
+        ]
+        first, second, third = cls.users
+        first.skills.set([python, django_skill])
+        first.personal_qualities.set([quality])
+        CustomSkill.objects.create(user=first, name="Rust")
+        CustomPersonalQuality.objects.create(user=second, name="Упорство")
+
+        cls.team = Team.objects.create(
+            title="Команда", description="Описание", creator=first, category=category,
+            telegram_link="https://t.me/team",
+        )
+        cls.team.required_skills.set([django_skill, python])
+        cls.team.required_qualities.set([quality])
+        # Участники добавлены не по порядку id пользователей: порядок задаёт id участия
+        for user, status in ((third, "APPROVED"), (first, "APPROVED"), (second, "PENDING")):
+            TeamMember.objects.create(team=cls.team, user=user, status=status)
+        Team.objects.create(title="Пустая", description="", creator=second, category=category)
+
+        request = TeamMember.objects.get(team=cls.team, user=second)
+        Notification.objects.create(
+            user=first, notification_type="TEAM_REQUEST", team=cls.team, team_member=request,
+            params={"username": second.username, "team_title": cls.team.title},
+        )
+        Notification.objects.create(user=second, notification_type="TEAM_REQUEST_REJECTED", team=cls.team)
+        Notification.objects.create(user=third, notification_type="TASK_OVERDUE", message="Старый текст")
+
+    def request(self, query=""):
+        return Request(APIRequestFactory().get(f"/api/?{query}"))
+
+    def assertSameOutput(self, fast_class, serializer_class, queryset, request):
+        fast = fast_class(request)
+        fast_data = fast.to_representation(fast.get_queryset(queryset))
+        drf_data = serializer_class(
+            serializer_class.optimize_queryset(queryset, request), many=True, context={"request": request},
+        ).data
+        self.assertEqual(JSONRenderer().render(fast_data), JSONRenderer().render(drf_data))
+        return fast_data
+
+    def test_users(self):
+        queryset = User.objects.order_by("id")
+        for query in (None, "", "fields=id,username,avatar", "expand=skills_list,faculty",
+                      "fields=id,faculty&expand=faculty", "expand=", "fields=about_myself&expand=about_myself"):
+            with self.subTest(query=query):
+                request = None if query is None else self.request(query)
+                self.assertSameOutput(FastUserListSerializer, UserListSerializer, queryset, request)
+
+    def test_avatar_urls(self):
+        data = self.assertSameOutput(
+            FastUserListSerializer, UserListSerializer, User.objects.order_by("id"), self.request("fields=id,avatar"),
+        )
+        self.assertEqual(data[0]["avatar"], "https://testserver/media/avatars/one.png")
+        self.assertIsNone(data[1]["avatar"])
+
+    def test_teams(self):
+        queryset = Team.objects.order_by("id")
+        for query in (None, "", "fields=id,title,members", "expand=members", "fields=members&expand=members",
+                      "expand=", "fields=required_skills,creator,category"):
+            with self.subTest(query=query):
+                request = None if query is None else self.request(query)
+                self.assertSameOutput(FastTeamSerializer, TeamSerializer, queryset, request)
+
+    def test_team_members_order(self):
+        data = self.assertSameOutput(
+            FastTeamSerializer, TeamSerializer, Team.objects.filter(pk=self.team.pk), self.request("expand=members"),
+        )
+        self.assertEqual(
+            [member["user"] for member in data[0]["members"]], ["user3", "user1", "user2"],
+        )
+
+    def test_notifications(self):
+        queryset = Notification.objects.order_by("id")
+        for query in (None, "", "fields=id,message,team_title", "expand=team_member",
+                      "fields=team_member&expand=team_member", "expand="):
+            with self.subTest(query=query):
+                request = None if query is None else self.request(query)
+                self.assertSameOutput(FastNotificationSerializer, NotificationSerializer, queryset, request)
+
+
+@skipUnless(connection.vendor == "postgresql", "EXPLAIN горячих запросов проверяется только на PostgreSQL")
+class QueryPlansTest(TestCase):
+    """Горячие запросы (query_plans.HOT_QUERIES) идут по ожидаемым индексам без Seq Scan."""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command("load_reference_data", stdout=StringIO())
+        # На совсем маленьком наборе планировщик берёт соседние индексы с тем же префиксом (team_id)
+        call_command(
+            "generate_load_data", users=500, teams=100, tasks_per_team=50, prefix="plans", stdout=StringIO(),
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
 
-# Create your tests here.
+    def test_hot_queries_use_indexes(self):
+        values = sample()
+        self.assertIsNotNone(values)
+        for name, (seq_scans, indexes, missing) in check_query_plans(values).items():
+            with self.subTest(query=name):
+                self.assertEqual(seq_scans, [], f"Seq Scan, индексы в плане: {indexes}")
+                self.assertIsNone(missing, f"индексы в плане: {indexes}")
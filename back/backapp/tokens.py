@@ -0,0 +1,157 @@
+"""
+Ротация refresh-токенов без обращения к БД на каждой проверке отзыва.
+
+Отозванные при ротации jti записываются в RevokedToken (один INSERT). Для проверки
+каждый воркер держит в памяти Bloom-фильтр всех неистёкших отозванных jti и раз
+в TOKEN_REVOCATION_SYNC_INTERVAL секунд догружает только новые строки. Новые строки
+ищутся по revoked_at, а не по id: id выдаются до коммита, и транзакция с меньшим id
+может закоммититься позже уже прочитанной большей. Поэтому каждая синхронизация
+перечитывает строки с revoked_at не раньше начала предыдущей минус
+TOKEN_REVOCATION_SYNC_OVERLAP секунд (запас на долгие транзакции и расхождение часов
+серверов); уже загруженные в этом окне jti не считаются повторно.
+Чтобы отзыв сразу был виден всем воркерам, jti дополнительно кладётся в общий кэш
+TOKEN_REVOCATION_CACHE_ALIAS (Redis, settings.REDIS_URL) до истечения самого токена;
+фильтр с синхронизацией остаётся запасным путём, если запись вытеснена из кэша.
+
+Bloom-фильтр может ошибаться только в сторону «отозван», поэтому при попадании
+jti перепроверяется точным запросом; для неотозванных токенов БД не трогается.
+"""
+import datetime
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .models import RevokedToken
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(capacity, 1)
+        self.size = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationList:
+    """Отозванные jti: общий кэш и фильтр в памяти воркера (см. описание модуля)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.filter = None
+        self.capacity = 0
+        self.count = 0
+        # Начало предыдущего запроса к БД и jti, загруженные в окне перекрытия
+        self.loaded_since = None
+        self.recent_jtis = {}
+        self.synced_at = 0.0
+        self.rebuilt_at = 0.0
+
+    @property
+    def sync_interval(self):
+        return getattr(settings, "TOKEN_REVOCATION_SYNC_INTERVAL", 5)
+
+    @property
+    def rebuild_interval(self):
+        return getattr(settings, "TOKEN_REVOCATION_REBUILD_INTERVAL", 3600)
+
+    @property
+    def sync_overlap(self):
+        return datetime.timedelta(seconds=getattr(settings, "TOKEN_REVOCATION_SYNC_OVERLAP", 60))
+
+    def _recent(self):
+        return caches[getattr(settings, "TOKEN_REVOCATION_CACHE_ALIAS", "token_revocations")]
+
+    def sync(self):
+        now = time.monotonic()
+        if self.filter is not None and now - self.synced_at < self.sync_interval:
+            return
+        with self.lock:
+            if self.filter is not None and now - self.synced_at < self.sync_interval:
+                return
+            if self.filter is None or self.count >= self.capacity or now - self.rebuilt_at >= self.rebuild_interval:
+                self._rebuild(now)
+            else:
+                started = timezone.now()
+                self._load(RevokedToken.objects.filter(revoked_at__gte=self.loaded_since - self.sync_overlap), started)
+            self.synced_at = now
+
+    def _rebuild(self, now):
+        """Полная пересборка: отбрасывает истёкшие jti и увеличивает фильтр при росте."""
+        started = timezone.now()
+        queryset = RevokedToken.objects.filter(expires_at__gt=started)
+        self.capacity = max(getattr(settings, "TOKEN_REVOCATION_CAPACITY", 100_000), queryset.count() * 2)
+        self.filter = BloomFilter(self.capacity)
+        self.count = 0
+        self.recent_jtis = {}
+        self._load(queryset, started)
+        self.rebuilt_at = now
+
+    def _load(self, queryset, started):
+        # Следующая синхронизация перечитает строки с revoked_at >= window_start
+        window_start = started - self.sync_overlap
+        for jti, revoked_at in queryset.values_list("jti", "revoked_at").iterator(chunk_size=5000):
+            if revoked_at >= window_start:
+                if jti in self.recent_jtis:
+                    continue
+                self.recent_jtis[jti] = revoked_at
+            self.filter.add(jti)
+            self.count += 1
+        self.recent_jtis = {jti: revoked_at for jti, revoked_at in self.recent_jtis.items() if revoked_at >= window_start}
+        self.loaded_since = started
+
+    def is_revoked(self, jti):
+        if self._recent().get(f"revoked:{jti}"):
+            return True
+        self.sync()
+        if jti not in self.filter:
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def revoke(self, jti, expires_at):
+        RevokedToken.objects.bulk_create([RevokedToken(jti=jti, expires_at=expires_at)], ignore_conflicts=True)
+        # Запись живёт, пока жив сам токен: другие воркеры видят отзыв сразу, а не после синхронизации
+        timeout = max(1, math.ceil((expires_at - timezone.now()).total_seconds()))
+        self._recent().set(f"revoked:{jti}", True, timeout)
+        with self.lock:
+            if self.filter is not None and jti not in self.recent_jtis:
+                self.filter.add(jti)
+                self.count += 1
+                self.recent_jtis[jti] = timezone.now()
+
+
+revocation_list = RevocationList()
+
+
+class RevocableRefreshToken(RefreshToken):
+    """Refresh-токен, отзыв которого проверяется через revocation_list вместо таблиц token_blacklist."""
+
+    def verify(self, *args, **kwargs):
+        super().verify(*args, **kwargs)
+        if revocation_list.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        revocation_list.revoke(self.payload[api_settings.JTI_CLAIM], datetime_from_epoch(self.payload["exp"]))
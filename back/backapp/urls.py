@@ -5,7 +5,8 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 from .views import RegisterStep1View, RegisterStep2View, PasswordResetView, ChangePasswordView, SkillViewSet, PersonalQualityViewSet, \
     CustomSkillViewSet, CustomPersonalQualityViewSet, UserProfileUpdateView, UserViewSet, TeamMemberViewSet, \
-    ProjectCategoryViewSet, TeamViewSet, FacultyViewSet, SchoolViewSet, TaskViewSet, AdminPanelView
+    ProjectCategoryViewSet, TeamViewSet, FacultyViewSet, SchoolViewSet, TaskViewSet, AdminPanelView, \
+    AdminTeamListView, AdminUserListView, AdminExportView, AdminAnalyticsView, AdminDbPoolView
 
 router = DefaultRouter()
 
@@ -30,6 +31,11 @@ urlpatterns = [
     path("change-password/", ChangePasswordView.as_view(), name="change_password"),
     path('profile/', UserProfileUpdateView.as_view(), name="user-profile"),
     path('admin-panel/', AdminPanelView.as_view(), name="admin-panel"),
+    path('admin-panel/teams/', AdminTeamListView.as_view(), name="admin-panel-teams"),
+    path('admin-panel/users/', AdminUserListView.as_view(), name="admin-panel-users"),
+    path('admin-panel/export/<str:dataset>/', AdminExportView.as_view(), name="admin-panel-export"),
+    path('admin-panel/analytics/<str:name>/', AdminAnalyticsView.as_view(), name="admin-panel-analytics"),
+    path('admin-panel/db-pool/', AdminDbPoolView.as_view(), name="admin-panel-db-pool"),
 ] + router.urls
 
 
@@ -1,14 +1,27 @@
+import datetime
+import hashlib
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Q
-from django.http import JsonResponse
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connection, connections
+from django.db.models import Q, Max, Count
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
-from rest_framework import status, viewsets, permissions, generics
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.functional import cached_property
+from django.utils.http import http_date, quote_etag
+from django.utils import timezone
+from rest_framework import status, viewsets, permissions, generics, filters
 from rest_framework.decorators import action
 from rest_framework.generics import CreateAPIView
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import PageNumberPagination, CursorPagination
+from rest_framework.utils.urls import replace_query_param
 
 from .models import Skill, PersonalQuality, CustomSkill, CustomPersonalQuality, School, Faculty, Team, TeamMember, \
     ProjectCategory, Notification, Task
@@ -16,7 +29,22 @@ from .serializers import RegisterStep1Serializer, RegisterStep2Serializer, Passw
     PersonalQualitySerializer, CustomSkillSerializer, CustomPersonalQualitySerializer, UserProfileSerializer, \
     UserListSerializer, SchoolSerializer, FacultySerializer, TeamSerializer, TeamMemberSerializer, \
     ProjectCategorySerializer, TeamJoinRequestSerializer, NotificationSerializer, TeamUpdateSerializer, \
-    TeamMemberUpdateSerializer, TaskSerializer, TaskCreateSerializer, TaskUpdateSerializer
+    TeamMemberUpdateSerializer, TaskSerializer, TaskCreateSerializer, TaskUpdateSerializer, TaskBulkChangesSerializer, \
+    AdminTeamSerializer, AdminUserSerializer
+from .fast_serializers import FastUserListSerializer, FastTeamSerializer, FastNotificationSerializer
+from .db_pool import pool_stats
+from .db_routing import read_from_replica
+from .exports import DATASETS, FORMATS, stream_export
+from .deletion import mark_teams_deleted, mark_users_deleted
+from .retention import recent_notifications
+from .notifications import notify
+from .task_operations import update_tasks, delete_tasks
+from .concurrency import save_with_version
+from .team_stats import team_stats
+from .analytics import REPORTS, SKILL_ORDERINGS, report
+from .memberships import (
+    RESOLUTION_NOTIFICATIONS, request_membership, invite_users, resolve_requests, answer_invitation, cancel_request,
+)
 
 User = get_user_model()
 
@@ -33,6 +61,136 @@ class UserResultsSetPagination(PageNumberPagination):
     max_page_size = 100
 
 
+class TaskCursorPagination(CursorPagination):
+    """Страницы задач (колонка доски, my_tasks); курсор по (-created_at, -id) без OFFSET."""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+
+
+def estimated_count(queryset, limit=10000):
+    """
+    Число строк queryset и признак точности: (count, exact).
+
+    Для запроса без фильтров на PostgreSQL берётся оценка из статистики (pg_class.reltuples),
+    если она не меньше limit. Иначе считается COUNT по подзапросу с LIMIT limit + 1,
+    поэтому стоимость подсчёта ограничена даже для «широких» фильтров.
+    """
+    connection = connections[queryset.db]
+    # «Без фильтров» — не считая условий менеджера по умолчанию (скрытие удалённых записей)
+    unfiltered = queryset.query.where == queryset.model._default_manager.all().query.where
+    if connection.vendor == 'postgresql' and unfiltered:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row and row[0] >= limit:
+            return row[0], False
+    count = queryset.order_by()[:limit + 1].count()
+    return min(count, limit), count <= limit
+
+
+class EstimatedCountPaginator(Paginator):
+    count_limit = 10000
+
+    @cached_property
+    def count(self):
+        count, self.count_is_exact = estimated_count(self.object_list, self.count_limit)
+        return count
+
+
+class AdminResultsSetPagination(PageNumberPagination):
+    """
+    Страницы админ-панели: один запрос на подсчёт и один на страницу.
+    Если count_is_exact == false, count — оценка (или нижняя граница), и страницы
+    дальше неё недоступны: сузьте выборку фильтрами или смените сортировку.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        response.data['count_is_exact'] = self.page.paginator.count_is_exact
+        return response
+
+
+class FastListMixin:
+    """list() через быстрый сериализатор из fast_serializers (ответ идентичен DRF-сериализатору)."""
+    fast_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        fast_serializer = self.fast_serializer_class(request)
+        queryset = fast_serializer.get_queryset(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast_serializer.to_representation(page))
+        return Response(fast_serializer.to_representation(queryset))
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified для GET-ответов.
+
+    Версия ресурса получается одним лёгким запросом (get_resource_version), и если она
+    совпадает с If-None-Match / If-Modified-Since, сразу возвращается 304 — объект
+    не загружается, сериализатор не запускается.
+    """
+
+    def get_resource_version(self, request, *args, **kwargs):
+        """
+        (last_modified, ключ версии) или None, если версию определить нельзя (ответ без
+        валидаторов). Для объектов с оптимистичной блокировкой — (last_modified, ключ,
+        номер правки version).
+        """
+        return None
+
+    @staticmethod
+    def resource_pk(model, pk):
+        """pk из URL, приведённый к типу первичного ключа, или None, если он не подходит: тогда get_object() ответит 404."""
+        try:
+            return model._meta.pk.to_python(pk)
+        except ValidationError:
+            return None
+
+    def conditional_get(self, handler, request, *args, **kwargs):
+        version = self.get_resource_version(request, *args, **kwargs)
+        if version is None or version[0] is None:
+            return handler(request, *args, **kwargs)
+
+        last_modified, key, *edit_version = version
+        # Представление зависит и от ?fields= / страницы, и от формата ответа (JSON / MessagePack)
+        raw_etag = f"{key}|{request.get_full_path()}|{request.accepted_renderer.media_type}"
+        digest = hashlib.md5(raw_etag.encode()).hexdigest()
+        # Номер правки в начале ETag: тот же ETag принимается в If-Match при записи (concurrency.py)
+        etag = quote_etag(f"{edit_version[0]}.{digest}" if edit_version else digest)
+        last_modified = int(last_modified.timestamp())
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        # Браузер хранит ответ, но каждый раз перепроверяет его по ETag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class ReplicaReadsMixin:
+    """Безопасные запросы читают с реплики, если клиент недавно ничего не записывал (db_routing.py)."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        read_from_replica(request)
+
+
 class AdminOnlyPermission(permissions.BasePermission):
     def has_permission(self, request, view):
         return request.user and request.user.is_staff
@@ -99,7 +257,7 @@ class ChangePasswordView(CreateAPIView):
         return Response({"message": "Пароль успешно изменен"}, status=status.HTTP_200_OK)
 
 
-class SkillViewSet(viewsets.ModelViewSet):
+class SkillViewSet(ReplicaReadsMixin, viewsets.ModelViewSet):
     serializer_class = SkillSerializer
     permission_classes = [IsAdminOrReadOnly]
 
@@ -111,7 +269,7 @@ class SkillViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class PersonalQualityViewSet(viewsets.ModelViewSet):
+class PersonalQualityViewSet(ReplicaReadsMixin, viewsets.ModelViewSet):
     serializer_class = PersonalQualitySerializer
     permission_classes = [IsAdminOrReadOnly]
 
@@ -159,26 +317,29 @@ class CustomPersonalQualityViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class SchoolViewSet(viewsets.ModelViewSet):
+class SchoolViewSet(ReplicaReadsMixin, viewsets.ModelViewSet):
     queryset = School.objects.all()
     serializer_class = SchoolSerializer
     permission_classes = [AllowAny]  # Разрешаем чтение для всех
 
+    def get_queryset(self):
+        return SchoolSerializer.optimize_queryset(School.objects.all(), self.request)
+
 
-class FacultyViewSet(viewsets.ModelViewSet):
+class FacultyViewSet(ReplicaReadsMixin, viewsets.ModelViewSet):
     queryset = Faculty.objects.all()
     serializer_class = FacultySerializer
     permission_classes = [AllowAny]  # Разрешаем чтение для всех
     
     def get_queryset(self):
-        queryset = Faculty.objects.select_related('school').all()
+        queryset = Faculty.objects.all()
         school_id = self.request.query_params.get('school')
         if school_id:
             queryset = queryset.filter(school_id=school_id)
-        return queryset
+        return FacultySerializer.optimize_queryset(queryset, self.request)
 
 
-class UserProfileUpdateView(generics.RetrieveUpdateAPIView):
+class UserProfileUpdateView(ConditionalGetMixin, generics.RetrieveUpdateAPIView):
     parser_classes = [MultiPartParser, FormParser]
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = UserProfileSerializer
@@ -186,6 +347,16 @@ class UserProfileUpdateView(generics.RetrieveUpdateAPIView):
     def get_object(self):
         return self.request.user
 
+    def get_resource_version(self, request, *args, **kwargs):
+        # Из БД, а не из request.user: пользователь аутентификации взят из кэша и может отставать
+        updated_at = User.objects.filter(pk=request.user.pk).values_list('updated_at', flat=True).first()
+        if updated_at is None:
+            return None
+        return updated_at, f"user:{request.user.pk}:{updated_at.isoformat()}"
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_get(super().retrieve, request, *args, **kwargs)
+
     def update(self, request, *args, **kwargs):
         # Используем print для немедленного вывода (gunicorn перенаправляет stdout в логи)
         print("=" * 80)
@@ -226,7 +397,7 @@ class UserProfileUpdateView(generics.RetrieveUpdateAPIView):
             try:
                 print(f"Сохраняем аватар: {avatar_file.name}")
                 instance.avatar = avatar_file
-                instance.save(update_fields=['avatar'])
+                instance.save(update_fields=['avatar', 'updated_at'])
                 print(f"✓✓✓ Аватар сохранен в БД: {instance.avatar}")
                 # Перезагружаем из БД
                 instance.refresh_from_db()
@@ -283,8 +454,9 @@ class UserProfileUpdateView(generics.RetrieveUpdateAPIView):
         return Response(serializer.data)
 
 
-class UserViewSet(viewsets.ReadOnlyModelViewSet):
+class UserViewSet(ReplicaReadsMixin, FastListMixin, ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     queryset = User.objects.all()
+    fast_serializer_class = FastUserListSerializer
     permission_classes = [AllowAny]
     pagination_class = UserResultsSetPagination
 
@@ -298,10 +470,18 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
         context['request'] = self.request
         return context
 
+    def get_resource_version(self, request, pk=None, **kwargs):
+        pk = self.resource_pk(User, pk)
+        if pk is None:
+            return None
+        updated_at = User.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+        return updated_at, f"user:{pk}:{updated_at.isoformat() if updated_at else ''}"
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_get(super().retrieve, request, *args, **kwargs)
+
     def get_queryset(self):
-        queryset = User.objects.select_related('faculty', 'faculty__school').prefetch_related(
-            'skills', 'custom_skills', 'personal_qualities', 'custom_personal_qualities'
-        )
+        queryset = User.objects.all()
         params = self.request.query_params
 
         username = params.get('username')
@@ -342,7 +522,44 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
                     Q(custom_personal_qualities__name__iexact=quality_name)
                 )
 
-        return queryset.distinct()
+        # Связи и колонки подгружаются только для полей из ?fields= / ?expand=
+        return self.get_serializer_class().optimize_queryset(queryset.distinct(), self.request)
+
+    @action(detail=False, methods=["get"], permission_classes=[permissions.IsAuthenticated])
+    def my_tasks(self, request):
+        """
+        Задачи пользователя во всех командах: назначенные ему и созданные им (role=assigned|created —
+        только одна из групп). Фильтры: status и priority через запятую, due_after, due_before;
+        страницы по курсору, как у колонок доски.
+        """
+        user = request.user
+        roles = {
+            "assigned": Q(assigned_to=user),
+            "created": Q(creator=user),
+            None: Q(assigned_to=user) | Q(creator=user),
+        }
+        role = request.query_params.get("role")
+        if role not in roles:
+            return Response({"detail": "role: assigned или created."}, status=400)
+
+        # Задачи удалённых команд скрывает менеджер Task.objects
+        queryset = Task.objects.filter(roles[role])
+        queryset, error = filter_tasks(queryset, request)
+        if error:
+            return Response({"detail": error}, status=400)
+
+        status_filter = request.query_params.get("status")
+        if status_filter:
+            statuses = [s.strip().upper() for s in status_filter.split(",") if s.strip()]
+            known = {code for code, _ in Task.STATUS_CHOICES}
+            if not set(statuses) <= known:
+                return Response({"detail": f"status: допустимые значения {', '.join(sorted(known))}."}, status=400)
+            queryset = queryset.filter(status__in=statuses)
+
+        paginator = TaskCursorPagination()
+        page = paginator.paginate_queryset(TaskSerializer.optimize_queryset(queryset, request), request, view=self)
+        serializer = TaskSerializer(page, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
 
     @action(detail=False, methods=["get"])
     def my_requests(self, request):
@@ -358,80 +575,27 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=False, methods=["post"])
     def accept_invitation(self, request):
-        member_id = request.data.get("member_id")
-        try:
-            membership = request.user.memberships.get(id=member_id, status="INVITED")
-        except TeamMember.DoesNotExist:
+        if answer_invitation(request.user, request.data.get("member_id"), "APPROVED") is None:
             return Response({"detail": "Приглашение не найдено."}, status=404)
-
-        membership.status = "APPROVED"
-        membership.save()
-
-        Notification.objects.filter(
-            user=request.user,
-            notification_type="TEAM_INVITATION",
-            team=membership.team
-        ).delete()
-
-        try:
-            Notification.objects.create(
-                user=membership.team.creator,
-                notification_type="TEAM_INVITATION_ACCEPTED",
-                team=membership.team,
-                team_member=membership,
-                message=f"Пользователь {request.user.username} принял приглашение в команду '{membership.team.title}'"
-            )
-        except Exception as e:
-            print(f"Ошибка создания уведомления: {e}")
-
         return Response({"detail": "Вы присоединились к команде."})
 
     @action(detail=False, methods=["post"])
     def reject_invitation(self, request):
-        member_id = request.data.get("member_id")
-        try:
-            membership = request.user.memberships.get(id=member_id, status="INVITED")
-        except TeamMember.DoesNotExist:
+        if answer_invitation(request.user, request.data.get("member_id"), "REJECTED") is None:
             return Response({"detail": "Приглашение не найдено."}, status=404)
-
-        membership.status = "REJECTED"
-        membership.save()
-        
-        Notification.objects.filter(
-            user=request.user,
-            notification_type="TEAM_INVITATION",
-            team=membership.team
-        ).delete()
-        
-        try:
-            Notification.objects.create(
-                user=membership.team.creator,
-                notification_type="TEAM_INVITATION_REJECTED",
-                team=membership.team,
-                team_member=membership,
-                message=f"Пользователь {request.user.username} отклонил приглашение в команду '{membership.team.title}'"
-            )
-        except Exception as e:
-            print(f"Ошибка создания уведомления: {e}")
-
         return Response({"detail": "Вы отклонили приглашение."})
 
     @action(detail=False, methods=["post"])
     def cancel_request(self, request):
-        member_id = request.data.get("member_id")
-        try:
-            membership = request.user.memberships.get(id=member_id, status="PENDING")
-        except TeamMember.DoesNotExist:
+        if not cancel_request(request.user, request.data.get("member_id")):
             return Response({"detail": "Заявка не найдена."}, status=404)
-
-        membership.delete()
         return Response({"detail": "Заявка отменена."})
 
     @action(detail=False, methods=["get"])
     def notifications(self, request):
-        notifications = request.user.notifications.select_related('team', 'team__creator', 'task', 'team_member', 'team_member__user').all()
-        serializer = NotificationSerializer(notifications, many=True)
-        return Response(serializer.data)
+        serializer = FastNotificationSerializer(request)
+        notifications = serializer.get_queryset(recent_notifications(Notification.objects.filter(user=request.user)))
+        return Response(serializer.to_representation(notifications))
 
     @action(detail=False, methods=["post"])
     def mark_notification_read(self, request):
@@ -460,15 +624,35 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
             return Response({"detail": "Уведомление не найдено."}, status=404)
 
 
-class ProjectCategoryViewSet(viewsets.ModelViewSet):
+class ProjectCategoryViewSet(ReplicaReadsMixin, viewsets.ModelViewSet):
     queryset = ProjectCategory.objects.all()
     serializer_class = ProjectCategorySerializer
     permission_classes = [AllowAny]  # Разрешаем чтение для всех
 
 
-class TeamViewSet(viewsets.ModelViewSet):
+INVITE_ERRORS = {
+    "APPROVED": "Пользователь уже в команде.",
+    "PENDING": "Пользователь уже подал заявку на вступление.",
+    "INVITED": "Пользователь уже приглашен в команду.",
+}
+
+
+def parse_id_list(value):
+    """Список id из тела массового запроса. Возвращает (ids, текст ошибки)."""
+    limit = getattr(settings, "BULK_MAX_IDS", 500)
+    if not isinstance(value, list) or not value:
+        return None, "Ожидается непустой список id."
+    if len(value) > limit:
+        return None, f"Не больше {limit} id за запрос."
+    if not all(isinstance(item, int) and not isinstance(item, bool) for item in value):
+        return None, "id должны быть целыми числами."
+    return list(dict.fromkeys(value)), None
+
+
+class TeamViewSet(ReplicaReadsMixin, FastListMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Team.objects.all()
     serializer_class = TeamSerializer
+    fast_serializer_class = FastTeamSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsCreatorOrReadOnly]
     pagination_class = StandardResultsSetPagination
 
@@ -476,10 +660,25 @@ class TeamViewSet(viewsets.ModelViewSet):
         team = serializer.save(creator=self.request.user)
         TeamMember.objects.create(team=team, user=self.request.user, status="APPROVED")
 
+    def perform_update(self, serializer):
+        save_with_version(serializer, self.request)
+
+    def get_resource_version(self, request, pk=None, **kwargs):
+        # updated_at команды сдвигается и при изменении участников и требований (см. signals.py)
+        pk = self.resource_pk(Team, pk)
+        if pk is None:
+            return None
+        row = Team.objects.filter(pk=pk).values_list('updated_at', 'version').first()
+        if row is None:
+            return None
+        updated_at, version = row
+        return updated_at, f"team:{pk}:{version}:{updated_at.isoformat()}", version
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_get(super().retrieve, request, *args, **kwargs)
+
     def get_queryset(self):
-        queryset = Team.objects.select_related('creator', 'category').prefetch_related(
-            'required_skills', 'required_qualities', 'memberships', 'memberships__user'
-        )
+        queryset = Team.objects.all()
         params = self.request.query_params
 
         title = params.get('title')
@@ -496,7 +695,8 @@ class TeamViewSet(viewsets.ModelViewSet):
 
         status = params.get("status")
         if status:
-            queryset = queryset.filter(status__iexact=status)
+            # Статусы хранятся в верхнем регистре; точное сравнение использует индекс по status
+            queryset = queryset.filter(status=status.upper())
 
         required_skills = params.get("required_skills")
         if required_skills:
@@ -518,8 +718,12 @@ class TeamViewSet(viewsets.ModelViewSet):
         if member_name:
             queryset = queryset.filter(memberships__user__username=member_name, memberships__status="APPROVED")
 
-        return queryset.order_by('-created_at').distinct()
-
+        queryset = queryset.order_by('-created_at')
+        # DISTINCT нужен только при соединении с навыками/участниками; без него первая страница
+        # читается по индексу team_active_created_idx, а не сортировкой всех команд
+        if required_skills or required_qualities or member_name:
+            queryset = queryset.distinct()
+        return TeamSerializer.optimize_queryset(queryset, self.request)
 
     @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
     def join(self, request, pk=None):
@@ -528,30 +732,15 @@ class TeamViewSet(viewsets.ModelViewSet):
         if team.creator == request.user:
             return Response({"detail": "Создатель уже в команде."}, status=400)
 
-        membership, created = TeamMember.objects.get_or_create(team=team, user=request.user)
-
-        if not created:
-            if membership.status == "APPROVED":
-                return Response({"detail": "Вы уже в команде."}, status=400)
-            elif membership.status == "PENDING":
-                return Response({"detail": "Заявка уже отправлена."}, status=400)
-            elif membership.status == "INVITED":
-                return Response({"detail": "Вас пригласили, примите приглашение."}, status=400)
-            elif membership.status == "REJECTED":
-                pass
+        membership, current_status = request_membership(team, request.user, request.data.get("message", ""))
+        if membership is None:
+            errors = {
+                "APPROVED": "Вы уже в команде.",
+                "PENDING": "Заявка уже отправлена.",
+                "INVITED": "Вас пригласили, примите приглашение.",
+            }
+            return Response({"detail": errors[current_status]}, status=400)
 
-        membership.status = "PENDING"
-        membership.message = request.data.get("message", "")
-        membership.save()
-        
-        Notification.objects.create(
-            user=team.creator,
-            notification_type="TEAM_REQUEST",
-            team=team,
-            team_member=membership,
-            message=f"Пользователь {request.user.username} подал заявку на вступление в команду '{team.title}'"
-        )
-        
         return Response({"detail": "Заявка отправлена."}, status=201)
 
     @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
@@ -569,34 +758,12 @@ class TeamViewSet(viewsets.ModelViewSet):
         if team.creator == user:
             return Response({"detail": "Нельзя пригласить создателя команды."}, status=400)
 
-        membership, created = TeamMember.objects.get_or_create(team=team, user=user)
+        invited, conflicts = invite_users(team, [user.id], request.data.get("message", ""))
+        if conflicts:
+            return Response({"detail": INVITE_ERRORS[conflicts[user.id]]}, status=400)
 
-        if not created:
-            if membership.status == "APPROVED":
-                return Response({"detail": "Пользователь уже в команде."}, status=400)
-            elif membership.status == "PENDING":
-                return Response({"detail": "Пользователь уже подал заявку на вступление."}, status=400)
-            elif membership.status == "INVITED":
-                return Response({"detail": "Пользователь уже приглашен в команду."}, status=400)
-            elif membership.status == "REJECTED":
-                # Можно пригласить снова, если заявка была отклонена
-                pass
-
-        membership.status = "INVITED"
-        membership.message = request.data.get("message", "")
-        membership.save()
-        
-        Notification.objects.create(
-            user=user,
-            notification_type="TEAM_INVITATION",
-            team=team,
-            team_member=membership,
-            message=f"Вас пригласили в команду '{team.title}'"
-        )
-        
         return Response({"detail": f"Приглашение отправлено пользователю {user.username}."})
 
-
     @action(detail=True, methods=["get"], permission_classes=[permissions.IsAuthenticated])
     def requests(self, request, pk=None):
         team = self.get_object()
@@ -634,73 +801,29 @@ class TeamViewSet(viewsets.ModelViewSet):
         
         membership.save()
         
-        Notification.objects.create(
-            user=team.creator,
-            notification_type="TEAM_INVITATION_ACCEPTED",
-            team=team,
-            team_member=membership,
-            message=f"Пользователь {request.user.username} принял приглашение в команду '{team.title}'"
-        )
+        notify(team.creator, "TEAM_INVITATION_ACCEPTED", team=team, team_member=membership)
         
         return Response({"detail": "Вы присоединились к команде.", "team_id": team.id}, status=200)
 
+    @action(detail=True, methods=["get"], permission_classes=[permissions.IsAuthenticated])
+    def stats(self, request, pk=None):
+        """Сводка по команде из счётчиков team_stats: время ответа не зависит от числа задач."""
+        # Без get_object(): сериализатор команды подгружает навыки и всех участников
+        team = generics.get_object_or_404(Team.objects.only("id", "creator_id"), pk=pk)
+        self.check_object_permissions(request, team)
+        if team.creator_id != request.user.id:
+            return Response({"detail": "Доступ запрещён."}, status=status.HTTP_403_FORBIDDEN)
+        return Response(team_stats(team))
+
     @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
     def approve(self, request, pk=None):
         team = self.get_object()
         if team.creator != request.user:
             return Response({"detail": "Доступ запрещён."}, status=status.HTTP_403_FORBIDDEN)
 
-        member_id = request.data.get("member_id")
-        try:
-            member = team.memberships.get(id=member_id, status="PENDING")
-        except TeamMember.DoesNotExist:
+        if not resolve_requests(team, [request.data.get("member_id")], "APPROVED"):
             return Response({"detail": "Заявка не найдена."}, status=status.HTTP_404_NOT_FOUND)
 
-        member.status = "APPROVED"
-        member.save()
-        
-        # Логируем все уведомления перед удалением
-        import logging
-        logger = logging.getLogger(__name__)
-        all_notifications = Notification.objects.filter(
-            user=request.user,
-            notification_type="TEAM_REQUEST",
-            team=team
-        )
-        logger.info(f"=== APPROVE: Всего уведомлений TEAM_REQUEST для команды {team.id}: {all_notifications.count()}")
-        for notif in all_notifications:
-            logger.info(f"  - Уведомление id={notif.id}, team_member_id={notif.team_member_id if notif.team_member else None}, member.id={member.id}")
-        
-        # Удаляем только уведомление для конкретного участника
-        # Используем объект team_member для более точного поиска
-        notifications_to_delete = Notification.objects.filter(
-            user=request.user,
-            notification_type="TEAM_REQUEST",
-            team=team,
-            team_member=member
-        )
-        
-        count_before = notifications_to_delete.count()
-        logger.info(f"=== APPROVE: Найдено уведомлений для удаления (member.id={member.id}): {count_before}")
-        
-        # Проверяем, что мы удаляем правильное уведомление
-        for notif in notifications_to_delete:
-            logger.info(f"  - Удаляем уведомление id={notif.id}, team_member_id={notif.team_member_id}")
-        
-        if count_before > 0:
-            deleted_count = notifications_to_delete.delete()[0]
-            logger.info(f"=== APPROVE: Удалено {deleted_count} уведомлений")
-        else:
-            logger.warning(f"=== APPROVE: Уведомление для member.id={member.id} не найдено!")
-        
-        Notification.objects.create(
-            user=member.user,
-            notification_type="TEAM_REQUEST_APPROVED",
-            team=team,
-            team_member=member,
-            message=f"Ваша заявка на вступление в команду '{team.title}' была одобрена"
-        )
-        
         return Response({"detail": "Участник принят."})
 
     @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
@@ -709,57 +832,9 @@ class TeamViewSet(viewsets.ModelViewSet):
         if team.creator != request.user:
             return Response({"detail": "Доступ запрещён."}, status=status.HTTP_403_FORBIDDEN)
 
-        member_id = request.data.get("member_id")
-        try:
-            member = team.memberships.get(id=member_id, status="PENDING")
-        except TeamMember.DoesNotExist:
+        if not resolve_requests(team, [request.data.get("member_id")], "REJECTED"):
             return Response({"detail": "Заявка не найдена."}, status=status.HTTP_404_NOT_FOUND)
 
-        member.status = "REJECTED"
-        member.save()
-        
-        # Логируем все уведомления перед удалением
-        import logging
-        logger = logging.getLogger(__name__)
-        all_notifications = Notification.objects.filter(
-            user=request.user,
-            notification_type="TEAM_REQUEST",
-            team=team
-        )
-        logger.info(f"=== REJECT: Всего уведомлений TEAM_REQUEST для команды {team.id}: {all_notifications.count()}")
-        for notif in all_notifications:
-            logger.info(f"  - Уведомление id={notif.id}, team_member_id={notif.team_member_id if notif.team_member else None}, member.id={member.id}")
-        
-        # Удаляем только уведомление для конкретного участника
-        # Используем объект team_member для более точного поиска
-        notifications_to_delete = Notification.objects.filter(
-            user=request.user,
-            notification_type="TEAM_REQUEST",
-            team=team,
-            team_member=member
-        )
-        
-        count_before = notifications_to_delete.count()
-        logger.info(f"=== REJECT: Найдено уведомлений для удаления (member.id={member.id}): {count_before}")
-        
-        # Проверяем, что мы удаляем правильное уведомление
-        for notif in notifications_to_delete:
-            logger.info(f"  - Удаляем уведомление id={notif.id}, team_member_id={notif.team_member_id}")
-        
-        if count_before > 0:
-            deleted_count = notifications_to_delete.delete()[0]
-            logger.info(f"=== REJECT: Удалено {deleted_count} уведомлений")
-        else:
-            logger.warning(f"=== REJECT: Уведомление для member.id={member.id} не найдено!")
-        
-        Notification.objects.create(
-            user=member.user,
-            notification_type="TEAM_REQUEST_REJECTED",
-            team=team,
-            team_member=member,
-            message=f"Ваша заявка на вступление в команду '{team.title}' была отклонена"
-        )
-        
         return Response({"detail": "Заявка отклонена."})
 
     @action(detail=True, methods=["delete"], url_path="remove-member/(?P<user_id>[^/.]+)")
@@ -783,7 +858,7 @@ class TeamViewSet(viewsets.ModelViewSet):
 
         serializer = TeamUpdateSerializer(team, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            save_with_version(serializer, request)
             return Response(serializer.data)
         return Response(serializer.errors, status=400)
 
@@ -805,52 +880,64 @@ class TeamViewSet(viewsets.ModelViewSet):
         except TeamMember.DoesNotExist:
             return Response({"detail": "Участник не найден."}, status=404)
 
-        old_status = member.status
         serializer = TeamMemberUpdateSerializer(member, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
-            new_status = member.status
-            
-            # Если статус изменился на APPROVED или REJECTED, удаляем уведомление о заявке
-            if old_status == "PENDING" and new_status in ["APPROVED", "REJECTED"]:
-                # Удаляем уведомление для создателя команды о заявке этого участника
-                # Используем team_member_id для точного поиска по ID
-                try:
-                    notification = Notification.objects.get(
-                        user=request.user,
-                        notification_type="TEAM_REQUEST",
-                        team=team,
-                        team_member_id=member.id
-                    )
-                    notification.delete()
-                except Notification.DoesNotExist:
-                    pass
-                except Notification.MultipleObjectsReturned:
-                    Notification.objects.filter(
-                        user=request.user,
-                        notification_type="TEAM_REQUEST",
-                        team=team,
-                        team_member_id=member.id
-                    ).delete()
-                
-                # Создаем уведомление для пользователя о результате заявки
-                notification_type = "TEAM_REQUEST_APPROVED" if new_status == "APPROVED" else "TEAM_REQUEST_REJECTED"
-                message = (
-                    f"Ваша заявка на вступление в команду '{team.title}' была одобрена"
-                    if new_status == "APPROVED"
-                    else f"Ваша заявка на вступление в команду '{team.title}' была отклонена"
-                )
-                Notification.objects.create(
-                    user=member.user,
-                    notification_type=notification_type,
-                    team=team,
-                    team_member=member,
-                    message=message
-                )
-            
+            new_status = serializer.validated_data.get("status", member.status)
+            if member.status == "PENDING" and new_status in RESOLUTION_NOTIFICATIONS:
+                # Рассмотрение заявки — тот же переход, что и approve/reject, с уведомлениями
+                resolve_requests(team, [member.id], new_status)
+                member.refresh_from_db()
+            else:
+                serializer.save()
             return Response(serializer.data)
         return Response(serializer.errors, status=400)
 
+    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    def bulk_approve(self, request, pk=None):
+        return self._bulk_resolve(request, "APPROVED")
+
+    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    def bulk_reject(self, request, pk=None):
+        return self._bulk_resolve(request, "REJECTED")
+
+    def _bulk_resolve(self, request, new_status):
+        team = self.get_object()
+        if team.creator != request.user:
+            return Response({"detail": "Доступ запрещён."}, status=status.HTTP_403_FORBIDDEN)
+
+        member_ids, error = parse_id_list(request.data.get("member_ids"))
+        if error:
+            return Response({"detail": error}, status=400)
+
+        resolved = {member.id for member in resolve_requests(team, member_ids, new_status)}
+        return Response({
+            "resolved": sorted(resolved),
+            "not_found": [member_id for member_id in member_ids if member_id not in resolved],
+        })
+
+    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    def bulk_invite(self, request, pk=None):
+        team = self.get_object()
+        if team.creator != request.user:
+            return Response({"detail": "Только создатель может приглашать."}, status=403)
+
+        user_ids, error = parse_id_list(request.data.get("user_ids"))
+        if error:
+            return Response({"detail": error}, status=400)
+
+        existing = set(User.objects.filter(id__in=user_ids).exclude(id=team.creator_id).values_list("id", flat=True))
+        invited, conflicts = invite_users(team, [user_id for user_id in user_ids if user_id in existing], request.data.get("message", ""))
+        skipped = {user_id: INVITE_ERRORS[current] for user_id, current in conflicts.items()}
+        for user_id in user_ids:
+            if user_id == team.creator_id:
+                skipped[user_id] = "Нельзя пригласить создателя команды."
+            elif user_id not in existing:
+                skipped[user_id] = "Пользователь не найден."
+        return Response({
+            "invited": sorted(membership.user_id for membership in invited),
+            "skipped": skipped,
+        })
+
 
 class TeamMemberViewSet(viewsets.ModelViewSet):
     queryset = TeamMember.objects.all().select_related("user", "team")
@@ -861,10 +948,76 @@ class TeamMemberViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+def filter_tasks(queryset, request):
+    """Общие фильтры списков задач (доска, my_tasks). Возвращает (queryset, текст ошибки)."""
+    params = request.query_params
+
+    assigned_to = params.get("assigned_to")
+    if assigned_to == "me":
+        queryset = queryset.filter(assigned_to=request.user)
+    elif assigned_to == "none":
+        queryset = queryset.filter(assigned_to__isnull=True)
+    elif assigned_to:
+        if not assigned_to.isdigit():
+            return None, "assigned_to: id пользователя, me или none."
+        queryset = queryset.filter(assigned_to_id=int(assigned_to))
+
+    priority = params.get("priority")
+    if priority:
+        priorities = [p.strip().upper() for p in priority.split(",") if p.strip()]
+        known = {code for code, _ in Task.PRIORITY_CHOICES}
+        if not set(priorities) <= known:
+            return None, f"priority: допустимые значения {', '.join(sorted(known))}."
+        queryset = queryset.filter(priority__in=priorities)
+
+    for name, lookup in (("due_after", "due_date__gte"), ("due_before", "due_date__lte")):
+        value = params.get(name)
+        if not value:
+            continue
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            if day is None:
+                return None, f"{name}: ожидается дата или дата и время в формате ISO 8601."
+            # Дата без времени — весь день включительно
+            moment = datetime.datetime.combine(day, datetime.time.max if name == "due_before" else datetime.time.min)
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        queryset = queryset.filter(**{lookup: moment})
+    return queryset, None
+
+
+class TaskViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_resource_version(self, request, *args, **kwargs):
+        if 'pk' in kwargs:
+            pk = self.resource_pk(Task, kwargs['pk'])
+            if pk is None:
+                return None
+            row = self.get_queryset().filter(pk=pk).values_list('updated_at', 'version').first()
+            if row is None:
+                return None
+            updated_at, version = row
+            return updated_at, f"task:{pk}:{version}:{updated_at.isoformat()}", version
+
+        # Количество ловит удаление задач, max(updated_at) — изменения, updated_at команды — её переименование
+        version = self.get_queryset().order_by().aggregate(
+            tasks_updated_at=Max('updated_at'), tasks_count=Count('id'), team_updated_at=Max('team__updated_at')
+        )
+        if not version['tasks_count']:
+            return None
+        key = f"tasks:{self.kwargs.get('team_pk')}:{request.user.pk}:{version['tasks_count']}:" \
+              f"{version['tasks_updated_at'].isoformat()}:{version['team_updated_at'].isoformat()}"
+        return max(version['tasks_updated_at'], version['team_updated_at']), key
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_get(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_get(super().retrieve, request, *args, **kwargs)
+
     def get_queryset(self):
         team_id = self.kwargs.get('team_pk')
         if team_id:
@@ -873,14 +1026,85 @@ class TaskViewSet(viewsets.ModelViewSet):
                 # Проверяем права доступа
                 if team.creator == self.request.user:
                     # Создатель видит все задачи команды
-                    return Task.objects.filter(team=team).select_related('creator', 'assigned_to', 'team')
+                    queryset = Task.objects.filter(team=team)
                 else:
                     # Участник видит только свои задачи
-                    return Task.objects.filter(team=team, assigned_to=self.request.user).select_related('creator', 'assigned_to', 'team')
+                    queryset = Task.objects.filter(team=team, assigned_to=self.request.user)
+                return TaskSerializer.optimize_queryset(queryset, self.request)
             except Team.DoesNotExist:
                 return Task.objects.none()
         return Task.objects.none()
 
+    @action(detail=False, methods=["get"])
+    def board(self, request, team_pk=None):
+        """
+        Доска задач: колонки по статусам со счётчиками (один агрегирующий запрос) и первой
+        страницей задач каждой колонки (курсор, индекс task_team_status_created_idx).
+        Следующая страница колонки — по ссылке next (?status=...&cursor=...).
+        Фильтры: assigned_to (id, me, none), priority (через запятую), due_after, due_before.
+        """
+        queryset, error = filter_tasks(self.get_queryset(), request)
+        if error:
+            return Response({"detail": error}, status=400)
+
+        columns = Task.STATUS_CHOICES
+        requested = request.query_params.get("status", "").strip().upper()
+        if requested:
+            # Без учёта регистра, как status и priority в my_tasks
+            columns = [column for column in Task.STATUS_CHOICES if column[0] == requested]
+            if not columns:
+                return Response({"detail": "Неизвестный статус."}, status=400)
+        elif request.query_params.get("cursor"):
+            return Response({"detail": "Курсор задаётся вместе со статусом колонки."}, status=400)
+
+        counts = dict(queryset.order_by().values_list("status").annotate(total=Count("id")))
+        result = []
+        for code, title in columns:
+            paginator = TaskCursorPagination()
+            page = paginator.paginate_queryset(queryset.filter(status=code), request, view=self)
+            next_link = paginator.get_next_link()
+            result.append({
+                "status": code,
+                "title": title,
+                "count": counts.get(code, 0),
+                "next": replace_query_param(next_link, "status", code) if next_link else None,
+                "results": self.get_serializer(page, many=True).data,
+            })
+        return Response({"columns": result})
+
+    @action(detail=False, methods=["post"])
+    def bulk_update(self, request, team_pk=None):
+        """{"task_ids": [...], "status": ..., "priority": ..., "assigned_to": ...} — одно изменение для всех задач."""
+        task_ids, error = parse_id_list(request.data.get("task_ids"))
+        if error:
+            return Response({"detail": error}, status=400)
+        changes = TaskBulkChangesSerializer(
+            data={k: v for k, v in request.data.items() if k != "task_ids"}, context={"team_id": team_pk},
+        )
+        if not changes.is_valid():
+            return Response(changes.errors, status=400)
+
+        updated, missing, forbidden = update_tasks(request.user, team_pk, task_ids, changes.validated_data)
+        return self.bulk_response("updated", updated, missing, forbidden)
+
+    @action(detail=False, methods=["post"])
+    def bulk_delete(self, request, team_pk=None):
+        """{"task_ids": [...]} — удалить задачи (только созданные вызывающим)."""
+        task_ids, error = parse_id_list(request.data.get("task_ids"))
+        if error:
+            return Response({"detail": error}, status=400)
+
+        deleted, missing, forbidden = delete_tasks(request.user, team_pk, task_ids)
+        return self.bulk_response("deleted", deleted, missing, forbidden)
+
+    @staticmethod
+    def bulk_response(key, done, missing, forbidden):
+        if missing:
+            return Response({"detail": "Задачи не найдены.", "not_found": missing}, status=404)
+        if forbidden:
+            return Response({"detail": "Нет прав на изменение этих задач.", "forbidden": forbidden}, status=403)
+        return Response({key: done})
+
     def get_serializer_class(self):
         if self.action == 'create':
             return TaskCreateSerializer
@@ -903,44 +1127,27 @@ class TaskViewSet(viewsets.ModelViewSet):
         
         # Создаем уведомление для назначенного пользователя
         if task.assigned_to:
-            Notification.objects.create(
-                user=task.assigned_to,
-                notification_type="TASK_ASSIGNED",
-                team=team,
-                task=task,
-                message=f"Вам назначена новая задача: {task.title}"
-            )
+            notify(task.assigned_to, "TASK_ASSIGNED", team=team, task=task, new=True)
 
     def perform_update(self, serializer):
-        task = self.get_object()
+        # Задача уже загружена в update(); запись — условный UPDATE по версии (concurrency.py)
+        task = serializer.instance
         
         # Проверяем права на обновление
-        if task.creator == self.request.user:
+        if task.creator_id == self.request.user.id:
             # Создатель может изменять все поля
-            old_assigned_to = task.assigned_to
-            serializer.save()
+            old_assigned_to_id = task.assigned_to_id
+            save_with_version(serializer, self.request)
             
             # Если изменился исполнитель, создаем уведомление
-            if old_assigned_to != task.assigned_to and task.assigned_to:
-                Notification.objects.create(
-                    user=task.assigned_to,
-                    notification_type="TASK_ASSIGNED",
-                    team=task.team,
-                    task=task,
-                    message=f"Вам назначена задача: {task.title}"
-                )
-        elif task.assigned_to == self.request.user:
+            if old_assigned_to_id != task.assigned_to_id and task.assigned_to:
+                notify(task.assigned_to, "TASK_ASSIGNED", team=task.team, task=task)
+        elif task.assigned_to_id == self.request.user.id:
             # Участник может изменять только статус
             if 'status' in serializer.validated_data:
-                serializer.save()
+                save_with_version(serializer, self.request)
                 # Уведомляем создателя об изменении статуса
-                Notification.objects.create(
-                    user=task.creator,
-                    notification_type="TASK_UPDATED",
-                    team=task.team,
-                    task=task,
-                    message=f"Статус задачи '{task.title}' изменен на '{task.get_status_display()}'"
-                )
+                notify(task.creator, "TASK_UPDATED", team=task.team, task=task, status=serializer.instance.status)
             else:
                 raise permissions.PermissionDenied("Участник может изменять только статус задачи")
         else:
@@ -957,25 +1164,15 @@ class AdminPanelView(generics.GenericAPIView):
     permission_classes = [AdminOnlyPermission]
     
     def get(self, request):
-        """Получить список всех команд и пользователей для админ-панели"""
-        teams = Team.objects.select_related('creator', 'category').prefetch_related(
-            'required_skills', 'required_qualities', 'memberships'
-        ).order_by('-created_at')
-        
-        users = User.objects.select_related('faculty', 'faculty__school').prefetch_related(
-            'skills', 'personal_qualities'
-        ).order_by('-date_joined')
-        
-        teams_serializer = TeamSerializer(teams, many=True, context={'request': request})
-        users_serializer = UserListSerializer(users, many=True, context={'request': request})
-        
+        """Сводка для админ-панели; сами списки — в admin-panel/teams/ и admin-panel/users/"""
+        teams_count, teams_exact = estimated_count(Team.objects.all())
+        users_count, users_exact = estimated_count(User.objects.all())
         return Response({
-            'teams': teams_serializer.data,
-            'users': users_serializer.data,
-            'teams_count': teams.count(),
-            'users_count': users.count()
+            'teams_count': teams_count,
+            'users_count': users_count,
+            'counts_are_exact': teams_exact and users_exact,
         })
-    
+
     def delete(self, request):
         """Удалить команду или пользователя"""
         item_type = request.data.get('type')  # 'team' или 'user'
@@ -987,27 +1184,25 @@ class AdminPanelView(generics.GenericAPIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Запись сразу скрывается, а зависимые строки удаляются в фоне пачками (см. deletion.py)
         if item_type == 'team':
-            try:
-                team = Team.objects.get(id=item_id)
-                team.delete()
-                return Response({'message': f'Команда "{team.title}" успешно удалена'})
-            except Team.DoesNotExist:
+            team = Team.objects.filter(id=item_id).only('title').first()
+            if team is None:
                 return Response(
                     {'error': 'Команда не найдена'},
                     status=status.HTTP_404_NOT_FOUND
                 )
+            mark_teams_deleted([team.id])
+            return Response({'message': f'Команда "{team.title}" успешно удалена'}, status=status.HTTP_202_ACCEPTED)
         elif item_type == 'user':
-            try:
-                user = User.objects.get(id=item_id)
-                username = user.username
-                user.delete()
-                return Response({'message': f'Пользователь "{username}" успешно удален'})
-            except User.DoesNotExist:
+            user = User.objects.filter(id=item_id).only('username').first()
+            if user is None:
                 return Response(
                     {'error': 'Пользователь не найден'},
                     status=status.HTTP_404_NOT_FOUND
                 )
+            mark_users_deleted([user.id])
+            return Response({'message': f'Пользователь "{user.username}" успешно удален'}, status=status.HTTP_202_ACCEPTED)
         else:
             return Response(
                 {'error': 'Неверный тип. Используйте "team" или "user"'},
@@ -1015,5 +1210,124 @@ class AdminPanelView(generics.GenericAPIView):
             )
 
 
+class AdminTeamListView(generics.ListAPIView):
+    """Команды для админ-панели: ?search=, ?status=, ?category=, ?ordering=, постранично"""
+    permission_classes = [AdminOnlyPermission]
+    serializer_class = AdminTeamSerializer
+    pagination_class = AdminResultsSetPagination
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    search_fields = ['title', 'creator__username']
+    ordering_fields = ['id', 'title', 'status', 'created_at']
+    ordering = ['-created_at', '-id']
+
+    def get_queryset(self):
+        queryset = Team.objects.select_related('creator', 'category').only(
+            'id', 'title', 'status', 'created_at', 'creator__username', 'category__name'
+        )
+        params = self.request.query_params
+
+        team_status = params.get('status')
+        if team_status:
+            queryset = queryset.filter(status=team_status)
+
+        category_id = params.get('category')
+        if category_id:
+            queryset = queryset.filter(category_id=category_id)
+
+        return queryset
 
 
+class AdminUserListView(generics.ListAPIView):
+    """Пользователи для админ-панели: ?search=, ?faculty=, ?is_staff=, ?ordering=, постранично"""
+    permission_classes = [AdminOnlyPermission]
+    serializer_class = AdminUserSerializer
+    pagination_class = AdminResultsSetPagination
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    search_fields = ['username', 'email', 'first_name', 'last_name']
+    ordering_fields = ['id', 'username', 'email', 'date_joined']
+    ordering = ['-date_joined', '-id']
+
+    def get_queryset(self):
+        queryset = User.objects.select_related('faculty').only(
+            'id', 'username', 'email', 'first_name', 'last_name', 'is_staff', 'date_joined', 'faculty__name'
+        )
+        params = self.request.query_params
+
+        faculty_id = params.get('faculty')
+        if faculty_id:
+            queryset = queryset.filter(faculty_id=faculty_id)
+
+        is_staff = params.get('is_staff')
+        if is_staff in ('true', 'false'):
+            queryset = queryset.filter(is_staff=is_staff == 'true')
+
+        return queryset
+
+
+class AdminExportView(generics.GenericAPIView):
+    """
+    Потоковая выгрузка: admin-panel/export/<users|teams|memberships|tasks>/?output=csv|jsonl&gzip=1
+    (параметр format занят DRF под выбор рендерера, поэтому — output)
+    """
+    permission_classes = [AdminOnlyPermission]
+
+    def get(self, request, dataset):
+        output_format = request.query_params.get('output', 'csv')
+        if dataset not in DATASETS or output_format not in FORMATS:
+            return Response(
+                {'error': f'Доступны наборы {", ".join(DATASETS)} и форматы {", ".join(FORMATS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        compress = request.query_params.get('gzip') in ('1', 'true')
+        filename = f'{dataset}.{output_format}'
+        if compress:
+            filename += '.gz'
+
+        response = StreamingHttpResponse(
+            stream_export(dataset, output_format, compress),
+            content_type='application/gzip' if compress else f'{FORMATS[output_format]}; charset=utf-8',
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class AdminAnalyticsView(generics.GenericAPIView):
+    """
+    Аналитика: admin-panel/analytics/<skills|categories|faculties>/ из сводных таблиц (analytics.py).
+    Для skills: ?ordering=shortage|demand|supply, ?limit= (до 500), ?custom=0 — только навыки справочника
+    """
+    permission_classes = [AdminOnlyPermission]
+
+    def get(self, request, name):
+        if name not in REPORTS:
+            return Response({'error': f'Доступны отчёты {", ".join(REPORTS)}'}, status=status.HTTP_404_NOT_FOUND)
+
+        params = {}
+        if name == 'skills':
+            ordering = request.query_params.get('ordering', 'shortage')
+            limit = request.query_params.get('limit', '50')
+            if ordering not in SKILL_ORDERINGS or not limit.isdigit():
+                return Response(
+                    {'error': f'ordering: {", ".join(SKILL_ORDERINGS)}; limit: целое число'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            params = {
+                'ordering': ordering,
+                'limit': min(int(limit), 500),
+                'custom': request.query_params.get('custom') not in ('0', 'false'),
+            }
+        return Response(report(name, params))
+
+
+class AdminDbPoolView(generics.GenericAPIView):
+    """
+    Соединения с базой: admin-panel/db-pool/ — соединения PostgreSQL по состояниям и,
+    если backend работает через PgBouncer, его пулы и статистика (db_pool.py)
+    """
+    permission_classes = [AdminOnlyPermission]
+
+    def get(self, request):
+        if connection.vendor != 'postgresql':
+            return Response({'error': 'Доступно только на PostgreSQL'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(pool_stats())
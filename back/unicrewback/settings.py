@@ -13,6 +13,7 @@ import os
 from datetime import timedelta
 from pathlib import Path
 from dotenv import load_dotenv
+from corsheaders.defaults import default_headers
 
 # Загружаем переменные окружения из .env файла
 load_dotenv()
@@ -52,6 +53,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'backapp.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -59,6 +61,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'backapp.db_routing.ReplicaPinningMiddleware',
 ]
 
 ROOT_URLCONF = 'unicrewback.urls'
@@ -96,6 +99,24 @@ DATABASES = {
     }
 }
 
+# Реплики только для чтения (backapp/db_routing.py): DB_REPLICA_HOSTS=host[:port],... — псевдонимы
+# replica1, replica2, ... с теми же базой и пользователем, что и default. Пусто — всё читается из default
+DB_REPLICAS = {
+    f'replica{index}': (host.partition(':')[0], host.partition(':')[2] or os.getenv('DB_PORT', '5432'))
+    for index, host in enumerate(filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(',')), 1)
+}
+DATABASES.update({
+    alias: {**DATABASES['default'], 'HOST': host, 'PORT': port, 'TEST': {'MIRROR': 'default'}}
+    for alias, (host, port) in DB_REPLICAS.items()
+})
+DATABASE_ROUTERS = ['backapp.db_routing.ReplicaRouter']
+# Сколько секунд после записи клиент читает из default, а не с реплик (чтение своих записей)
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+# Заголовок закрепления за default (db_routing.REPLICA_PIN_HEADER): фронтенд на другом origin
+# должен читать его в ответе и отправлять в запросах
+CORS_ALLOW_HEADERS = (*default_headers, 'x-db-pin')
+CORS_EXPOSE_HEADERS = ['X-DB-Pin']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -129,15 +150,69 @@ DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", EMAIL_HOST_USER)
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "backapp.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 15,
+    "DEFAULT_RENDERER_CLASSES": [
+        "backapp.renderers.ORJSONRenderer",
+        "backapp.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "backapp.parsers.ORJSONParser",
+        "backapp.parsers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+# Redis — общий кэш всех воркеров gunicorn и серверов. В нём кэш пользователей аутентификации
+# и свежие отзывы refresh-токенов: их сброс должен сразу действовать во всех процессах.
+# Пусто — эти кэши в памяти процесса (годится только для одного процесса, как runserver)
+REDIS_URL = os.getenv('REDIS_URL', '')
+
+
+def shared_cache(prefix, max_entries):
+    if REDIS_URL:
+        return {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': REDIS_URL, 'KEY_PREFIX': prefix}
+    return {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': prefix,
+        'OPTIONS': {'MAX_ENTRIES': max_entries},
+    }
+
+
+# Кэши. "compressed" хранит уже сжатые тела ответов (см. backapp.middleware)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'compressed': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'compressed-responses',
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+    'auth_users': shared_cache('auth-users', 10000),
+    'token_revocations': shared_cache('token-revocations', 100000),
+    'analytics': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'analytics',
+        'OPTIONS': {'MAX_ENTRIES': 100},
+    },
 }
 
+# Ответы меньше этого размера (в байтах) не сжимаются
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+COMPRESSION_CACHE_ALIAS = 'compressed'
+
+# Кэш пользователей для JWT-аутентификации (backapp.authentication), TTL в секундах
+AUTH_USER_CACHE_ALIAS = 'auth_users'
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_TIMEOUT', 60))
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=15),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
@@ -163,8 +238,47 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_EXP_CLAIM': 'refresh_exp',
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=5),
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
+    'TOKEN_REFRESH_SERIALIZER': 'backapp.serializers.RevocableTokenRefreshSerializer',
 }
 
+# Отзыв refresh-токенов при ротации (backapp.tokens): общий кэш token_revocations, а
+# фильтр в памяти воркера синхронизируется с БД раз в TOKEN_REVOCATION_SYNC_INTERVAL секунд
+TOKEN_REVOCATION_SYNC_INTERVAL = int(os.getenv('TOKEN_REVOCATION_SYNC_INTERVAL', 5))
+# Сколько секунд до предыдущей синхронизации перечитывать: запас на долгие транзакции и расхождение часов
+TOKEN_REVOCATION_SYNC_OVERLAP = 60
+TOKEN_REVOCATION_REBUILD_INTERVAL = 3600
+TOKEN_REVOCATION_CAPACITY = 100_000
+TOKEN_REVOCATION_CACHE_ALIAS = 'token_revocations'
+
+# Удаление пользователей и команд из админки: запись сразу скрывается (deleted_at),
+# зависимые строки удаляются пачками в фоновом потоке или командой purge_deleted
+DELETION_PURGE_IN_BACKGROUND = True
+DELETION_BATCH_SIZE = 1000
+DELETION_BATCH_PAUSE = 0.05
+
+# Хранение уведомлений (backapp.retention, команда prune_notifications)
+NOTIFICATION_RETENTION_READ_DAYS = int(os.getenv('NOTIFICATION_RETENTION_READ_DAYS', 30))
+NOTIFICATION_RETENTION_UNREAD_DAYS = int(os.getenv('NOTIFICATION_RETENTION_UNREAD_DAYS', 180))
+NOTIFICATION_MAX_PER_USER = int(os.getenv('NOTIFICATION_MAX_PER_USER', 200))
+
+# Окно склейки однотипных уведомлений в секундах (backapp.notifications.notify); 0 — не склеивать
+NOTIFICATION_COALESCE_WINDOW = int(os.getenv('NOTIFICATION_COALESCE_WINDOW', 600))
+
+# Максимум id в одном массовом запросе (bulk_approve / bulk_reject / bulk_invite, массовые операции с задачами)
+BULK_MAX_IDS = int(os.getenv('BULK_MAX_IDS', 500))
+
+# Напоминания о сроках задач (backapp.reminders, команда send_due_reminders по cron):
+# «скоро срок» — за столько часов до due_date, «просрочено» — не старше стольких дней
+TASK_REMINDER_DUE_SOON_HOURS = int(os.getenv('TASK_REMINDER_DUE_SOON_HOURS', 24))
+TASK_REMINDER_OVERDUE_DAYS = int(os.getenv('TASK_REMINDER_OVERDUE_DAYS', 7))
+
+# Аналитика админ-панели (backapp.analytics, пересчёт командой refresh_analytics по cron):
+# кастомный навык вне справочника попадает в отчёт, если он есть хотя бы у стольких пользователей;
+# ответы кэшируются до следующего пересчёта, но не дольше ANALYTICS_CACHE_TIMEOUT секунд
+ANALYTICS_CUSTOM_SKILL_MIN_USERS = int(os.getenv('ANALYTICS_CUSTOM_SKILL_MIN_USERS', 3))
+ANALYTICS_CACHE_ALIAS = 'analytics'
+ANALYTICS_CACHE_TIMEOUT = int(os.getenv('ANALYTICS_CACHE_TIMEOUT', 300))
+
 AUTH_USER_MODEL = "backapp.User"
 
 
@@ -22,6 +22,13 @@ if not ALLOWED_HOSTS or ALLOWED_HOSTS == ['']:
     raise ValueError("Необходимо установить ALLOWED_HOSTS в переменных окружения!")
 
 # Database
+# DB_POOLER=pgbouncer (по умолчанию) — подключение через PgBouncer в режиме transaction pooling
+# (сервис pgbouncer в docker-compose.yml, см. DEPLOYMENT.md): воркер держит постоянное соединение
+# с PgBouncer, а серверное соединение PostgreSQL получает только на время транзакции, поэтому
+# соединений с базой не больше PGBOUNCER_POOL_SIZE при любом числе воркеров.
+# DB_POOLER=none — прямое подключение к DB_HOST, по соединению на воркер.
+DB_POOLER = os.getenv('DB_POOLER', 'pgbouncer')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -30,10 +37,39 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
-        'CONN_MAX_AGE': 600,
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 600)),
+        # Постоянное соединение проверяется перед первым запросом в новом HTTP-запросе:
+        # после рестарта PgBouncer/PostgreSQL воркер переподключается, а не отдаёт 500
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', 5)),
+            'application_name': 'unicrew',
+        },
     }
 }
 
+if DB_POOLER == 'pgbouncer':
+    DATABASES['default'].update({
+        'HOST': os.getenv('PGBOUNCER_HOST', 'pgbouncer'),
+        'PORT': os.getenv('PGBOUNCER_PORT', '6432'),
+        # Серверный курсор вне транзакции (WITH HOLD) не переживает смену серверного соединения
+        'DISABLE_SERVER_SIDE_CURSORS': True,
+    })
+    # Консоль администратора PgBouncer (SHOW POOLS / SHOW STATS) для admin-panel/db-pool/ и
+    # команды db_pool_stats; пользователь должен быть в stats_users
+    PGBOUNCER_ADMIN = {
+        'HOST': DATABASES['default']['HOST'],
+        'PORT': DATABASES['default']['PORT'],
+        'USER': os.getenv('PGBOUNCER_STATS_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.getenv('PGBOUNCER_STATS_PASSWORD', DATABASES['default']['PASSWORD']),
+    }
+
+# Реплики (DB_REPLICAS из settings.py) — с теми же параметрами соединения, что и default
+DATABASES.update({
+    alias: {**DATABASES['default'], 'HOST': host, 'PORT': port, 'TEST': {'MIRROR': 'default'}}
+    for alias, (host, port) in DB_REPLICAS.items()
+})
+
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
@@ -60,6 +96,10 @@ if not CORS_ALLOWED_ORIGINS or CORS_ALLOWED_ORIGINS == ['']:
 else:
     CORS_ALLOW_ALL_ORIGINS = False
 
+# Несколько воркеров gunicorn: кэш пользователей и отзывы токенов должны быть общими (settings.REDIS_URL)
+if not REDIS_URL:
+    raise ValueError("Необходимо установить REDIS_URL в переменных окружения!")
+
 # Email configuration
 EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "backapp.email_backend.CustomSMTPEmailBackend")
 EMAIL_HOST = os.getenv("EMAIL_HOST", "smtp.gmail.com")
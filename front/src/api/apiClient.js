@@ -40,6 +40,38 @@ export const removeTokens = () => {
     localStorage.removeItem("tokens");
 };
 
+// Закрепление за основной базой после записи (backend: db_routing.py). Ответ на запись
+// приходит с заголовком X-DB-Pin (секунды); до истечения срока каждый запрос отправляет
+// этот заголовок и читает из основной базы, а не с реплики, — своя запись сразу видна.
+// Часть компонентов ходит в API через axios напрямую, поэтому перехватчики стоят на обоих
+const DB_PIN_HEADER = 'X-DB-Pin';
+
+const rememberDbPin = (response) => {
+    const seconds = Number(response?.headers?.[DB_PIN_HEADER.toLowerCase()]);
+    if (seconds > 0) {
+        localStorage.setItem("dbPinUntil", String(Date.now() + seconds * 1000));
+    }
+};
+
+for (const client of [apiClient, axios]) {
+    client.interceptors.request.use((config) => {
+        if (Number(localStorage.getItem("dbPinUntil")) > Date.now()) {
+            config.headers[DB_PIN_HEADER] = '1';
+        }
+        return config;
+    });
+    client.interceptors.response.use(
+        (response) => {
+            rememberDbPin(response);
+            return response;
+        },
+        (error) => {
+            rememberDbPin(error.response);
+            return Promise.reject(error);
+        }
+    );
+}
+
 // Interceptor для обработки ошибок
 apiClient.interceptors.response.use(
     (response) => response,
@@ -2,6 +2,8 @@ import { StrictMode } from 'react'
 import { createRoot } from 'react-dom/client'
 import './index.css'
 import App from './App.jsx'
+// Перехватчики axios (закрепление за основной базой после записи)
+import './api/apiClient.js'
 
 createRoot(document.getElementById('root')).render(
   <App />
@@ -6,6 +6,9 @@ import { API_URL } from "@/config";
 import { useAuth } from "../../hooks/useAuth";
 import LoadingSpinner from "../../components/LoadingSpinner";
 import ErrorDisplay from "../../components/ErrorDisplay";
+import Pagination from "../../components/Pagination";
+
+const PAGE_SIZE = 50;
 
 const AdminPage = () => {
     const { tokens } = useAuth();
@@ -16,6 +19,9 @@ const AdminPage = () => {
     const [error, setError] = useState(null);
     const [activeTab, setActiveTab] = useState('teams');
     const [deleting, setDeleting] = useState(null);
+    const [counts, setCounts] = useState({ teams: 0, users: 0 });
+    const [pages, setPages] = useState({ teams: 1, users: 1 });
+    const [totalPages, setTotalPages] = useState({ teams: 1, users: 1 });
 
     useEffect(() => {
         const fetchData = async () => {
@@ -24,13 +30,22 @@ const AdminPage = () => {
                 return;
             }
             try {
-                const response = await axios.get(`${API_URL}admin-panel/`, {
-                    headers: {
-                        Authorization: `Bearer ${tokens.access}`,
-                    },
-                });
-                setTeams(response.data.teams || []);
-                setUsers(response.data.users || []);
+                const headers = { Authorization: `Bearer ${tokens.access}` };
+                // Списки приходят постранично: сводка с количеством и только текущая страница вкладки
+                const [summary, list] = await Promise.all([
+                    axios.get(`${API_URL}admin-panel/`, { headers }),
+                    axios.get(`${API_URL}admin-panel/${activeTab}/`, {
+                        headers,
+                        params: { page: pages[activeTab], page_size: PAGE_SIZE },
+                    }),
+                ]);
+                setCounts({ teams: summary.data.teams_count, users: summary.data.users_count });
+                setTotalPages(prev => ({ ...prev, [activeTab]: Math.max(1, Math.ceil(list.data.count / PAGE_SIZE)) }));
+                if (activeTab === 'teams') {
+                    setTeams(list.data.results || []);
+                } else {
+                    setUsers(list.data.results || []);
+                }
                 setError(null);
             } catch (err) {
                 if (err.response?.status === 403) {
@@ -44,7 +59,7 @@ const AdminPage = () => {
         };
 
         fetchData();
-    }, [tokens]);
+    }, [tokens, activeTab, pages]);
 
     const handleDelete = async (type, id, name) => {
         if (!window.confirm(`Вы уверены, что хотите удалить ${type === 'team' ? 'команду' : 'пользователя'} "${name}"? Это действие необратимо.`)) {
@@ -65,8 +80,10 @@ const AdminPage = () => {
 
             if (type === 'team') {
                 setTeams(prev => prev.filter(team => team.id !== id));
+                setCounts(prev => ({ ...prev, teams: prev.teams - 1 }));
             } else {
                 setUsers(prev => prev.filter(user => user.id !== id));
+                setCounts(prev => ({ ...prev, users: prev.users - 1 }));
             }
 
             alert(`${type === 'team' ? 'Команда' : 'Пользователь'} успешно удален`);
@@ -112,11 +129,11 @@ const AdminPage = () => {
 
             <div className={styles.stats}>
                 <div className={styles.stat_card}>
-                    <div className={styles.stat_value}>{teams.length}</div>
+                    <div className={styles.stat_value}>{counts.teams}</div>
                     <div className={styles.stat_label}>Команд</div>
                 </div>
                 <div className={styles.stat_card}>
-                    <div className={styles.stat_value}>{users.length}</div>
+                    <div className={styles.stat_value}>{counts.users}</div>
                     <div className={styles.stat_label}>Пользователей</div>
                 </div>
             </div>
@@ -126,13 +143,13 @@ const AdminPage = () => {
                     className={`${styles.tab} ${activeTab === 'teams' ? styles.active : ''}`}
                     onClick={() => setActiveTab('teams')}
                 >
-                    Команды ({teams.length})
+                    Команды ({counts.teams})
                 </button>
                 <button
                     className={`${styles.tab} ${activeTab === 'users' ? styles.active : ''}`}
                     onClick={() => setActiveTab('users')}
                 >
-                    Пользователи ({users.length})
+                    Пользователи ({counts.users})
                 </button>
             </div>
 
@@ -183,6 +200,11 @@ const AdminPage = () => {
                                 )}
                             </tbody>
                         </table>
+                        <Pagination
+                            currentPage={pages.teams}
+                            totalPages={totalPages.teams}
+                            onPageChange={(page) => setPages(prev => ({ ...prev, teams: page }))}
+                        />
                     </div>
                 )}
 
@@ -228,6 +250,11 @@ const AdminPage = () => {
                                 )}
                             </tbody>
                         </table>
+                        <Pagination
+                            currentPage={pages.users}
+                            totalPages={totalPages.users}
+                            onPageChange={(page) => setPages(prev => ({ ...prev, users: page }))}
+                        />
                     </div>
                 )}
             </div>